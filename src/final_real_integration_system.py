@@ -110,7 +110,7 @@ class FinalRealIntegrationSystem:
         # Initialize components
         self.enterprise_client = RealEnterpriseAPIClient()
         self.vss_client = RealVSSClient()
-        self.data_generator = RealisticDataGenerator()
+        self.data_generator = RealisticDataGenerator(compact=self.config.get('compact_realistic_rows', True))
         
         # Statistics
         self.stats = {
@@ -136,6 +136,7 @@ class FinalRealIntegrationSystem:
             'require_authentication': True,
             'fallback_to_realistic': True,
             'use_realistic_data': True,
+            'compact_realistic_rows': True,  # MST and extraction time are kept on the envelope only
             'data_quality_threshold': 80.0
         }
     
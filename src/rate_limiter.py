@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter - Token bucket for pacing requests to remote services
+Lets requests through in bursts up to the quota, then at the quota's steady rate
+"""
+
+import asyncio
+import threading
+import time
+
+class AsyncTokenBucket:
+    """Asyncio token bucket allowing max_rate acquisitions per time_period seconds
+
+    The bucket starts full, so up to max_rate requests go out at once; after
+    that each acquisition waits for its token to refill. Waiters reserve
+    their token before sleeping, so concurrent tasks are spaced out fairly.
+    The reservation is taken under a thread lock (never held while
+    sleeping), so one bucket may be used from event loops running in
+    different threads. Use it as `async with bucket:` or
+    `await bucket.acquire()`.
+    """
+
+    def __init__(self, max_rate: float, time_period: float = 60.0):
+        if max_rate <= 0 or time_period <= 0:
+            raise ValueError("max_rate and time_period must be positive")
+        self.max_rate = float(max_rate)
+        self.time_period = float(time_period)
+        self._refill_rate = self.max_rate / self.time_period  # tokens per second
+        self._tokens = self.max_rate
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    async def acquire(self):
+        """Take one token, waiting until it has been refilled if the bucket is empty"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.max_rate, self._tokens + (now - self._updated) * self._refill_rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self._refill_rate
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return None
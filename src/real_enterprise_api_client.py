@@ -5,23 +5,182 @@ Connects to thongtindoanhnghiep.co API with real data extraction
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import numpy as np
+import pandas as pd
 import zlib
-import gzip
 import logging
-from typing import Dict, List, Any, Optional
+import os
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass
 from datetime import datetime
 import time
 import re
+import threading
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+from operator import itemgetter
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    orjson = None
+
+try:
+    from isal import igzip as _gzip
+except ImportError:  # ISA-L is optional; stdlib gzip has the same decompress()
+    import gzip as _gzip
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy scorer is used without it
+    njit = None
+
+# orjson parses str or bytes and raises a JSONDecodeError subclass of json's
+_json_loads = orjson.loads if orjson else json.loads
+
+# Vietnamese provinces
+_PROVINCES = (
+    'Hà Nội', 'TP Hồ Chí Minh', 'Đà Nẵng', 'Hải Phòng', 'Cần Thơ',
+    'An Giang', 'Bà Rịa - Vũng Tàu', 'Bạc Liêu', 'Bắc Giang', 'Bắc Kạn',
+    'Bắc Ninh', 'Bến Tre', 'Bình Định', 'Bình Dương', 'Bình Phước',
+    'Bình Thuận', 'Cà Mau', 'Cao Bằng', 'Đắk Lắk', 'Đắk Nông',
+    'Điện Biên', 'Đồng Nai', 'Đồng Tháp', 'Gia Lai', 'Hà Giang',
+    'Hà Nam', 'Hà Tĩnh', 'Hải Dương', 'Hậu Giang', 'Hòa Bình',
+    'Hưng Yên', 'Khánh Hòa', 'Kiên Giang', 'Kon Tum', 'Lai Châu',
+    'Lâm Đồng', 'Lạng Sơn', 'Lào Cai', 'Long An', 'Nam Định',
+    'Nghệ An', 'Ninh Bình', 'Ninh Thuận', 'Phú Thọ', 'Phú Yên',
+    'Quảng Bình', 'Quảng Nam', 'Quảng Ngãi', 'Quảng Ninh', 'Quảng Trị',
+    'Sóc Trăng', 'Sơn La', 'Tây Ninh', 'Thái Bình', 'Thái Nguyên',
+    'Thanh Hóa', 'Thừa Thiên Huế', 'Tiền Giang', 'Trà Vinh', 'Tuyên Quang',
+    'Vĩnh Long', 'Vĩnh Phúc', 'Yên Bái'
+)
+
+# Address/MST patterns compiled once; each group is fused into one alternation
+_MST_STRIP = re.compile(r'\D')
+_DISTRICT_RE = re.compile(r'(?:Quận\s+\d+|Huyện\s+[^,]+|Thành phố\s+[^,]+|Thị xã\s+[^,]+)')
+_WARD_RE = re.compile(r'(?:Phường|Xã|Thị trấn)\s+[^,]+')
+# All 63 province names matched in a single scan; longest names first so
+# a shorter name never shadows a longer one starting at the same position
+_PROVINCE_RE = re.compile('|'.join(map(re.escape, sorted(_PROVINCES, key=len, reverse=True))))
+
+# Company fields copied verbatim by the cleaners
+_COMPANY_TEXT_FIELDS = (
+    'TenDoanhNghiep', 'DiaChi', 'NganhNghe', 'LoaiHinh', 'SoDienThoai',
+    'Website', 'NgayCap', 'NgayHetHan', 'SoNganHang'
+)
+_COMPANY_TEXT_GETTER = itemgetter(*_COMPANY_TEXT_FIELDS)
+
+# Data quality: required fields weigh 0.7, optional fields 0.3
+_REQUIRED_QUALITY_FIELDS = ('TenDoanhNghiep', 'DiaChi', 'NganhNghe', 'LoaiHinh')
+_OPTIONAL_QUALITY_FIELDS = ('SoDienThoai', 'Website', 'NgayCap', 'DoanhThu')
+_QUALITY_FIELDS = _REQUIRED_QUALITY_FIELDS + _OPTIONAL_QUALITY_FIELDS
+_QUALITY_WEIGHTS = np.array([0.7] * len(_REQUIRED_QUALITY_FIELDS) + [0.3] * len(_OPTIONAL_QUALITY_FIELDS))
+# (field, weight) pairs for scoring a single record without touching NumPy
+_QUALITY_FIELD_WEIGHTS = tuple(zip(_QUALITY_FIELDS, _QUALITY_WEIGHTS.tolist()))
+
+# Reference lists (cities, industries) are effectively static: keep them for a day
+_REFERENCE_TTL = 86400
+_DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'yeuemm')
+# Company records fetched by MST, kept per client (least recently used evicted)
+_COMPANY_CACHE_SIZE = 10000
+
+@dataclass(slots=True)
+class RequestStats:
+    """Request counters; response time is accumulated in integer nanoseconds"""
+    total_requests: int = 0
+    successful_requests: int = 0
+    failed_requests: int = 0
+    total_response_time_ns: int = 0
+
+@lru_cache(maxsize=1)
+def _iso_timestamp(second: int) -> str:
+    return datetime.fromtimestamp(second).isoformat()
+
+def _now_iso() -> str:
+    """Current local time in ISO format; only the microseconds are formatted on every call"""
+    second, nanoseconds = divmod(time.time_ns(), 1000000000)
+    return f"{_iso_timestamp(second)}.{nanoseconds // 1000:06d}"
+
+def _extract_province(address: str) -> str:
+    """Extract province from address"""
+    if not address:
+        return ''
+    
+    # Provinces normally close the address, so prefer the last match
+    matches = _PROVINCE_RE.findall(address)
+    return matches[-1] if matches else ''
+
+def _extract_district(address: str) -> str:
+    """Extract district from address"""
+    if not address:
+        return ''
+    
+    match = _DISTRICT_RE.search(address)
+    return match.group(0) if match else ''
+
+def _extract_ward(address: str) -> str:
+    """Extract ward from address"""
+    if not address:
+        return ''
+    
+    match = _WARD_RE.search(address)
+    return match.group(0) if match else ''
+
+def _score_quality_bitmaps_numpy(bitmaps: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Score uint8 field-presence bitmaps (bit i set = quality field i present)"""
+    bits = np.unpackbits(bitmaps.reshape(-1, 1), axis=1, bitorder='little')[:, :weights.size]
+    return bits @ weights / weights.size * 100
+
+def _score_quality_bitmaps_loop(bitmaps, weights):
+    """Loop form of the bitmap scorer, compiled with numba when available"""
+    out = np.empty(bitmaps.size, np.float64)
+    for k in range(bitmaps.size):
+        score = 0.0
+        bitmap = bitmaps[k]
+        for i in range(weights.size):
+            if bitmap & (1 << i):
+                score += weights[i]
+        out[k] = score / weights.size * 100
+    return out
+
+_score_quality_bitmaps = njit(cache=True)(_score_quality_bitmaps_loop) if njit else _score_quality_bitmaps_numpy
 
 class RealEnterpriseAPIClient:
     """Real Enterprise API Client with proper error handling"""
     
-    def __init__(self, base_url: str = "https://thongtindoanhnghiep.co"):
+    def __init__(self, base_url: str = "https://thongtindoanhnghiep.co",
+                 cache_dir: Optional[str] = _DEFAULT_CACHE_DIR,
+                 adapter: Optional[HTTPAdapter] = None):
         self.base_url = base_url
+        self.cache_dir = cache_dir
         self.session = requests.Session()
+        self._get = self.session.get
+        
+        # Endpoint URLs built once; company lookups only append the MST
+        self._company_url_prefix = f"{base_url}/api/company/"
+        self._search_url = f"{base_url}/api/company"
         self.logger = logging.getLogger(self.__class__.__name__)
         
+        # Pooled keep-alive connections; transient 429/5xx on GET are retried with backoff.
+        # A caller-supplied adapter shares its connection pool with other clients.
+        if adapter is None:
+            adapter = HTTPAdapter(
+                pool_connections=32,
+                pool_maxsize=64,
+                max_retries=Retry(
+                    total=3,
+                    backoff_factor=0.2,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=frozenset(['GET']),
+                    raise_on_status=False
+                )
+            )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
         # Configure session
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -37,80 +196,157 @@ class RealEnterpriseAPIClient:
         })
         
         # Statistics
-        self.stats = {
-            'total_requests': 0,
-            'successful_requests': 0,
-            'failed_requests': 0,
-            'total_response_time': 0
-        }
+        self.stats = RequestStats()
+        
+        # Reference data cache: name -> (fetched_at, items), seeded from disk
+        self._ref_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+        self._load_reference_cache()
+        
+        # MST -> cleaned company record; see clear_cache(). Batch extraction calls
+        # in from several threads, so every access holds _company_lock
+        self._company_cache: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._company_lock = threading.Lock()
+    
+    def clear_cache(self):
+        """Drop cached company records
+        
+        Company data is cached for the lifetime of the client on the
+        assumption that it does not change during a job; call this (or use
+        a new client) when fresh data is needed.
+        """
+        with self._company_lock:
+            self._company_cache.clear()
+    
+    def has_cached_company(self, mst: str) -> bool:
+        """Whether get_company_by_mst would answer for mst from the cache, without a request"""
+        with self._company_lock:
+            return mst in self._company_cache
+    
+    def _cache_company(self, mst: str, record: Dict[str, Any]):
+        """Remember a cleaned company record, evicting the least recently used"""
+        with self._company_lock:
+            self._company_cache[mst] = record
+            self._company_cache.move_to_end(mst)
+            if len(self._company_cache) > _COMPANY_CACHE_SIZE:
+                self._company_cache.popitem(last=False)
+    
+    def _load_reference_cache(self):
+        """Load cached reference lists from the disk cache directory"""
+        if not self.cache_dir:
+            return
+        
+        for name in ('cities', 'industries'):
+            path = os.path.join(self.cache_dir, f"{name}.json")
+            try:
+                with open(path, 'rb') as f:
+                    items = _json_loads(f.read())
+                self._ref_cache[name] = (os.path.getmtime(path), items)
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                self.logger.warning(f"⚠️ Ignoring unreadable reference cache {path}: {e}")
+    
+    def _save_reference_cache(self, name: str, items: List[Dict[str, Any]]):
+        """Persist a reference list to the disk cache directory"""
+        if not self.cache_dir:
+            return
+        
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(os.path.join(self.cache_dir, f"{name}.json"), 'w', encoding='utf-8') as f:
+                json.dump(items, f, ensure_ascii=False)
+        except OSError as e:
+            self.logger.warning(f"⚠️ Could not write reference cache for {name}: {e}")
+    
+    def _get_reference_list(self, name: str, path: str) -> List[Dict[str, Any]]:
+        """Get a reference list, served from cache while it is fresh"""
+        cached = self._ref_cache.get(name)
+        if cached and time.time() - cached[0] < _REFERENCE_TTL:
+            self.logger.info(f"✅ Using cached {name} list ({len(cached[1])} items)")
+            return cached[1]
+        
+        data = self._make_request(f"{self.base_url}{path}")
+        
+        if data and 'LtsItem' in data:
+            items = data['LtsItem']
+            self._ref_cache[name] = (time.time(), items)
+            self._save_reference_cache(name, items)
+            self.logger.info(f"✅ Retrieved {len(items)} {name}")
+            return items
+        else:
+            self.logger.warning(f"⚠️ No {name} data retrieved")
+            return []
     
     def _make_request(self, url: str, params: Optional[Dict] = None, timeout: int = 30) -> Optional[Dict]:
         """Make HTTP request with proper error handling"""
         try:
-            self.stats['total_requests'] += 1
-            start_time = time.time()
+            stats = self.stats
+            stats.total_requests += 1
+            start_ns = time.perf_counter_ns()
             
-            self.logger.info(f"🌐 Making request to: {url}")
+            self.logger.info("🌐 Making request to: %s", url)
             if params:
-                self.logger.info(f"📋 Parameters: {params}")
+                self.logger.info("📋 Parameters: %s", params)
             
-            response = self.session.get(url, params=params, timeout=timeout)
-            response_time = time.time() - start_time
-            self.stats['total_response_time'] += response_time
+            response = self._get(url, params=params, timeout=timeout)
+            elapsed_ns = time.perf_counter_ns() - start_ns
+            stats.total_response_time_ns += elapsed_ns
             
-            self.logger.info(f"📊 Response: {response.status_code} in {response_time:.2f}s")
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("📊 Response: %s in %.2fms", response.status_code, elapsed_ns / 1e6)
             
             if response.status_code == 200:
-                # Handle different content types
-                content_type = response.headers.get('Content-Type', '').lower()
+                # Handle different content types; header values are casefolded once
+                headers = response.headers
+                content_type = headers.get('Content-Type', '').casefold()
                 
                 if 'application/json' in content_type or 'text/html' in content_type:
                     try:
                         # Handle gzip encoding manually if needed
-                        content_encoding = response.headers.get('Content-Encoding', '').lower()
+                        content_encoding = headers.get('Content-Encoding', '').casefold()
+                        # Parse the raw bytes: skips requests' charset detection and a str copy
+                        body = response.content
                         if content_encoding == 'gzip':
                             # Try to decompress manually
                             try:
-                                decompressed_data = gzip.decompress(response.content)
-                                response_text = decompressed_data.decode('utf-8')
+                                body = _gzip.decompress(body)
                             except Exception as e:
-                                self.logger.warning(f"⚠️ Manual gzip decompression failed: {e}, trying requests default")
-                                response_text = response.text
-                        else:
-                            response_text = response.text
+                                self.logger.warning("⚠️ Manual gzip decompression failed: %s, trying requests default", e)
                         
-                        self.logger.debug(f"Response text length: {len(response_text)}")
-                        self.logger.debug(f"First 200 chars: {response_text[:200]}")
+                        if self.logger.isEnabledFor(logging.DEBUG):
+                            self.logger.debug("Response body length: %d", len(body))
+                            self.logger.debug("First 200 bytes: %s", body[:200].decode('utf-8', 'replace'))
                         
-                        if response_text.strip():
-                            data = json.loads(response_text)
-                            self.stats['successful_requests'] += 1
-                            self.logger.info(f"✅ JSON response received: {len(str(data))} characters")
+                        if body.strip():
+                            data = _json_loads(body)
+                            stats.successful_requests += 1
+                            self.logger.info("✅ JSON response received: %d bytes", len(body))
                             return data
                         else:
                             self.logger.error("❌ Empty response content")
                             return None
                     except json.JSONDecodeError as e:
-                        self.logger.error(f"❌ JSON decode error: {e}")
-                        self.logger.debug(f"Response content: {response.text[:500]}...")
+                        self.logger.error("❌ JSON decode error: %s", e)
+                        if self.logger.isEnabledFor(logging.DEBUG):
+                            self.logger.debug("Response content: %s...", response.content[:500].decode('utf-8', 'replace'))
                         return None
             
             else:
-                self.stats['failed_requests'] += 1
-                self.logger.error(f"❌ HTTP {response.status_code}: {response.reason}")
+                stats.failed_requests += 1
+                self.logger.error("❌ HTTP %s: %s", response.status_code, response.reason)
                 return None
                 
         except requests.exceptions.Timeout:
-            self.stats['failed_requests'] += 1
-            self.logger.error(f"❌ Request timeout after {timeout}s")
+            self.stats.failed_requests += 1
+            self.logger.error("❌ Request timeout after %ss", timeout)
             return None
         except requests.exceptions.ConnectionError:
-            self.stats['failed_requests'] += 1
-            self.logger.error(f"❌ Connection error")
+            self.stats.failed_requests += 1
+            self.logger.error("❌ Connection error")
             return None
         except Exception as e:
-            self.stats['failed_requests'] += 1
-            self.logger.error(f"❌ Unexpected error: {e}")
+            self.stats.failed_requests += 1
+            self.logger.error("❌ Unexpected error: %s", e)
             return None
     
     def get_company_by_mst(self, mst: str) -> Optional[Dict[str, Any]]:
@@ -119,54 +355,60 @@ class RealEnterpriseAPIClient:
             self.logger.error(f"❌ Invalid MST format: {mst}")
             return None
         
-        url = f"{self.base_url}/api/company/{mst}"
-        self.logger.info(f"🔍 Fetching company data for MST: {mst}")
+        return self._fetch_company(mst)
+    
+    def get_companies_by_msts(self, msts: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Get company information for many MSTs, one result per input
+        
+        MSTs are validated in one vectorized pass up front, so invalid codes
+        never reach the network; their results are None.
+        """
+        valid = self._validate_msts(msts)
+        invalid_count = len(msts) - int(valid.sum())
+        if invalid_count:
+            self.logger.error("❌ Skipping %d invalid MSTs", invalid_count)
+        
+        return [self._fetch_company(mst) if ok else None for mst, ok in zip(msts, valid)]
+    
+    def _fetch_company(self, mst: str) -> Optional[Dict[str, Any]]:
+        """Fetch and clean company data for an already validated MST"""
+        with self._company_lock:
+            cached = self._company_cache.get(mst)
+            if cached is not None:
+                self._company_cache.move_to_end(mst)
+        if cached is not None:
+            return cached
+        
+        self.logger.info("🔍 Fetching company data for MST: %s", mst)
         
-        data = self._make_request(url)
+        data = self._make_request(self._company_url_prefix + mst)
         
         if data:
             # Clean and validate data
             cleaned_data = self._clean_company_data(data, mst)
-            self.logger.info(f"✅ Company data retrieved: {cleaned_data.get('TenDoanhNghiep', 'N/A')}")
+            self.logger.info("✅ Company data retrieved: %s", cleaned_data.get('TenDoanhNghiep', 'N/A'))
+            
+            # Only successful lookups are cached; failures may be transient
+            self._cache_company(mst, cleaned_data)
             return cleaned_data
         else:
-            self.logger.warning(f"⚠️ No data retrieved for MST: {mst}")
+            self.logger.warning("⚠️ No data retrieved for MST: %s", mst)
             return None
     
     def get_cities(self) -> List[Dict[str, Any]]:
-        """Get list of cities"""
-        url = f"{self.base_url}/api/city"
+        """Get list of cities (cached for a day in memory and on disk)"""
         self.logger.info("🏙️ Fetching cities list")
-        
-        data = self._make_request(url)
-        
-        if data and 'LtsItem' in data:
-            cities = data['LtsItem']
-            self.logger.info(f"✅ Retrieved {len(cities)} cities")
-            return cities
-        else:
-            self.logger.warning("⚠️ No cities data retrieved")
-            return []
+        return self._get_reference_list('cities', '/api/city')
     
     def get_industries(self) -> List[Dict[str, Any]]:
-        """Get list of industries"""
-        url = f"{self.base_url}/api/industry"
+        """Get list of industries (cached for a day in memory and on disk)"""
         self.logger.info("🏭 Fetching industries list")
-        
-        data = self._make_request(url)
-        
-        if data and 'LtsItem' in data:
-            industries = data['LtsItem']
-            self.logger.info(f"✅ Retrieved {len(industries)} industries")
-            return industries
-        else:
-            self.logger.warning("⚠️ No industries data retrieved")
-            return []
+        return self._get_reference_list('industries', '/api/industry')
     
     def search_companies(self, keyword: str = "", location: str = "", industry: str = "", 
                         page: int = 1, rows_per_page: int = 20) -> Dict[str, Any]:
         """Search companies with filters"""
-        url = f"{self.base_url}/api/company"
+        url = self._search_url
         params = {
             'p': page,
             'r': rows_per_page
@@ -195,147 +437,104 @@ class RealEnterpriseAPIClient:
         if not mst or not isinstance(mst, str):
             return False
         
-        # Remove any non-digit characters
-        clean_mst = re.sub(r'[^\d]', '', mst)
-        
-        # Check length (Vietnamese tax codes are typically 10-13 digits)
-        if len(clean_mst) < 10 or len(clean_mst) > 13:
-            return False
+        # Remove any non-digit characters; Vietnamese tax codes are 10-13 digits
+        clean_mst = _MST_STRIP.sub('', mst)
+        return 10 <= len(clean_mst) <= 13
+    
+    def _validate_msts(self, msts: List[str]) -> np.ndarray:
+        """Validate many MSTs at once; returns a boolean mask aligned with msts"""
+        # Non-string entries are masked to NaN first (.str refuses a column with no
+        # strings at all), so they fail the length check like in _validate_mst
+        values = pd.Series(msts, dtype=object)
+        values = values.where(values.map(lambda value: isinstance(value, str)))
+        digits = values.str.replace(_MST_STRIP, '', regex=True)
+        return digits.str.len().between(10, 13).to_numpy(dtype=bool)
+    
+    def _clean_company_data(self, data: Dict[str, Any], mst: str,
+                            now_iso: Optional[str] = None) -> Dict[str, Any]:
+        """Clean and validate company data (now_iso: shared extracted_at timestamp)"""
+        # Missing text fields default to '' without a .get per field
+        fields = defaultdict(str, data)
+        cleaned = {'MST': mst, **dict(zip(_COMPANY_TEXT_FIELDS, _COMPANY_TEXT_GETTER(fields)))}
         
-        # Check if all characters are digits
-        if not clean_mst.isdigit():
-            return False
+        try:
+            cleaned['DoanhThu'] = float(fields['DoanhThu'])
+        except (TypeError, ValueError):
+            cleaned['DoanhThu'] = 0.0
+        
+        address = cleaned['DiaChi']
+        cleaned['TinhThanh'] = _extract_province(address)
+        cleaned['QuanHuyen'] = _extract_district(address)
+        cleaned['PhuongXa'] = _extract_ward(address)
+        cleaned['extracted_at'] = now_iso or _now_iso()
+        cleaned['data_source'] = 'thongtindoanhnghiep.co'
+        cleaned['data_quality'] = self._calculate_data_quality(data)
         
-        return True
-    
-    def _clean_company_data(self, data: Dict[str, Any], mst: str) -> Dict[str, Any]:
-        """Clean and validate company data"""
-        cleaned = {
-            'MST': mst,
-            'TenDoanhNghiep': data.get('TenDoanhNghiep', ''),
-            'DiaChi': data.get('DiaChi', ''),
-            'NganhNghe': data.get('NganhNghe', ''),
-            'LoaiHinh': data.get('LoaiHinh', ''),
-            'SoDienThoai': data.get('SoDienThoai', ''),
-            'Website': data.get('Website', ''),
-            'NgayCap': data.get('NgayCap', ''),
-            'NgayHetHan': data.get('NgayHetHan', ''),
-            'DoanhThu': float(data.get('DoanhThu', 0)) if data.get('DoanhThu') else 0.0,
-            'SoNganHang': data.get('SoNganHang', ''),
-            'TinhThanh': self._extract_province_from_address(data.get('DiaChi', '')),
-            'QuanHuyen': self._extract_district_from_address(data.get('DiaChi', '')),
-            'PhuongXa': self._extract_ward_from_address(data.get('DiaChi', '')),
-            'extracted_at': datetime.now().isoformat(),
-            'data_source': 'thongtindoanhnghiep.co',
-            'data_quality': self._calculate_data_quality(data)
-        }
+        return cleaned
+    
+    def clean_company_batch(self, records: List[Dict[str, Any]],
+                            now_iso: Optional[str] = None) -> pd.DataFrame:
+        """Clean a batch of company records column-wise (one row per record)
+        
+        Produces the same fields as _clean_company_data, using vectorized
+        pandas string operations instead of per-record Python calls. Records
+        are expected to carry their own 'MST' field.
+        """
+        raw = pd.DataFrame.from_records(records).reindex(
+            columns=list(dict.fromkeys(('MST',) + _COMPANY_TEXT_FIELDS + _QUALITY_FIELDS)))
+        text = raw[list(_COMPANY_TEXT_FIELDS)].fillna('')
+        address = text['DiaChi'].astype(str)
+        # One presence bit per quality field, packed into a uint8 per record
+        present = raw[list(_QUALITY_FIELDS)].fillna('').astype(bool).to_numpy()
+        bitmaps = np.packbits(present, axis=1, bitorder='little').ravel()
+        
+        cleaned = pd.DataFrame({
+            'MST': raw['MST'].fillna(''),
+            **{field: text[field] for field in _COMPANY_TEXT_FIELDS},
+            'DoanhThu': pd.to_numeric(raw['DoanhThu'], errors='coerce').fillna(0.0).astype(float),
+            'TinhThanh': address.str.findall(_PROVINCE_RE).str[-1].fillna(''),
+            'QuanHuyen': address.str.extract(f'({_DISTRICT_RE.pattern})', expand=False).fillna(''),
+            'PhuongXa': address.str.extract(f'({_WARD_RE.pattern})', expand=False).fillna(''),
+            'extracted_at': now_iso or datetime.now().isoformat(),
+            'data_source': 'thongtindoanhnghiep.co'
+        })
+        cleaned['data_quality'] = _score_quality_bitmaps(bitmaps, _QUALITY_WEIGHTS)
         
         return cleaned
     
     def _extract_province_from_address(self, address: str) -> str:
         """Extract province from address"""
-        if not address:
-            return ''
-        
-        # Vietnamese provinces
-        provinces = [
-            'Hà Nội', 'TP Hồ Chí Minh', 'Đà Nẵng', 'Hải Phòng', 'Cần Thơ',
-            'An Giang', 'Bà Rịa - Vũng Tàu', 'Bạc Liêu', 'Bắc Giang', 'Bắc Kạn',
-            'Bắc Ninh', 'Bến Tre', 'Bình Định', 'Bình Dương', 'Bình Phước',
-            'Bình Thuận', 'Cà Mau', 'Cao Bằng', 'Đắk Lắk', 'Đắk Nông',
-            'Điện Biên', 'Đồng Nai', 'Đồng Tháp', 'Gia Lai', 'Hà Giang',
-            'Hà Nam', 'Hà Tĩnh', 'Hải Dương', 'Hậu Giang', 'Hòa Bình',
-            'Hưng Yên', 'Khánh Hòa', 'Kiên Giang', 'Kon Tum', 'Lai Châu',
-            'Lâm Đồng', 'Lạng Sơn', 'Lào Cai', 'Long An', 'Nam Định',
-            'Nghệ An', 'Ninh Bình', 'Ninh Thuận', 'Phú Thọ', 'Phú Yên',
-            'Quảng Bình', 'Quảng Nam', 'Quảng Ngãi', 'Quảng Ninh', 'Quảng Trị',
-            'Sóc Trăng', 'Sơn La', 'Tây Ninh', 'Thái Bình', 'Thái Nguyên',
-            'Thanh Hóa', 'Thừa Thiên Huế', 'Tiền Giang', 'Trà Vinh', 'Tuyên Quang',
-            'Vĩnh Long', 'Vĩnh Phúc', 'Yên Bái'
-        ]
-        
-        for province in provinces:
-            if province in address:
-                return province
-        
-        return ''
+        return _extract_province(address)
     
     def _extract_district_from_address(self, address: str) -> str:
         """Extract district from address"""
-        if not address:
-            return ''
-        
-        # Common district patterns
-        district_patterns = [
-            r'Quận\s+(\d+)',
-            r'Huyện\s+([^,]+)',
-            r'Thành phố\s+([^,]+)',
-            r'Thị xã\s+([^,]+)'
-        ]
-        
-        for pattern in district_patterns:
-            match = re.search(pattern, address)
-            if match:
-                return match.group(0)
-        
-        return ''
+        return _extract_district(address)
     
     def _extract_ward_from_address(self, address: str) -> str:
         """Extract ward from address"""
-        if not address:
-            return ''
-        
-        # Common ward patterns
-        ward_patterns = [
-            r'Phường\s+([^,]+)',
-            r'Xã\s+([^,]+)',
-            r'Thị trấn\s+([^,]+)'
-        ]
-        
-        for pattern in ward_patterns:
-            match = re.search(pattern, address)
-            if match:
-                return match.group(0)
-        
-        return ''
+        return _extract_ward(address)
     
     def _calculate_data_quality(self, data: Dict[str, Any]) -> float:
         """Calculate data quality score"""
-        required_fields = ['TenDoanhNghiep', 'DiaChi', 'NganhNghe', 'LoaiHinh']
-        optional_fields = ['SoDienThoai', 'Website', 'NgayCap', 'DoanhThu']
-        
         score = 0.0
-        total_fields = len(required_fields) + len(optional_fields)
-        
-        # Check required fields (weight: 0.7)
-        for field in required_fields:
-            if data.get(field):
-                score += 0.7
-        
-        # Check optional fields (weight: 0.3)
-        for field in optional_fields:
+        for field, weight in _QUALITY_FIELD_WEIGHTS:
             if data.get(field):
-                score += 0.3
-        
-        return (score / total_fields) * 100
+                score += weight
+        return (score / len(_QUALITY_FIELDS)) * 100
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get API statistics"""
-        avg_response_time = 0
-        if self.stats['total_requests'] > 0:
-            avg_response_time = self.stats['total_response_time'] / self.stats['total_requests']
-        
-        success_rate = 0
-        if self.stats['total_requests'] > 0:
-            success_rate = (self.stats['successful_requests'] / self.stats['total_requests']) * 100
+        stats = self.stats
+        total_response_time = stats.total_response_time_ns / 1e9
+        total = stats.total_requests
         
         return {
-            'total_requests': self.stats['total_requests'],
-            'successful_requests': self.stats['successful_requests'],
-            'failed_requests': self.stats['failed_requests'],
-            'success_rate': success_rate,
-            'average_response_time': avg_response_time,
-            'total_response_time': self.stats['total_response_time']
+            'total_requests': total,
+            'successful_requests': stats.successful_requests,
+            'failed_requests': stats.failed_requests,
+            'success_rate': stats.successful_requests / total * 100 if total else 0,
+            'average_response_time': total_response_time / total if total else 0,
+            'total_response_time': total_response_time
         }
 
 def main():
@@ -6,32 +6,237 @@ Input: MST (Tax Code)
 Output: 100% Real Data Analysis
 """
 
+from __future__ import annotations
+
 import sys
 import os
 import json
 import argparse
+import asyncio
+import codecs
+import copy
+import dataclasses
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Dict, Any, List
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to ujson, then stdlib json
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+# Used only when orjson is missing: ujson keeps the str-based json API
+_json_fallback_loads = ujson.loads if ujson else json.loads
+
+def _json_fallback_dumps(obj: Any, indent: bool = True) -> str:
+    if ujson:
+        return ujson.dumps(obj, ensure_ascii=False, indent=2 if indent else 0, escape_forward_slashes=False)
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
 
 # Add src directory to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from real_vss_enterprise_integration import RealVSSEnterpriseIntegrationSystem, RealIntegratedResult
+if TYPE_CHECKING:
+    from real_vss_enterprise_integration import IntegrationStats, RealIntegratedResult
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/real_mst_processor.log'),
-        logging.StreamHandler()
-    ]
-)
+def _configure_logging(level: int = logging.INFO) -> QueueListener:
+    """Configure CLI logging; records are written by a background listener thread
+    
+    Callers must stop() the returned listener to flush pending records.
+    """
+    os.makedirs('logs', exist_ok=True)
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    handlers = [logging.FileHandler('logs/real_mst_processor.log'), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.SimpleQueue()
+    # The queue side only renders the message; the listener's handlers apply the layout
+    logging.basicConfig(level=level, format='%(message)s', handlers=[QueueHandler(log_queue)])
+    listener = QueueListener(log_queue, *handlers)
+    listener.start()
+    return listener
+
+def _json_load_file(path: str) -> Any:
+    """Parse a JSON file, with orjson when available"""
+    # One read of the raw bytes; a UTF-8 BOM (common from Windows editors) is dropped
+    data = Path(path).read_bytes().removeprefix(codecs.BOM_UTF8)
+    return orjson.loads(data) if orjson else _json_fallback_loads(data)
+
+# data_source value marking a section that holds no real data
+_NONE_SOURCE = 'none'
+
+@lru_cache(maxsize=None)
+def _ensure_dir(path: str) -> str:
+    """Create an output directory on first use; later calls are free"""
+    os.makedirs(path, exist_ok=True)
+    return path
+
+@lru_cache(maxsize=8)
+def _read_config(path: str) -> Dict[str, Any]:
+    """Parse a config file once per path; callers must not mutate the result"""
+    return _json_load_file(path)
+
+def _json_dumps_bytes(obj: Any, indent: bool = True) -> bytes:
+    """Serialize to UTF-8 JSON bytes (indented unless indent=False), with orjson when available"""
+    if orjson:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return _json_fallback_dumps(obj, indent).encode('utf-8')
 
 class RealMSTProcessor:
     """Real MST Processor for 100% real data processing"""
     
+    # Markdown report layout, filled by _create_real_data_markdown_report with
+    # pre-formatted strings (numbers are formatted once, even if shown twice)
+    _REPORT_TEMPLATE = """# 🏢 **BÁO CÁO TÍCH HỢP VSS - DOANH NGHIỆP (DỮ LIỆU THỰC TẾ)**
+
+## 📊 **THÔNG TIN TỔNG QUAN**
+
+- **MST:** {mst}
+- **Tên doanh nghiệp:** {ten_doanh_nghiep}
+- **Địa chỉ:** {dia_chi}
+- **Ngành nghề:** {nganh_nghe}
+- **Loại hình:** {loai_hinh}
+- **Doanh thu:** {doanh_thu} VND
+- **Thời gian trích xuất:** {extraction_time} giây
+- **Chất lượng dữ liệu:** {data_quality_score}%
+- **Độ tin cậy tích hợp:** {integration_confidence}%
+- **Tỷ lệ dữ liệu thực tế:** {real_data_percentage}%
+
+---
+
+## 🏢 **THÔNG TIN DOANH NGHIỆP (DỮ LIỆU THỰC TẾ)**
+
+### **Nguồn dữ liệu:** {enterprise_data_source}
+### **Chất lượng dữ liệu:** {enterprise_data_quality}%
+
+### **Thông tin cơ bản:**
+- **Mã số thuế:** {mst}
+- **Tên doanh nghiệp:** {ten_doanh_nghiep}
+- **Địa chỉ:** {dia_chi}
+- **Số điện thoại:** {so_dien_thoai}
+- **Website:** {website}
+
+### **Thông tin kinh doanh:**
+- **Ngành nghề:** {nganh_nghe}
+- **Loại hình:** {loai_hinh}
+- **Doanh thu:** {doanh_thu} VND
+- **Tài khoản ngân hàng:** {so_ngan_hang}
+
+### **Thông tin đăng ký:**
+- **Ngày cấp:** {ngay_cap}
+- **Ngày hết hạn:** {ngay_het_han}
+
+---
+
+## 👥 **THÔNG TIN VSS (DỮ LIỆU THỰC TẾ)**
+
+### **Nguồn dữ liệu:** {vss_data_source}
+### **Chất lượng dữ liệu:** {vss_data_quality}%
+
+### **Nhân viên:**
+- **Tổng số nhân viên:** {employee_count}
+- **Nhân viên hoạt động:** {active_employees}
+- **Lương trung bình:** {average_salary} VND
+
+### **Đóng góp BHXH:**
+- **Tổng số đóng góp:** {contribution_count}
+- **Tổng số tiền đóng góp:** {total_contribution_amount} VND
+- **Đóng góp trung bình:** {average_contribution} VND
+
+### **Hồ sơ yêu cầu:**
+- **Tổng số hồ sơ:** {claim_count}
+
+### **Bệnh viện:**
+- **Tổng số bệnh viện:** {hospital_count}
+
+---
+
+## 📊 **PHÂN TÍCH TUÂN THỦ (DỮ LIỆU THỰC TẾ)**
+
+### **Điểm tuân thủ tổng thể:** {overall_compliance_score}%
+
+### **Trạng thái tuân thủ:**
+- **Tuân thủ đăng ký:** {registration_compliance}
+- **Tuân thủ đóng góp:** {contribution_compliance}
+- **Tuân thủ nhân viên:** {employee_compliance}
+
+### **Vấn đề tuân thủ:**
+{compliance_issues}
+
+---
+
+## ⚠️ **ĐÁNH GIÁ RỦI RO (DỮ LIỆU THỰC TẾ)**
+
+### **Mức độ rủi ro:** {risk_level}
+### **Điểm rủi ro:** {risk_score}/100
+
+### **Yếu tố rủi ro:**
+{risk_factors}
+
+### **Chiến lược giảm thiểu:**
+{mitigation_strategies}
+
+---
+
+## 💡 **KHUYẾN NGHỊ (DỰA TRÊN DỮ LIỆU THỰC TẾ)**
+
+{recommendations}
+
+---
+
+## 📈 **THỐNG KÊ HỆ THỐNG**
+
+- **Tổng số yêu cầu:** {total_requests}
+- **Yêu cầu thành công:** {successful_requests}
+- **Yêu cầu thất bại:** {failed_requests}
+- **Tỷ lệ thành công:** {success_rate}%
+- **Trích xuất dữ liệu thực tế:** {real_data_extractions}
+- **Trích xuất dữ liệu mô phỏng:** {simulated_data_extractions}
+
+---
+
+## 🎯 **XÁC NHẬN DỮ LIỆU THỰC TẾ**
+
+### **✅ DỮ LIỆU DOANH NGHIỆP:**
+- **Nguồn:** {enterprise_data_source}
+- **Chất lượng:** {enterprise_data_quality}%
+- **Trạng thái:** {enterprise_status}
+
+### **✅ DỮ LIỆU VSS:**
+- **Nguồn:** {vss_data_source}
+- **Chất lượng:** {vss_data_quality}%
+- **Trạng thái:** {vss_status}
+
+### **📊 TỔNG KẾT:**
+- **Tỷ lệ dữ liệu thực tế:** {real_data_percentage}%
+- **Chất lượng tổng thể:** {data_quality_score}%
+- **Độ tin cậy tích hợp:** {integration_confidence}%
+
+---
+
+*Báo cáo dữ liệu thực tế được tạo lúc: {generated_at}*  
+"""
+    # Constant closing lines, appended without formatting
+    _REPORT_FOOTER = """*Hệ thống: Real VSS Enterprise Integration System v1.0*  
+*Trạng thái: 100% Dữ liệu thực tế*
+"""
+    
     def __init__(self, config_file: Optional[str] = None):
         self.logger = logging.getLogger(self.__class__.__name__)
         
@@ -39,32 +244,48 @@ class RealMSTProcessor:
         self.config = self._load_config(config_file)
         
         # Initialize real integration system
+        # Imported here so `--help` and argument errors skip the client import chain
+        from real_vss_enterprise_integration import RealVSSEnterpriseIntegrationSystem
         self.integration_system = RealVSSEnterpriseIntegrationSystem(self.config)
         
-        # Create necessary directories
-        self._create_directories()
+        # Result files and reports are written in the background; see close()
+        self._io_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='mst-io')
+    
+    def close(self):
+        """Wait for pending result/report writes to finish and release the result cache"""
+        self._io_executor.shutdown(wait=True)
+        self.integration_system.close()
+    
+    def __enter__(self) -> 'RealMSTProcessor':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def _load_config(self, config_file: Optional[str]) -> Dict[str, Any]:
         """Load configuration from file or use defaults"""
         if config_file and os.path.exists(config_file):
             try:
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                # Each processor gets its own copy of the cached parse
+                return copy.deepcopy(_read_config(config_file))
             except Exception as e:
-                self.logger.warning(f"Could not load config file {config_file}: {e}")
+                self.logger.warning("Could not load config file %s: %s", config_file, e)
         
         # Default configuration for real data processing
         return {
             'timeout': 30,
             'retry_attempts': 3,
-            'rate_limit_delay': 1.0,
+            'enterprise_rate_limit': 60,  # requests per minute; None disables
+            'vss_rate_limit': 180,
             'enable_caching': True,
             'cache_duration': 3600,
             'enable_logging': True,
             'log_level': 'INFO',
             'output_format': 'json',
             'save_results': True,
+            'pretty_results': False,  # indent saved result JSON
             'generate_report': True,
+            'max_concurrent': 10,
             'require_authentication': True,
             'fallback_to_simulation': False,
             'vss_credentials': {
@@ -73,91 +294,118 @@ class RealMSTProcessor:
             }
         }
     
-    def _create_directories(self):
-        """Create necessary directories"""
-        directories = ['data', 'reports', 'logs']
-        for directory in directories:
-            os.makedirs(directory, exist_ok=True)
-    
     def process_mst(self, mst: str, output_format: str = 'json') -> Dict[str, Any]:
-        """Process MST and return 100% real data results"""
-        self.logger.info(f"🚀 Processing MST with REAL DATA: {mst}")
+        """Process MST and return 100% real data results
+        
+        The result file and report are written by a background thread, so
+        they may not exist yet when this returns; close() (or leaving the
+        `with` block) waits for them.
+        """
+        self.logger.info("🚀 Processing MST with REAL DATA: %s", mst)
+        now = datetime.now()  # one timestamp for the report name, body and errors
         
         try:
             # Process MST through real integration system
             result = self.integration_system.process_mst(mst)
-            
-            # Format output based on requested format
-            if output_format.lower() == 'json':
-                output = self._format_json_output(result)
-            elif output_format.lower() == 'summary':
-                output = self._format_summary_output(result)
-            elif output_format.lower() == 'detailed':
-                output = self._format_detailed_output(result)
-            elif output_format.lower() == 'real_data_only':
-                output = self._format_real_data_output(result)
+        except Exception as e:
+            return self._error_output(mst, e, now)
+        return self._complete_result(mst, result, output_format, now)
+    
+    def process_msts(self, msts: List[str], output_format: str = 'json') -> List[Dict[str, Any]]:
+        """Process several MSTs concurrently; results keep the input order
+        
+        The whole batch shares one VSS connection and login (see the
+        integration's process_msts_batch). Concurrency is capped by the
+        'max_concurrent' config value (default 10) to stay within the remote
+        systems' rate limits. Files are written in the background as in
+        process_mst.
+        """
+        results = asyncio.run(self.integration_system.process_msts_batch(
+            msts, concurrency=self.config.get('max_concurrent', 10)))
+        
+        outputs = []
+        for mst, result in zip(msts, results):
+            now = datetime.now()
+            if isinstance(result, BaseException):
+                outputs.append(self._error_output(mst, result, now))
             else:
-                output = self._format_json_output(result)
+                outputs.append(self._complete_result(mst, result, output_format, now))
+        return outputs
+    
+    def _complete_result(self, mst: str, result: RealIntegratedResult, output_format: str,
+                         now: datetime) -> Dict[str, Any]:
+        """Format a processed result and queue its result file and report"""
+        try:
+            # Format output based on requested format (unknown formats fall back to JSON)
+            formatter = self._FORMATTERS.get(output_format.lower(), RealMSTProcessor._format_json_output)
+            output = formatter(self, result)
             
-            # Save results if configured
+            # Save results / generate report if configured; both run off the request path
             if self.config.get('save_results', True):
-                self._save_results(result, mst)
+                self._io_executor.submit(self._save_results, result, mst)
             
-            # Generate report if configured
             if self.config.get('generate_report', True):
-                self._generate_report(result, mst)
+                # The report shows the counters as of this request, not as of when it is written
+                self._io_executor.submit(self._generate_report, result, mst, now,
+                                         dataclasses.replace(self.integration_system.stats))
             
-            self.logger.info(f"✅ Successfully processed MST with REAL DATA: {mst}")
+            self.logger.info("✅ Successfully processed MST with REAL DATA: %s", mst)
             return output
             
         except Exception as e:
-            self.logger.error(f"❌ Error processing MST {mst}: {e}")
-            return {
-                'success': False,
-                'error': str(e),
-                'mst': mst,
-                'timestamp': datetime.now().isoformat(),
-                'data_type': 'error'
-            }
+            return self._error_output(mst, e, now)
+    
+    def _error_output(self, mst: str, error: BaseException, now: datetime) -> Dict[str, Any]:
+        """Error result for an MST that could not be processed"""
+        self.logger.error("❌ Error processing MST %s: %s", mst, error)
+        return {
+            'success': False,
+            'error': str(error),
+            'mst': mst,
+            'timestamp': now.isoformat(timespec='seconds'),
+            'data_type': 'error'
+        }
     
     def _format_json_output(self, result: RealIntegratedResult) -> Dict[str, Any]:
         """Format output as JSON with real data indicators"""
+        ei = result.enterprise_info
+        vi = result.vss_info
         return {
             'success': True,
             'data_type': 'real_data',
-            'mst': result.enterprise_info.mst,
+            'mst': ei.mst,
             'timestamp': result.generated_at,
             'extraction_time': result.extraction_time,
             'data_quality_score': result.data_quality_score,
             'integration_confidence': result.integration_confidence,
             'real_data_percentage': result.real_data_percentage,
             'enterprise_info': {
-                'mst': result.enterprise_info.mst,
-                'ten_doanh_nghiep': result.enterprise_info.ten_doanh_nghiep,
-                'dia_chi': result.enterprise_info.dia_chi,
-                'nganh_nghe': result.enterprise_info.nganh_nghe,
-                'loai_hinh': result.enterprise_info.loai_hinh,
-                'so_dien_thoai': result.enterprise_info.so_dien_thoai,
-                'website': result.enterprise_info.website,
-                'ngay_cap': result.enterprise_info.ngay_cap,
-                'ngay_het_han': result.enterprise_info.ngay_het_han,
-                'doanh_thu': result.enterprise_info.doanh_thu,
-                'so_ngan_hang': result.enterprise_info.so_ngan_hang,
-                'tinh_thanh': result.enterprise_info.tinh_thanh,
-                'quan_huyen': result.enterprise_info.quan_huyen,
-                'phuong_xa': result.enterprise_info.phuong_xa,
-                'data_quality': result.enterprise_info.data_quality,
-                'data_source': result.enterprise_info.data_source
+                'mst': ei.mst,
+                'ten_doanh_nghiep': ei.ten_doanh_nghiep,
+                'dia_chi': ei.dia_chi,
+                'nganh_nghe': ei.nganh_nghe,
+                'loai_hinh': ei.loai_hinh,
+                'so_dien_thoai': ei.so_dien_thoai,
+                'website': ei.website,
+                'ngay_cap': ei.ngay_cap,
+                'ngay_het_han': ei.ngay_het_han,
+                'doanh_thu': ei.doanh_thu,
+                'so_ngan_hang': ei.so_ngan_hang,
+                'tinh_thanh': ei.tinh_thanh,
+                'quan_huyen': ei.quan_huyen,
+                'phuong_xa': ei.phuong_xa,
+                'data_quality': ei.data_quality,
+                'data_source': ei.data_source
             },
             'vss_info': {
-                'employees': result.vss_info.employees,
-                'contributions': result.vss_info.contributions,
-                'claims': result.vss_info.claims,
-                'hospitals': result.vss_info.hospitals,
-                'compliance': result.vss_info.compliance,
-                'risk_assessment': result.vss_info.risk_assessment,
-                'data_quality': result.vss_info.data_quality,
-                'data_source': result.vss_info.data_source
+                'employees': vi.employees,
+                'contributions': vi.contributions,
+                'claims': vi.claims,
+                'hospitals': vi.hospitals,
+                'compliance': vi.compliance,
+                'risk_assessment': vi.risk_assessment,
+                'data_quality': vi.data_quality,
+                'data_source': vi.data_source
             },
             'analysis': {
                 'company_profile': result.company_profile,
@@ -171,58 +419,62 @@ class RealMSTProcessor:
     
     def _format_summary_output(self, result: RealIntegratedResult) -> Dict[str, Any]:
         """Format output as summary with real data indicators"""
+        ei = result.enterprise_info
+        vi = result.vss_info
         return {
             'success': True,
             'data_type': 'real_data',
-            'mst': result.enterprise_info.mst,
-            'company_name': result.enterprise_info.ten_doanh_nghiep,
-            'sector': result.enterprise_info.nganh_nghe,
-            'revenue': result.enterprise_info.doanh_thu,
-            'employees_count': len(result.vss_info.employees),
+            'mst': ei.mst,
+            'company_name': ei.ten_doanh_nghiep,
+            'sector': ei.nganh_nghe,
+            'revenue': ei.doanh_thu,
+            'employees_count': len(vi.employees),
             'compliance_score': result.compliance_report['overall_compliance_score'],
             'risk_level': result.risk_assessment['risk_level'],
             'data_quality': result.data_quality_score,
             'real_data_percentage': result.real_data_percentage,
             'extraction_time': result.extraction_time,
             'recommendations_count': len(result.recommendations),
-            'enterprise_data_source': result.enterprise_info.data_source,
-            'vss_data_source': result.vss_info.data_source
+            'enterprise_data_source': ei.data_source,
+            'vss_data_source': vi.data_source
         }
     
     def _format_detailed_output(self, result: RealIntegratedResult) -> Dict[str, Any]:
         """Format output as detailed report with real data indicators"""
+        ei = result.enterprise_info
+        vi = result.vss_info
         return {
             'success': True,
             'data_type': 'real_data',
-            'mst': result.enterprise_info.mst,
+            'mst': ei.mst,
             'timestamp': result.generated_at,
             'extraction_time': result.extraction_time,
             'data_quality_score': result.data_quality_score,
             'integration_confidence': result.integration_confidence,
             'real_data_percentage': result.real_data_percentage,
             'enterprise_summary': {
-                'company_name': result.enterprise_info.ten_doanh_nghiep,
-                'address': result.enterprise_info.dia_chi,
-                'phone': result.enterprise_info.so_dien_thoai,
-                'website': result.enterprise_info.website,
-                'sector': result.enterprise_info.nganh_nghe,
-                'type': result.enterprise_info.loai_hinh,
-                'revenue': result.enterprise_info.doanh_thu,
-                'bank_account': result.enterprise_info.so_ngan_hang,
-                'registration_date': result.enterprise_info.ngay_cap,
-                'expiry_date': result.enterprise_info.ngay_het_han,
-                'data_quality': result.enterprise_info.data_quality,
-                'data_source': result.enterprise_info.data_source
+                'company_name': ei.ten_doanh_nghiep,
+                'address': ei.dia_chi,
+                'phone': ei.so_dien_thoai,
+                'website': ei.website,
+                'sector': ei.nganh_nghe,
+                'type': ei.loai_hinh,
+                'revenue': ei.doanh_thu,
+                'bank_account': ei.so_ngan_hang,
+                'registration_date': ei.ngay_cap,
+                'expiry_date': ei.ngay_het_han,
+                'data_quality': ei.data_quality,
+                'data_source': ei.data_source
             },
             'vss_summary': {
-                'total_employees': len(result.vss_info.employees),
-                'total_contributions': len(result.vss_info.contributions),
-                'total_claims': len(result.vss_info.claims),
-                'total_hospitals': len(result.vss_info.hospitals),
+                'total_employees': len(vi.employees),
+                'total_contributions': len(vi.contributions),
+                'total_claims': len(vi.claims),
+                'total_hospitals': len(vi.hospitals),
                 'compliance_score': result.compliance_report['overall_compliance_score'],
                 'risk_level': result.risk_assessment['risk_level'],
-                'data_quality': result.vss_info.data_quality,
-                'data_source': result.vss_info.data_source
+                'data_quality': vi.data_quality,
+                'data_source': vi.data_source
             },
             'analysis_summary': {
                 'employee_analysis': result.employee_analysis,
@@ -235,237 +487,182 @@ class RealMSTProcessor:
     
     def _format_real_data_output(self, result: RealIntegratedResult) -> Dict[str, Any]:
         """Format output showing only real data (no simulated data)"""
-        real_enterprise_data = {}
-        real_vss_data = {}
+        ei = result.enterprise_info
+        vi = result.vss_info
+        has_enterprise = ei.data_source != _NONE_SOURCE and bool(ei.ten_doanh_nghiep)
+        has_vss = vi.data_source != _NONE_SOURCE
         
         # Filter enterprise data - only include if it's real
-        if result.enterprise_info.data_source != 'none' and result.enterprise_info.ten_doanh_nghiep:
-            real_enterprise_data = {
-                'mst': result.enterprise_info.mst,
-                'ten_doanh_nghiep': result.enterprise_info.ten_doanh_nghiep,
-                'dia_chi': result.enterprise_info.dia_chi,
-                'nganh_nghe': result.enterprise_info.nganh_nghe,
-                'loai_hinh': result.enterprise_info.loai_hinh,
-                'so_dien_thoai': result.enterprise_info.so_dien_thoai,
-                'website': result.enterprise_info.website,
-                'doanh_thu': result.enterprise_info.doanh_thu,
-                'data_quality': result.enterprise_info.data_quality,
-                'data_source': result.enterprise_info.data_source
-            }
+        real_enterprise_data = {
+            'mst': ei.mst,
+            'ten_doanh_nghiep': ei.ten_doanh_nghiep,
+            'dia_chi': ei.dia_chi,
+            'nganh_nghe': ei.nganh_nghe,
+            'loai_hinh': ei.loai_hinh,
+            'so_dien_thoai': ei.so_dien_thoai,
+            'website': ei.website,
+            'doanh_thu': ei.doanh_thu,
+            'data_quality': ei.data_quality,
+            'data_source': ei.data_source
+        } if has_enterprise else {}
         
         # Filter VSS data - only include if it's real
-        if result.vss_info.data_source != 'none':
-            real_vss_data = {
-                'employees': result.vss_info.employees,
-                'contributions': result.vss_info.contributions,
-                'claims': result.vss_info.claims,
-                'hospitals': result.vss_info.hospitals,
-                'compliance': result.vss_info.compliance,
-                'risk_assessment': result.vss_info.risk_assessment,
-                'data_quality': result.vss_info.data_quality,
-                'data_source': result.vss_info.data_source
-            }
+        real_vss_data = {
+            'employees': vi.employees,
+            'contributions': vi.contributions,
+            'claims': vi.claims,
+            'hospitals': vi.hospitals,
+            'compliance': vi.compliance,
+            'risk_assessment': vi.risk_assessment,
+            'data_quality': vi.data_quality,
+            'data_source': vi.data_source
+        } if has_vss else {}
         
         return {
             'success': True,
             'data_type': 'real_data_only',
-            'mst': result.enterprise_info.mst,
+            'mst': ei.mst,
             'timestamp': result.generated_at,
             'real_data_percentage': result.real_data_percentage,
             'enterprise_data': real_enterprise_data,
             'vss_data': real_vss_data,
-            'has_real_enterprise_data': bool(real_enterprise_data),
-            'has_real_vss_data': bool(real_vss_data),
+            'has_real_enterprise_data': has_enterprise,
+            'has_real_vss_data': has_vss,
             'extraction_time': result.extraction_time
         }
     
+    # Output format name -> formatter, used by process_mst
+    _FORMATTERS = {
+        'json': _format_json_output,
+        'summary': _format_summary_output,
+        'detailed': _format_detailed_output,
+        'real_data_only': _format_real_data_output
+    }
+    
     def _save_results(self, result: RealIntegratedResult, mst: str):
         """Save results to file"""
         try:
             filename = self.integration_system.save_result(result)
-            self.logger.info(f"📁 Real results saved to {filename}")
+            self.logger.info("📁 Real results saved to %s", filename)
         except Exception as e:
-            self.logger.error(f"❌ Error saving results: {e}")
+            self.logger.error("❌ Error saving results: %s", e)
     
-    def _generate_report(self, result: RealIntegratedResult, mst: str):
-        """Generate comprehensive report"""
+    def _generate_report(self, result: RealIntegratedResult, mst: str, now: Optional[datetime] = None,
+                         stats: Optional[IntegrationStats] = None):
+        """Generate comprehensive report (stats: counters to report, default the live ones)"""
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            report_filename = f"reports/real_vss_integration_report_{mst}_{timestamp}.md"
+            now = now or datetime.now()
+            report_filename = f"{_ensure_dir('reports')}/real_vss_integration_report_{mst}_{now:%Y%m%d_%H%M%S}.md"
             
-            report_content = self._create_real_data_markdown_report(result)
+            report_content = self._create_real_data_markdown_report(result, now, stats)
             
-            with open(report_filename, 'w', encoding='utf-8') as f:
-                f.write(report_content)
+            with open(report_filename, 'wb') as f:
+                f.write(report_content.encode('utf-8'))
             
-            self.logger.info(f"📊 Real data report generated: {report_filename}")
+            self.logger.info("📊 Real data report generated: %s", report_filename)
         except Exception as e:
-            self.logger.error(f"❌ Error generating report: {e}")
+            self.logger.error("❌ Error generating report: %s", e)
     
-    def _create_real_data_markdown_report(self, result: RealIntegratedResult) -> str:
-        """Create markdown report for real data"""
-        report = f"""# 🏢 **BÁO CÁO TÍCH HỢP VSS - DOANH NGHIỆP (DỮ LIỆU THỰC TẾ)**
-
-## 📊 **THÔNG TIN TỔNG QUAN**
-
-- **MST:** {result.enterprise_info.mst}
-- **Tên doanh nghiệp:** {result.enterprise_info.ten_doanh_nghiep}
-- **Địa chỉ:** {result.enterprise_info.dia_chi}
-- **Ngành nghề:** {result.enterprise_info.nganh_nghe}
-- **Loại hình:** {result.enterprise_info.loai_hinh}
-- **Doanh thu:** {result.enterprise_info.doanh_thu:,.0f} VND
-- **Thời gian trích xuất:** {result.extraction_time:.2f} giây
-- **Chất lượng dữ liệu:** {result.data_quality_score:.1f}%
-- **Độ tin cậy tích hợp:** {result.integration_confidence:.1f}%
-- **Tỷ lệ dữ liệu thực tế:** {result.real_data_percentage:.1f}%
-
----
-
-## 🏢 **THÔNG TIN DOANH NGHIỆP (DỮ LIỆU THỰC TẾ)**
-
-### **Nguồn dữ liệu:** {result.enterprise_info.data_source}
-### **Chất lượng dữ liệu:** {result.enterprise_info.data_quality:.1f}%
-
-### **Thông tin cơ bản:**
-- **Mã số thuế:** {result.enterprise_info.mst}
-- **Tên doanh nghiệp:** {result.enterprise_info.ten_doanh_nghiep}
-- **Địa chỉ:** {result.enterprise_info.dia_chi}
-- **Số điện thoại:** {result.enterprise_info.so_dien_thoai}
-- **Website:** {result.enterprise_info.website}
-
-### **Thông tin kinh doanh:**
-- **Ngành nghề:** {result.enterprise_info.nganh_nghe}
-- **Loại hình:** {result.enterprise_info.loai_hinh}
-- **Doanh thu:** {result.enterprise_info.doanh_thu:,.0f} VND
-- **Tài khoản ngân hàng:** {result.enterprise_info.so_ngan_hang}
-
-### **Thông tin đăng ký:**
-- **Ngày cấp:** {result.enterprise_info.ngay_cap}
-- **Ngày hết hạn:** {result.enterprise_info.ngay_het_han}
-
----
-
-## 👥 **THÔNG TIN VSS (DỮ LIỆU THỰC TẾ)**
-
-### **Nguồn dữ liệu:** {result.vss_info.data_source}
-### **Chất lượng dữ liệu:** {result.vss_info.data_quality:.1f}%
-
-### **Nhân viên:**
-- **Tổng số nhân viên:** {len(result.vss_info.employees)}
-- **Nhân viên hoạt động:** {result.employee_analysis.get('active_employees', 0)}
-- **Lương trung bình:** {result.employee_analysis.get('average_salary', 0):,.0f} VND
-
-### **Đóng góp BHXH:**
-- **Tổng số đóng góp:** {len(result.vss_info.contributions)}
-- **Tổng số tiền đóng góp:** {result.contribution_analysis.get('total_contribution_amount', 0):,.0f} VND
-- **Đóng góp trung bình:** {result.contribution_analysis.get('average_contribution', 0):,.0f} VND
-
-### **Hồ sơ yêu cầu:**
-- **Tổng số hồ sơ:** {len(result.vss_info.claims)}
-
-### **Bệnh viện:**
-- **Tổng số bệnh viện:** {len(result.vss_info.hospitals)}
-
----
-
-## 📊 **PHÂN TÍCH TUÂN THỦ (DỮ LIỆU THỰC TẾ)**
-
-### **Điểm tuân thủ tổng thể:** {result.compliance_report['overall_compliance_score']:.1f}%
-
-### **Trạng thái tuân thủ:**
-- **Tuân thủ đăng ký:** {'✅' if result.compliance_report['registration_compliance'] else '❌'}
-- **Tuân thủ đóng góp:** {'✅' if result.compliance_report['contribution_compliance'] else '❌'}
-- **Tuân thủ nhân viên:** {'✅' if result.compliance_report['employee_compliance'] else '❌'}
-
-### **Vấn đề tuân thủ:**
-{chr(10).join([f"- {issue}" for issue in result.compliance_report.get('compliance_issues', [])]) if result.compliance_report.get('compliance_issues') else "- Không có vấn đề tuân thủ"}
-
----
-
-## ⚠️ **ĐÁNH GIÁ RỦI RO (DỮ LIỆU THỰC TẾ)**
-
-### **Mức độ rủi ro:** {result.risk_assessment['risk_level'].upper()}
-### **Điểm rủi ro:** {result.risk_assessment['risk_score']:.1f}/100
-
-### **Yếu tố rủi ro:**
-{chr(10).join([f"- {factor}" for factor in result.risk_assessment.get('risk_factors', [])]) if result.risk_assessment.get('risk_factors') else "- Không có yếu tố rủi ro"}
-
-### **Chiến lược giảm thiểu:**
-{chr(10).join([f"- {strategy}" for strategy in result.risk_assessment.get('mitigation_strategies', [])]) if result.risk_assessment.get('mitigation_strategies') else "- Không có chiến lược giảm thiểu"}
-
----
-
-## 💡 **KHUYẾN NGHỊ (DỰA TRÊN DỮ LIỆU THỰC TẾ)**
-
-{chr(10).join([f"{i}. {rec}" for i, rec in enumerate(result.recommendations, 1)])}
-
----
-
-## 📈 **THỐNG KÊ HỆ THỐNG**
-
-- **Tổng số yêu cầu:** {self.integration_system.stats['total_requests']}
-- **Yêu cầu thành công:** {self.integration_system.stats['successful_requests']}
-- **Yêu cầu thất bại:** {self.integration_system.stats['failed_requests']}
-- **Tỷ lệ thành công:** {self.integration_system.stats['successful_requests'] / self.integration_system.stats['total_requests'] * 100 if self.integration_system.stats['total_requests'] > 0 else 0:.1f}%
-- **Trích xuất dữ liệu thực tế:** {self.integration_system.stats['real_data_extractions']}
-- **Trích xuất dữ liệu mô phỏng:** {self.integration_system.stats['simulated_data_extractions']}
-
----
-
-## 🎯 **XÁC NHẬN DỮ LIỆU THỰC TẾ**
-
-### **✅ DỮ LIỆU DOANH NGHIỆP:**
-- **Nguồn:** {result.enterprise_info.data_source}
-- **Chất lượng:** {result.enterprise_info.data_quality:.1f}%
-- **Trạng thái:** {'✅ Thực tế' if result.enterprise_info.data_source != 'none' else '❌ Không có dữ liệu'}
-
-### **✅ DỮ LIỆU VSS:**
-- **Nguồn:** {result.vss_info.data_source}
-- **Chất lượng:** {result.vss_info.data_quality:.1f}%
-- **Trạng thái:** {'✅ Thực tế' if result.vss_info.data_source != 'none' else '❌ Không có dữ liệu'}
-
-### **📊 TỔNG KẾT:**
-- **Tỷ lệ dữ liệu thực tế:** {result.real_data_percentage:.1f}%
-- **Chất lượng tổng thể:** {result.data_quality_score:.1f}%
-- **Độ tin cậy tích hợp:** {result.integration_confidence:.1f}%
-
----
-
-*Báo cáo dữ liệu thực tế được tạo lúc: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}*  
-*Hệ thống: Real VSS Enterprise Integration System v1.0*  
-*Trạng thái: 100% Dữ liệu thực tế*
-"""
-        return report
+    def _create_real_data_markdown_report(self, result: RealIntegratedResult,
+                                          now: Optional[datetime] = None,
+                                          stats: Optional[IntegrationStats] = None) -> str:
+        """Create markdown report for real data (now: report timestamp; stats: counters to report)"""
+        enterprise = result.enterprise_info
+        vss = result.vss_info
+        compliance = result.compliance_report
+        risk = result.risk_assessment
+        stats = stats or self.integration_system.stats
+        
+        return self._REPORT_TEMPLATE.format_map({
+            'mst': enterprise.mst,
+            'ten_doanh_nghiep': enterprise.ten_doanh_nghiep,
+            'dia_chi': enterprise.dia_chi,
+            'nganh_nghe': enterprise.nganh_nghe,
+            'loai_hinh': enterprise.loai_hinh,
+            'doanh_thu': f"{enterprise.doanh_thu:,.0f}",
+            'so_dien_thoai': enterprise.so_dien_thoai,
+            'website': enterprise.website,
+            'so_ngan_hang': enterprise.so_ngan_hang,
+            'ngay_cap': enterprise.ngay_cap,
+            'ngay_het_han': enterprise.ngay_het_han,
+            'enterprise_data_source': enterprise.data_source,
+            'enterprise_data_quality': f"{enterprise.data_quality:.1f}",
+            'enterprise_status': '✅ Thực tế' if enterprise.data_source != _NONE_SOURCE else '❌ Không có dữ liệu',
+            'extraction_time': f"{result.extraction_time:.2f}",
+            'data_quality_score': f"{result.data_quality_score:.1f}",
+            'integration_confidence': f"{result.integration_confidence:.1f}",
+            'real_data_percentage': f"{result.real_data_percentage:.1f}",
+            'vss_data_source': vss.data_source,
+            'vss_data_quality': f"{vss.data_quality:.1f}",
+            'vss_status': '✅ Thực tế' if vss.data_source != _NONE_SOURCE else '❌ Không có dữ liệu',
+            'employee_count': len(vss.employees),
+            'contribution_count': len(vss.contributions),
+            'claim_count': len(vss.claims),
+            'hospital_count': len(vss.hospitals),
+            'active_employees': result.employee_analysis.get('active_employees', 0),
+            'average_salary': f"{result.employee_analysis.get('average_salary', 0):,.0f}",
+            'total_contribution_amount': f"{result.contribution_analysis.get('total_contribution_amount', 0):,.0f}",
+            'average_contribution': f"{result.contribution_analysis.get('average_contribution', 0):,.0f}",
+            'overall_compliance_score': f"{compliance['overall_compliance_score']:.1f}",
+            'registration_compliance': '✅' if compliance['registration_compliance'] else '❌',
+            'contribution_compliance': '✅' if compliance['contribution_compliance'] else '❌',
+            'employee_compliance': '✅' if compliance['employee_compliance'] else '❌',
+            'compliance_issues': "\n".join(f"- {issue}" for issue in
+                                           compliance.get('compliance_issues') or ("Không có vấn đề tuân thủ",)),
+            'risk_level': risk['risk_level'].upper(),
+            'risk_score': f"{risk['risk_score']:.1f}",
+            'risk_factors': "\n".join(f"- {factor}" for factor in
+                                      risk.get('risk_factors') or ("Không có yếu tố rủi ro",)),
+            'mitigation_strategies': "\n".join(f"- {strategy}" for strategy in
+                                               risk.get('mitigation_strategies') or ("Không có chiến lược giảm thiểu",)),
+            'recommendations': "\n".join(f"{i}. {rec}" for i, rec in enumerate(result.recommendations, 1)),
+            'total_requests': stats.total_requests,
+            'successful_requests': stats.successful_requests,
+            'failed_requests': stats.failed_requests,
+            'success_rate': f"{stats.success_rate:.1f}",
+            'real_data_extractions': stats.real_data_extractions,
+            'simulated_data_extractions': stats.simulated_data_extractions,
+            'generated_at': f"{now or datetime.now():%Y-%m-%d %H:%M:%S}"
+        }) + self._REPORT_FOOTER
 
 def main():
     """Main function for command line interface"""
     parser = argparse.ArgumentParser(description='Real VSS Enterprise Integration System - Real Data MST Processor')
-    parser.add_argument('mst', help='MST (Tax Code) to process with real data')
+    parser.add_argument('mst', nargs='+', help='MST (Tax Code) to process with real data; several may be given')
     parser.add_argument('--format', choices=['json', 'summary', 'detailed', 'real_data_only'], default='json',
                        help='Output format (default: json)')
     parser.add_argument('--config', help='Configuration file path')
     parser.add_argument('--output', help='Output file path')
+    parser.add_argument('--compact', action='store_true',
+                       help='Write compact JSON (default when stdout is not a terminal)')
     parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
     
     args = parser.parse_args()
     
-    # Set logging level
-    if args.verbose:
-        logging.getLogger().setLevel(logging.DEBUG)
+    # Set up logging (DEBUG when verbose)
+    listener = _configure_logging(logging.DEBUG if args.verbose else logging.INFO)
     
-    # Create processor
-    processor = RealMSTProcessor(args.config)
-    
-    # Process MST
-    result = processor.process_mst(args.mst, args.format)
+    try:
+        # Create processor; leaving the block flushes pending file writes
+        with RealMSTProcessor(args.config) as processor:
+            # Process MST(s); a single MST keeps the single-result output shape
+            if len(args.mst) == 1:
+                result = processor.process_mst(args.mst[0], args.format)
+            else:
+                result = processor.process_msts(args.mst, args.format)
+    finally:
+        listener.stop()
     
-    # Output result
+    # Output result; pretty-printing is skipped for --compact and for piped stdout
     if args.output:
-        with open(args.output, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        with open(args.output, 'wb') as f:
+            f.write(_json_dumps_bytes(result, indent=not args.compact))
         print(f"✅ Real data result saved to {args.output}")
     else:
-        print(json.dumps(result, ensure_ascii=False, indent=2))
+        indent = not args.compact and sys.stdout.isatty()
+        sys.stdout.flush()
+        sys.stdout.buffer.write(_json_dumps_bytes(result, indent) + b'\n')
+        sys.stdout.buffer.flush()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -4,24 +4,226 @@ Real VSS Client - Fixed version with proper VSS system connection
 Connects to VSS system with real data extraction
 """
 
+import asyncio
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+from urllib3.util.retry import Retry
 import json
 import logging
-from typing import Dict, List, Any, Optional
-from datetime import datetime
+from typing import Callable, Dict, List, Any, Optional, Tuple
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import time
+import random
 import re
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import urllib.parse
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from rate_limiter import AsyncTokenBucket
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    orjson = None
+
+# orjson parses bytes directly and raises a JSONDecodeError subclass of json's
+_json_loads = orjson.loads if orjson else json.loads
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; list endpoints are then parsed in one go
+    ijson = None
+
+_JSON_ERRORS = (json.JSONDecodeError, ijson.JSONError) if ijson else (json.JSONDecodeError,)
+
+# Failures while reading a response body after the request itself succeeded
+# (dropped connection, read timeout, truncated chunked body)
+_BODY_READ_ERRORS = (requests.RequestException, Urllib3HTTPError)
+
+# Statuses _make_request returns a response for; any other status yields None
+_OK_STATUSES = (200, 302)
+# Statuses of a server that does not support HEAD, so test_connection retries with GET
+_HEAD_UNSUPPORTED_STATUSES = (405, 501)
+
+try:
+    from lxml import etree
+    _HTML_PARSER = 'lxml'
+except ImportError:  # lxml is optional; fall back to the pure-Python parser
+    etree = None
+    _HTML_PARSER = 'html.parser'
+
+if etree is not None:
+    # Data pages are parsed with lxml directly, skipping the BeautifulSoup tree
+    _LXML_PARSER = etree.HTMLParser(recover=True, encoding='utf-8')
+    
+    def _parse_html(page: bytes) -> Any:
+        """Parse an HTML page into a document for _table_rows (None if empty)"""
+        return etree.fromstring(page, _LXML_PARSER)
+    
+    def _table_rows(document: Any):
+        """Yield each table of a document as a list of rows of stripped cell texts"""
+        for table in document.iter('table'):
+            yield [[''.join(cell.itertext()).strip() for cell in row.xpath('.//td|.//th')]
+                   for row in table.xpath('.//tr')]
+else:
+    def _parse_html(page: bytes) -> Any:
+        """Parse an HTML page into a document for _table_rows"""
+        return BeautifulSoup(page, _HTML_PARSER)
+    
+    def _table_rows(document: Any):
+        """Yield each table of a document as a list of rows of stripped cell texts"""
+        for table in document.find_all('table'):
+            yield [[cell.get_text().strip() for cell in row.find_all(['td', 'th'])]
+                   for row in table.find_all('tr')]
+
+class _DigitFilter(dict):
+    """str.translate table that keeps decimal digits and '.', deleting every other character
+    
+    Entries are filled in on first sight of each code point.
+    """
+    def __missing__(self, codepoint: int) -> Optional[int]:
+        char = chr(codepoint)
+        kept = codepoint if char.isdecimal() or char == '.' else None
+        self[codepoint] = kept
+        return kept
+
+_SALARY_CHARS = _DigitFilter()
+
+# Candidate API endpoints per VSS resource as URL templates, in priority order
+_RESOURCE_ENDPOINTS = {
+    'employees': ('/api/employees?mst={mst}', '/api/employee/list?mst={mst}', '/employees?mst={mst}',
+                  '/api/vss/employees?mst={mst}', '/api/bhxh/employees?mst={mst}'),
+    'contributions': ('/api/contributions?mst={mst}', '/api/contribution/list?mst={mst}', '/contributions?mst={mst}',
+                      '/api/vss/contributions?mst={mst}', '/api/bhxh/contributions?mst={mst}'),
+    'claims': ('/api/claims?mst={mst}', '/api/claim/list?mst={mst}', '/claims?mst={mst}',
+               '/api/vss/claims?mst={mst}', '/api/bhxh/claims?mst={mst}'),
+    'hospitals': ('/api/hospitals?mst={mst}', '/api/hospital/list?mst={mst}', '/hospitals?mst={mst}',
+                  '/api/vss/hospitals?mst={mst}', '/api/bhxh/hospitals?mst={mst}')
+}
+
+# Cleaned record layout per resource: (id field, id template for records without one,
+# fields). Each field is (name, source keys tried in order, default or default factory,
+# whether the value is an amount parsed with _extract_salary).
+_CLEAN_SPECS = {
+    'employees': ('employee_id', 'EMP_{n:03d}_{mst}', (
+        ('full_name', ('full_name', 'name', 'ho_ten'), '', False),
+        ('position', ('position', 'chuc_vu', 'job_title'), '', False),
+        ('salary', ('salary', 'luong', 'wage'), 0, True),
+        ('start_date', ('start_date', 'ngay_bat_dau', 'join_date'), '', False),
+        ('status', ('status', 'trang_thai'), 'active', False)
+    )),
+    'contributions': ('contribution_id', 'CONT_{n:03d}_{mst}', (
+        ('employee_id', ('employee_id',), '', False),
+        ('contribution_amount', ('contribution_amount', 'so_tien', 'amount'), 0, True),
+        ('contribution_date', ('contribution_date', 'ngay_dong', 'date'), '', False),
+        ('contribution_type', ('contribution_type', 'loai_dong', 'type'), 'social_insurance', False)
+    )),
+    'claims': ('claim_id', 'CLAIM_{n:03d}_{mst}', (
+        ('employee_id', ('employee_id',), '', False),
+        ('claim_type', ('claim_type', 'loai_yeu_cau', 'type'), 'medical', False),
+        ('claim_amount', ('claim_amount', 'so_tien', 'amount'), 0, True),
+        ('claim_date', ('claim_date', 'ngay_yeu_cau', 'date'), '', False),
+        ('status', ('status', 'trang_thai', 'state'), 'pending', False)
+    )),
+    'hospitals': ('hospital_id', 'HOSP_{n:03d}', (
+        ('hospital_name', ('hospital_name', 'ten_benh_vien', 'name'), '', False),
+        ('address', ('address', 'dia_chi', 'location'), '', False),
+        ('phone', ('phone', 'dien_thoai', 'contact'), '', False),
+        ('specialties', ('specialties', 'chuyen_khoa', 'departments'), list, False)
+    ))
+}
+
+# HTML pages kept per client for the HTML extractors (raw from the API probes, or parsed)
+_PAGE_CACHE_SIZE = 10
+# Default seconds a cached page may be reused (the integration passes its 'cache_duration')
+_PAGE_CACHE_TTL = 3600
+
+# Seconds a fetched login page (CSRF token and form) may be reused
+_LOGIN_PAGE_TTL = 60
+
+# Markers of a logged-in page, matched against the raw response body
+_LOGIN_SUCCESS_RE = re.compile(rb'dashboard|welcome', re.IGNORECASE)
+
+# The login page is only read for its form, inputs and title
+_LOGIN_PAGE_STRAINER = SoupStrainer(['form', 'input', 'title'])
+
+def _stream_records(stream, list_key: str) -> List[Dict[str, Any]]:
+    """Collect the records of a list endpoint while parsing its body incrementally
+    
+    Follows the same shape rules as a full parse: a top-level array, else
+    the 'data' member, else the list_key member.
+    """
+    # Element prefix -> (prefix of the array holding it, result key). ijson gives a
+    # member literally named "item" the same prefix, hence the array check below.
+    targets = {'item': ('', 'item'), 'data.item': ('data', 'data'), f'{list_key}.item': (list_key, list_key)}
+    arrays = set()
+    found: Dict[str, List[Any]] = {}
+    top_keys = set()
+    
+    events = ijson.parse(stream, use_float=True)
+    for prefix, event, value in events:
+        if prefix == '' and event == 'map_key':
+            top_keys.add(value)
+            continue
+        if event == 'start_array' and prefix in ('', 'data', list_key):
+            arrays.add(prefix)
+            continue
+        parent, target = targets.get(prefix, (None, None))
+        if parent not in arrays:
+            continue
+        
+        if event in ('start_map', 'start_array'):
+            builder = ijson.ObjectBuilder()
+            end_event = event.replace('start', 'end')
+            item_prefix = prefix
+            while (prefix, event) != (item_prefix, end_event):
+                builder.event(event, value)
+                prefix, event, value = next(events)
+            found.setdefault(target, []).append(builder.value)
+        else:
+            found.setdefault(target, []).append(value)
+    
+    if 'item' in found:
+        return found['item']
+    if 'data' in top_keys:
+        return found.get('data', [])
+    return found.get(list_key, [])
 
 class RealVSSClient:
     """Real VSS Client with proper system connection"""
     
-    def __init__(self, base_url: str = "http://vssapp.teca.vn:8088"):
+    __slots__ = ('base_url', 'session', 'logger', 'is_authenticated', 'csrf_token', 'session_id',
+                 'stats', '_stats_lock', '_probe_executor', '_page_cache', '_page_lock', '_page_ttl',
+                 '_login_page_cache')
+    
+    def __init__(self, base_url: str = "http://vssapp.teca.vn:8088",
+                 adapter: Optional[HTTPAdapter] = None, page_ttl: float = _PAGE_CACHE_TTL):
         self.base_url = base_url
         self.session = requests.Session()
         self.logger = logging.getLogger(self.__class__.__name__)
         
+        # Keep-alive pool sized for concurrent endpoint probes; idempotent
+        # requests are retried on gateway errors (POST logins are not).
+        # A caller-supplied adapter shares its connection pool with other clients.
+        if adapter is None:
+            adapter = HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=32,
+                max_retries=Retry(
+                    total=3,
+                    backoff_factor=0.3,
+                    status_forcelist=(502, 503, 504),
+                    raise_on_status=False
+                )
+            )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
         # Configure session
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -40,61 +242,119 @@ class RealVSSClient:
         self.is_authenticated = False
         self.csrf_token = None
         self.session_id = None
+        # (monotonic fetch time, get_login_page result); dropped once a login is posted
+        self._login_page_cache: Optional[Tuple[float, Dict[str, Any]]] = None
         
         # Statistics
         self.stats = {
             'total_requests': 0,
             'successful_requests': 0,
             'failed_requests': 0,
-            'total_response_time': 0
+            'total_response_time_ns': 0
         }
+        self._stats_lock = threading.Lock()
+        
+        # Endpoint probes for one resource run concurrently on this pool
+        self._probe_executor = ThreadPoolExecutor(max_workers=5, thread_name_prefix='vss-probe')
+        
+        # HTML pages shared by the API probes and HTML extractors (url -> body or parse, LRU).
+        # Several HTML fallback URLs are also API candidates, so a probe that gets a page
+        # back leaves it here instead of the fallback requesting it again.
+        # Entries are (monotonic store time, page) and expire after page_ttl seconds.
+        self._page_cache: 'OrderedDict[str, Tuple[float, Any]]' = OrderedDict()
+        self._page_lock = threading.Lock()
+        self._page_ttl = page_ttl
+    
+    def clear_cache(self):
+        """Drop cached HTML pages"""
+        with self._page_lock:
+            self._page_cache.clear()
+    
+    def close(self):
+        """Stop the endpoint probe threads; queued probes are cancelled"""
+        self._probe_executor.shutdown(cancel_futures=True)
+    
+    def _cache_page(self, url: str, page: Any):
+        """Remember a page body or its parse for the HTML extractors"""
+        with self._page_lock:
+            self._page_cache[url] = (time.monotonic(), page)
+            self._page_cache.move_to_end(url)
+            if len(self._page_cache) > _PAGE_CACHE_SIZE:
+                self._page_cache.popitem(last=False)
+    
+    def _get_document(self, url: str) -> Any:
+        """Fetch and parse an HTML page, reusing a recent fetch or parse of the same URL"""
+        page = None
+        with self._page_lock:
+            entry = self._page_cache.get(url)
+            if entry is not None:
+                if time.monotonic() - entry[0] < self._page_ttl:
+                    page = entry[1]
+                    self._page_cache.move_to_end(url)
+                else:
+                    del self._page_cache[url]
+        if page is not None and not isinstance(page, bytes):
+            return page
+        
+        if page is None:
+            response = self._make_request(url)
+            if not (response and response.status_code == 200):
+                return None
+            page = response.content
+        
+        document = _parse_html(page)
+        if document is not None:
+            self._cache_page(url, document)
+        return document
+    
+    def _add_stat(self, key: str, amount: float = 1):
+        """Update a statistics counter (requests may run on probe threads)"""
+        with self._stats_lock:
+            self.stats[key] += amount
     
     def _make_request(self, url: str, method: str = 'GET', data: Optional[Dict] = None, 
-                     headers: Optional[Dict] = None, timeout: int = 30) -> Optional[requests.Response]:
-        """Make HTTP request with proper error handling"""
+                     headers: Optional[Dict] = None, timeout: int = 30,
+                     stream: bool = False,
+                     ok_statuses: Tuple[int, ...] = _OK_STATUSES) -> Optional[requests.Response]:
+        """Make HTTP request with proper error handling (None unless the status is in ok_statuses)"""
         try:
-            self.stats['total_requests'] += 1
-            start_time = time.time()
-            
-            self.logger.info(f"🌐 Making {method} request to: {url}")
-            if data:
-                self.logger.info(f"📋 Data: {data}")
+            self._add_stat('total_requests')
+            start_ns = time.monotonic_ns()
             
-            # Merge headers
-            request_headers = self.session.headers.copy()
-            if headers:
-                request_headers.update(headers)
+            # Request bodies carry credentials, so only the target is logged
+            debug = self.logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                self.logger.debug("🌐 Making %s request to: %s", method, url)
             
-            if method.upper() == 'GET':
-                response = self.session.get(url, headers=request_headers, timeout=timeout)
-            elif method.upper() == 'POST':
-                response = self.session.post(url, data=data, headers=request_headers, timeout=timeout)
-            else:
-                response = self.session.request(method, url, data=data, headers=request_headers, timeout=timeout)
+            # requests merges per-call headers over the session headers itself
+            response = self.session.request(method.upper(), url, data=data, headers=headers,
+                                            timeout=timeout, stream=stream)
             
-            response_time = time.time() - start_time
-            self.stats['total_response_time'] += response_time
+            response_time_ns = time.monotonic_ns() - start_ns
+            self._add_stat('total_response_time_ns', response_time_ns)
             
-            self.logger.info(f"📊 Response: {response.status_code} in {response_time:.2f}s")
+            if debug:
+                self.logger.debug("📊 Response: %s in %.2fs", response.status_code, response_time_ns / 1e9)
             
-            if response.status_code in [200, 302]:
-                self.stats['successful_requests'] += 1
+            if response.status_code in ok_statuses:
+                self._add_stat('successful_requests')
                 return response
             else:
-                self.stats['failed_requests'] += 1
+                self._add_stat('failed_requests')
                 self.logger.error(f"❌ HTTP {response.status_code}: {response.reason}")
+                response.close()
                 return None
                 
         except requests.exceptions.Timeout:
-            self.stats['failed_requests'] += 1
+            self._add_stat('failed_requests')
             self.logger.error(f"❌ Request timeout after {timeout}s")
             return None
         except requests.exceptions.ConnectionError:
-            self.stats['failed_requests'] += 1
+            self._add_stat('failed_requests')
             self.logger.error(f"❌ Connection error")
             return None
         except Exception as e:
-            self.stats['failed_requests'] += 1
+            self._add_stat('failed_requests')
             self.logger.error(f"❌ Unexpected error: {e}")
             return None
     
@@ -102,7 +362,14 @@ class RealVSSClient:
         """Test connection to VSS system"""
         try:
             self.logger.info("🔍 Testing VSS system connection...")
-            response = self._make_request(self.base_url)
+            # Only the status matters: try HEAD first, and fall back to a streamed
+            # GET (body never read) only for servers that do not support HEAD
+            response = self._make_request(self.base_url, method='HEAD', timeout=5,
+                                          ok_statuses=_OK_STATUSES + _HEAD_UNSUPPORTED_STATUSES)
+            if response is not None and response.status_code in _HEAD_UNSUPPORTED_STATUSES:
+                response = self._make_request(self.base_url, stream=True)
+                if response is not None:
+                    response.close()
             
             if response and response.status_code == 200:
                 self.logger.info("✅ VSS system is accessible")
@@ -116,12 +383,16 @@ class RealVSSClient:
     
     def get_login_page(self) -> Optional[Dict[str, Any]]:
         """Get login page and extract CSRF token"""
+        cached = self._login_page_cache
+        if cached is not None and time.monotonic() - cached[0] < _LOGIN_PAGE_TTL:
+            return cached[1]
+        
         try:
             self.logger.info("🔍 Getting login page...")
             response = self._make_request(f"{self.base_url}/login")
             
             if response and response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = BeautifulSoup(response.content, _HTML_PARSER, parse_only=_LOGIN_PAGE_STRAINER)
                 
                 # Extract CSRF token
                 csrf_token = None
@@ -140,9 +411,9 @@ class RealVSSClient:
                 if form:
                     form_method = form.get('method', 'POST').upper()
                 
-                # Extract form fields
+                # Extract form fields (only the login form's own inputs when there is a form)
                 form_fields = {}
-                inputs = soup.find_all('input')
+                inputs = (form or soup).find_all('input')
                 for input_tag in inputs:
                     name = input_tag.get('name')
                     input_type = input_tag.get('type', 'text')
@@ -159,6 +430,7 @@ class RealVSSClient:
                 }
                 
                 self.logger.info(f"✅ Login page retrieved: CSRF token found: {bool(csrf_token)}")
+                self._login_page_cache = (time.monotonic(), result)
                 return result
             else:
                 self.logger.error("❌ Failed to get login page")
@@ -202,8 +474,9 @@ class RealVSSClient:
                 else:
                     login_url = f"{self.base_url}/{login_page['form_action']}"
             
-            # Make login request
+            # Make login request; the CSRF token is spent either way
             response = self._make_request(login_url, method='POST', data=login_data)
+            self._login_page_cache = None
             
             if response:
                 # Check if login was successful
@@ -213,7 +486,7 @@ class RealVSSClient:
                     return True
                 elif response.status_code == 200:
                     # Check response content for success indicators
-                    if 'dashboard' in response.text.lower() or 'welcome' in response.text.lower():
+                    if _LOGIN_SUCCESS_RE.search(response.content):
                         self.is_authenticated = True
                         self.logger.info("✅ Login successful (content analysis)")
                         return True
@@ -231,193 +504,101 @@ class RealVSSClient:
             self.logger.error(f"❌ Login error: {e}")
             return False
     
-    def get_employee_data(self, mst: str) -> List[Dict[str, Any]]:
-        """Get employee data from VSS system"""
-        if not self.is_authenticated:
-            self.logger.error("❌ Not authenticated. Please login first.")
+    def _probe_endpoint(self, endpoint: str, list_key: str) -> List[Dict[str, Any]]:
+        """Fetch one candidate endpoint and return the records it lists, if any"""
+        url = f"{self.base_url}{endpoint}"
+        # With ijson the body is parsed as it arrives instead of buffered whole
+        response = self._make_request(url, stream=ijson is not None)
+        if response is None:
             return []
         
+        with response:
+            if response.status_code != 200:
+                return []
+            if 'html' in response.headers.get('Content-Type', ''):
+                self._cache_page(url, response.content)
+                return []
+            try:
+                if ijson:
+                    response.raw.decode_content = True
+                    return _stream_records(response.raw, list_key)
+                data = _json_loads(response.content)
+            except _JSON_ERRORS:
+                if not ijson:
+                    self._cache_page(url, response.content)
+                return []
+            except _BODY_READ_ERRORS as e:
+                # No data from this endpoint; the other probes and the HTML fallback still run
+                self.logger.debug("❌ Reading %s failed: %s", endpoint, e)
+                return []
+            
+            if isinstance(data, list):
+                return data
+            elif isinstance(data, dict) and 'data' in data:
+                return data['data']
+            elif isinstance(data, dict) and list_key in data:
+                return data[list_key]
+        return []
+    
+    def _probe_endpoints(self, endpoints: List[str], list_key: str) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+        """Probe candidate endpoints concurrently
+        
+        Returns (endpoint, records) for the first endpoint, in list order,
+        that yields records, or None. Remaining probes are cancelled.
+        """
+        futures = [self._probe_executor.submit(self._probe_endpoint, endpoint, list_key)
+                   for endpoint in endpoints]
         try:
-            self.logger.info(f"👥 Getting employee data for MST: {mst}")
-            
-            # Try different endpoints for employee data
-            endpoints = [
-                f"/api/employees?mst={mst}",
-                f"/api/employee/list?mst={mst}",
-                f"/employees?mst={mst}",
-                f"/api/vss/employees?mst={mst}",
-                f"/api/bhxh/employees?mst={mst}"
-            ]
-            
-            for endpoint in endpoints:
-                url = f"{self.base_url}{endpoint}"
-                response = self._make_request(url)
-                
-                if response and response.status_code == 200:
-                    try:
-                        data = response.json()
-                        if isinstance(data, list):
-                            employees = data
-                        elif isinstance(data, dict) and 'data' in data:
-                            employees = data['data']
-                        elif isinstance(data, dict) and 'employees' in data:
-                            employees = data['employees']
-                        else:
-                            employees = []
-                        
-                        if employees:
-                            self.logger.info(f"✅ Retrieved {len(employees)} employees from {endpoint}")
-                            return self._clean_employee_data(employees, mst)
-                    except json.JSONDecodeError:
-                        continue
-            
-            # If no API endpoint works, try to extract from HTML
-            return self._extract_employees_from_html(mst)
-            
-        except Exception as e:
-            self.logger.error(f"❌ Error getting employee data: {e}")
-            return []
+            for endpoint, future in zip(endpoints, futures):
+                records = future.result()
+                if records:
+                    return endpoint, records
+            return None
+        finally:
+            for future in futures:
+                future.cancel()
     
-    def get_contribution_data(self, mst: str) -> List[Dict[str, Any]]:
-        """Get contribution data from VSS system"""
+    def _fetch_resource(self, mst: str, resource: str, cleaner: Callable, html_fallback: Callable) -> List[Dict[str, Any]]:
+        """Fetch one VSS resource for an MST: probe its API endpoints, then fall back to HTML"""
         if not self.is_authenticated:
             self.logger.error("❌ Not authenticated. Please login first.")
             return []
         
         try:
-            self.logger.info(f"💰 Getting contribution data for MST: {mst}")
-            
-            # Try different endpoints for contribution data
-            endpoints = [
-                f"/api/contributions?mst={mst}",
-                f"/api/contribution/list?mst={mst}",
-                f"/contributions?mst={mst}",
-                f"/api/vss/contributions?mst={mst}",
-                f"/api/bhxh/contributions?mst={mst}"
-            ]
-            
-            for endpoint in endpoints:
-                url = f"{self.base_url}{endpoint}"
-                response = self._make_request(url)
-                
-                if response and response.status_code == 200:
-                    try:
-                        data = response.json()
-                        if isinstance(data, list):
-                            contributions = data
-                        elif isinstance(data, dict) and 'data' in data:
-                            contributions = data['data']
-                        elif isinstance(data, dict) and 'contributions' in data:
-                            contributions = data['contributions']
-                        else:
-                            contributions = []
-                        
-                        if contributions:
-                            self.logger.info(f"✅ Retrieved {len(contributions)} contributions from {endpoint}")
-                            return self._clean_contribution_data(contributions, mst)
-                    except json.JSONDecodeError:
-                        continue
+            endpoints = [template.format(mst=mst) for template in _RESOURCE_ENDPOINTS[resource]]
+            found = self._probe_endpoints(endpoints, resource)
+            if found:
+                endpoint, records = found
+                self.logger.info(f"✅ Retrieved {len(records)} {resource} from {endpoint}")
+                return cleaner(records, mst)
             
             # If no API endpoint works, try to extract from HTML
-            return self._extract_contributions_from_html(mst)
+            return html_fallback(mst)
             
         except Exception as e:
-            self.logger.error(f"❌ Error getting contribution data: {e}")
+            self.logger.error(f"❌ Error getting {resource} data: {e}")
             return []
     
+    def get_employee_data(self, mst: str) -> List[Dict[str, Any]]:
+        """Get employee data from VSS system"""
+        self.logger.info(f"👥 Getting employee data for MST: {mst}")
+        return self._fetch_resource(mst, 'employees', self._clean_employee_data, self._extract_employees_from_html)
+    
+    def get_contribution_data(self, mst: str) -> List[Dict[str, Any]]:
+        """Get contribution data from VSS system"""
+        self.logger.info(f"💰 Getting contribution data for MST: {mst}")
+        return self._fetch_resource(mst, 'contributions', self._clean_contribution_data,
+                                    self._extract_contributions_from_html)
+    
     def get_claim_data(self, mst: str) -> List[Dict[str, Any]]:
         """Get claim data from VSS system"""
-        if not self.is_authenticated:
-            self.logger.error("❌ Not authenticated. Please login first.")
-            return []
-        
-        try:
-            self.logger.info(f"📋 Getting claim data for MST: {mst}")
-            
-            # Try different endpoints for claim data
-            endpoints = [
-                f"/api/claims?mst={mst}",
-                f"/api/claim/list?mst={mst}",
-                f"/claims?mst={mst}",
-                f"/api/vss/claims?mst={mst}",
-                f"/api/bhxh/claims?mst={mst}"
-            ]
-            
-            for endpoint in endpoints:
-                url = f"{self.base_url}{endpoint}"
-                response = self._make_request(url)
-                
-                if response and response.status_code == 200:
-                    try:
-                        data = response.json()
-                        if isinstance(data, list):
-                            claims = data
-                        elif isinstance(data, dict) and 'data' in data:
-                            claims = data['data']
-                        elif isinstance(data, dict) and 'claims' in data:
-                            claims = data['claims']
-                        else:
-                            claims = []
-                        
-                        if claims:
-                            self.logger.info(f"✅ Retrieved {len(claims)} claims from {endpoint}")
-                            return self._clean_claim_data(claims, mst)
-                    except json.JSONDecodeError:
-                        continue
-            
-            # If no API endpoint works, try to extract from HTML
-            return self._extract_claims_from_html(mst)
-            
-        except Exception as e:
-            self.logger.error(f"❌ Error getting claim data: {e}")
-            return []
+        self.logger.info(f"📋 Getting claim data for MST: {mst}")
+        return self._fetch_resource(mst, 'claims', self._clean_claim_data, self._extract_claims_from_html)
     
     def get_hospital_data(self, mst: str) -> List[Dict[str, Any]]:
         """Get hospital data from VSS system"""
-        if not self.is_authenticated:
-            self.logger.error("❌ Not authenticated. Please login first.")
-            return []
-        
-        try:
-            self.logger.info(f"🏥 Getting hospital data for MST: {mst}")
-            
-            # Try different endpoints for hospital data
-            endpoints = [
-                f"/api/hospitals?mst={mst}",
-                f"/api/hospital/list?mst={mst}",
-                f"/hospitals?mst={mst}",
-                f"/api/vss/hospitals?mst={mst}",
-                f"/api/bhxh/hospitals?mst={mst}"
-            ]
-            
-            for endpoint in endpoints:
-                url = f"{self.base_url}{endpoint}"
-                response = self._make_request(url)
-                
-                if response and response.status_code == 200:
-                    try:
-                        data = response.json()
-                        if isinstance(data, list):
-                            hospitals = data
-                        elif isinstance(data, dict) and 'data' in data:
-                            hospitals = data['data']
-                        elif isinstance(data, dict) and 'hospitals' in data:
-                            hospitals = data['hospitals']
-                        else:
-                            hospitals = []
-                        
-                        if hospitals:
-                            self.logger.info(f"✅ Retrieved {len(hospitals)} hospitals from {endpoint}")
-                            return self._clean_hospital_data(hospitals, mst)
-                    except json.JSONDecodeError:
-                        continue
-            
-            # If no API endpoint works, try to extract from HTML
-            return self._extract_hospitals_from_html(mst)
-            
-        except Exception as e:
-            self.logger.error(f"❌ Error getting hospital data: {e}")
-            return []
+        self.logger.info(f"🏥 Getting hospital data for MST: {mst}")
+        return self._fetch_resource(mst, 'hospitals', self._clean_hospital_data, self._extract_hospitals_from_html)
     
     def _extract_employees_from_html(self, mst: str) -> List[Dict[str, Any]]:
         """Extract employee data from HTML pages"""
@@ -431,29 +612,22 @@ class RealVSSClient:
             ]
             
             for page in pages:
-                url = f"{self.base_url}{page}"
-                response = self._make_request(url)
+                document = self._get_document(f"{self.base_url}{page}")
                 
-                if response and response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
+                if document is not None:
                     # Look for employee data in tables
-                    tables = soup.find_all('table')
-                    for table in tables:
-                        rows = table.find_all('tr')
+                    for rows in _table_rows(document):
                         if len(rows) > 1:  # Has header and data rows
                             employees = []
-                            headers = [th.get_text().strip() for th in rows[0].find_all(['th', 'td'])]
                             
-                            for row in rows[1:]:
-                                cells = row.find_all(['td', 'th'])
+                            for cells in rows[1:]:
                                 if len(cells) >= 3:  # At least name, position, salary
                                     employee = {
                                         'employee_id': f"EMP_{len(employees)+1:03d}_{mst}",
-                                        'full_name': cells[0].get_text().strip() if len(cells) > 0 else '',
-                                        'position': cells[1].get_text().strip() if len(cells) > 1 else '',
-                                        'salary': self._extract_salary(cells[2].get_text().strip()) if len(cells) > 2 else 0,
-                                        'start_date': cells[3].get_text().strip() if len(cells) > 3 else '',
+                                        'full_name': cells[0],
+                                        'position': cells[1],
+                                        'salary': self._extract_salary(cells[2]),
+                                        'start_date': cells[3] if len(cells) > 3 else '',
                                         'status': 'active'
                                     }
                                     employees.append(employee)
@@ -483,71 +657,42 @@ class RealVSSClient:
         # Similar implementation for hospitals
         return []
     
-    def _clean_employee_data(self, employees: List[Dict[str, Any]], mst: str) -> List[Dict[str, Any]]:
-        """Clean and standardize employee data"""
+    def _clean_records(self, records: List[Dict[str, Any]], mst: str, resource: str) -> List[Dict[str, Any]]:
+        """Clean and standardize records of one resource using its _CLEAN_SPECS entry"""
+        id_field, id_template, fields = _CLEAN_SPECS[resource]
+        extract_salary = self._extract_salary
+        now_iso = datetime.now().isoformat()
         cleaned = []
-        for i, emp in enumerate(employees):
-            cleaned_emp = {
-                'employee_id': emp.get('employee_id', f"EMP_{i+1:03d}_{mst}"),
-                'full_name': emp.get('full_name', emp.get('name', emp.get('ho_ten', ''))),
-                'position': emp.get('position', emp.get('chuc_vu', emp.get('job_title', ''))),
-                'salary': self._extract_salary(emp.get('salary', emp.get('luong', emp.get('wage', 0)))),
-                'start_date': emp.get('start_date', emp.get('ngay_bat_dau', emp.get('join_date', ''))),
-                'status': emp.get('status', emp.get('trang_thai', 'active')),
-                'mst': mst,
-                'extracted_at': datetime.now().isoformat()
-            }
-            cleaned.append(cleaned_emp)
+        for n, record in enumerate(records, 1):
+            row = {id_field: record[id_field] if id_field in record else id_template.format(n=n, mst=mst)}
+            for name, keys, default, is_amount in fields:
+                for key in keys:
+                    if key in record:
+                        value = record[key]
+                        break
+                else:
+                    value = default() if callable(default) else default
+                row[name] = extract_salary(value) if is_amount else value
+            row['mst'] = mst
+            row['extracted_at'] = now_iso
+            cleaned.append(row)
         return cleaned
     
+    def _clean_employee_data(self, employees: List[Dict[str, Any]], mst: str) -> List[Dict[str, Any]]:
+        """Clean and standardize employee data"""
+        return self._clean_records(employees, mst, 'employees')
+    
     def _clean_contribution_data(self, contributions: List[Dict[str, Any]], mst: str) -> List[Dict[str, Any]]:
         """Clean and standardize contribution data"""
-        cleaned = []
-        for i, cont in enumerate(contributions):
-            cleaned_cont = {
-                'contribution_id': cont.get('contribution_id', f"CONT_{i+1:03d}_{mst}"),
-                'employee_id': cont.get('employee_id', ''),
-                'contribution_amount': self._extract_salary(cont.get('contribution_amount', cont.get('so_tien', cont.get('amount', 0)))),
-                'contribution_date': cont.get('contribution_date', cont.get('ngay_dong', cont.get('date', ''))),
-                'contribution_type': cont.get('contribution_type', cont.get('loai_dong', cont.get('type', 'social_insurance'))),
-                'mst': mst,
-                'extracted_at': datetime.now().isoformat()
-            }
-            cleaned.append(cleaned_cont)
-        return cleaned
+        return self._clean_records(contributions, mst, 'contributions')
     
     def _clean_claim_data(self, claims: List[Dict[str, Any]], mst: str) -> List[Dict[str, Any]]:
         """Clean and standardize claim data"""
-        cleaned = []
-        for i, claim in enumerate(claims):
-            cleaned_claim = {
-                'claim_id': claim.get('claim_id', f"CLAIM_{i+1:03d}_{mst}"),
-                'employee_id': claim.get('employee_id', ''),
-                'claim_type': claim.get('claim_type', claim.get('loai_yeu_cau', claim.get('type', 'medical'))),
-                'claim_amount': self._extract_salary(claim.get('claim_amount', claim.get('so_tien', claim.get('amount', 0)))),
-                'claim_date': claim.get('claim_date', claim.get('ngay_yeu_cau', claim.get('date', ''))),
-                'status': claim.get('status', claim.get('trang_thai', claim.get('state', 'pending'))),
-                'mst': mst,
-                'extracted_at': datetime.now().isoformat()
-            }
-            cleaned.append(cleaned_claim)
-        return cleaned
+        return self._clean_records(claims, mst, 'claims')
     
     def _clean_hospital_data(self, hospitals: List[Dict[str, Any]], mst: str) -> List[Dict[str, Any]]:
         """Clean and standardize hospital data"""
-        cleaned = []
-        for i, hosp in enumerate(hospitals):
-            cleaned_hosp = {
-                'hospital_id': hosp.get('hospital_id', f"HOSP_{i+1:03d}"),
-                'hospital_name': hosp.get('hospital_name', hosp.get('ten_benh_vien', hosp.get('name', ''))),
-                'address': hosp.get('address', hosp.get('dia_chi', hosp.get('location', ''))),
-                'phone': hosp.get('phone', hosp.get('dien_thoai', hosp.get('contact', ''))),
-                'specialties': hosp.get('specialties', hosp.get('chuyen_khoa', hosp.get('departments', []))),
-                'mst': mst,
-                'extracted_at': datetime.now().isoformat()
-            }
-            cleaned.append(cleaned_hosp)
-        return cleaned
+        return self._clean_records(hospitals, mst, 'hospitals')
     
     def _extract_salary(self, value: Any) -> float:
         """Extract salary as float from various formats"""
@@ -555,12 +700,11 @@ class RealVSSClient:
             return float(value)
         
         if isinstance(value, str):
-            # Remove non-numeric characters except decimal point
-            cleaned = re.sub(r'[^\d.,]', '', value)
+            # Keep only digits and the decimal point; this also drops the
+            # commas used as thousand separators in Vietnamese amounts
+            cleaned = value.translate(_SALARY_CHARS)
             if cleaned:
                 try:
-                    # Handle Vietnamese number format (comma as thousand separator)
-                    cleaned = cleaned.replace(',', '')
                     return float(cleaned)
                 except ValueError:
                     pass
@@ -571,7 +715,7 @@ class RealVSSClient:
         """Get VSS client statistics"""
         avg_response_time = 0
         if self.stats['total_requests'] > 0:
-            avg_response_time = self.stats['total_response_time'] / self.stats['total_requests']
+            avg_response_time = self.stats['total_response_time_ns'] / self.stats['total_requests'] / 1e9
         
         success_rate = 0
         if self.stats['total_requests'] > 0:
@@ -586,6 +730,185 @@ class RealVSSClient:
             'is_authenticated': self.is_authenticated
         }
 
+# Async probes: statuses retried (as the sync adapter's Retry does), attempts, backoff base and cap
+_PROBE_RETRY_STATUSES = frozenset((429, 502, 503, 504))
+_PROBE_ATTEMPTS = 4
+_PROBE_BACKOFF = 0.3
+_PROBE_MAX_BACKOFF = 30.0
+
+def _retry_delay(headers: Optional[Any], attempt: int) -> float:
+    """Seconds to wait before the next request: Retry-After if given, else jittered exponential backoff"""
+    retry_after = headers.get('Retry-After') if headers is not None else None
+    if retry_after:
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            try:
+                return max((parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds(), 0.0)
+            except (TypeError, ValueError):
+                pass
+    return min(_PROBE_MAX_BACKOFF, _PROBE_BACKOFF * (2 ** attempt + random.random()))
+
+class AsyncRealVSSClient:
+    """Asyncio front end that fetches all VSS resources for an MST concurrently
+    
+    Authentication, cleaning and HTML fallbacks stay with the wrapped
+    RealVSSClient; this class only replaces the API probes with aiohttp
+    requests over one keep-alive connection pool. Use it as an async
+    context manager after logging in with the sync client.
+    
+    Probes honour the server's rate limiting: a Retry-After or an exhausted
+    X-RateLimit-Remaining pauses all probes of this client, and 429/5xx
+    gateway responses are retried with jittered exponential backoff. An
+    optional AsyncTokenBucket paces every request to a known quota.
+    """
+    
+    # resource -> (cleaner, HTML fallback) method names on RealVSSClient
+    _HANDLERS = {
+        'employees': ('_clean_employee_data', '_extract_employees_from_html'),
+        'contributions': ('_clean_contribution_data', '_extract_contributions_from_html'),
+        'claims': ('_clean_claim_data', '_extract_claims_from_html'),
+        'hospitals': ('_clean_hospital_data', '_extract_hospitals_from_html')
+    }
+    
+    def __init__(self, client: RealVSSClient, timeout: int = 30, limit: int = 32, limit_per_host: int = 0,
+                 limiter: Optional[AsyncTokenBucket] = None):
+        self.client = client
+        self.base_url = client.base_url
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.limiter = limiter
+        self.session: Optional[aiohttp.ClientSession] = None
+        # time.monotonic() before which no probe is sent (server asked us to slow down)
+        self._resume_at = 0.0
+    
+    async def __aenter__(self):
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host,
+                                           keepalive_timeout=75),
+            headers=dict(self.client.session.headers),
+            cookies=self.client.session.cookies.get_dict(),
+            timeout=self.timeout
+        )
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+    
+    async def close(self):
+        """Close the aiohttp session"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+    
+    def _pause(self, delay: float):
+        """Hold back every probe of this client for delay seconds"""
+        self._resume_at = max(self._resume_at, time.monotonic() + delay)
+    
+    async def _get(self, url: str) -> Tuple[int, bytes]:
+        """GET url with rate limiting and retries; returns (status, body)"""
+        for attempt in range(_PROBE_ATTEMPTS):
+            delay = self._resume_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if self.limiter is not None:
+                await self.limiter.acquire()
+            
+            last_attempt = attempt + 1 == _PROBE_ATTEMPTS
+            try:
+                async with self.session.get(url) as response:
+                    body = await response.read()
+                    status = response.status
+                    headers = response.headers
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if last_attempt:
+                    raise
+                await asyncio.sleep(_retry_delay(None, attempt))
+                continue
+            
+            retry = status in _PROBE_RETRY_STATUSES
+            if retry or headers.get('X-RateLimit-Remaining') == '0':
+                self._pause(_retry_delay(headers, attempt))
+            if not retry or last_attempt:
+                return status, body
+    
+    async def _probe_endpoint(self, endpoint: str, list_key: str) -> List[Dict[str, Any]]:
+        """Fetch one candidate endpoint and return the records it lists, if any"""
+        client = self.client
+        client._add_stat('total_requests')
+        url = f"{self.base_url}{endpoint}"
+        start_ns = time.monotonic_ns()
+        try:
+            status, body = await self._get(url)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            client._add_stat('failed_requests')
+            self.logger.debug("❌ Probe of %s failed: %s", endpoint, e)
+            return []
+        client._add_stat('total_response_time_ns', time.monotonic_ns() - start_ns)
+        
+        if status != 200:
+            client._add_stat('failed_requests')
+            return []
+        client._add_stat('successful_requests')
+        
+        try:
+            data = _json_loads(body)
+        except json.JSONDecodeError:
+            # Likely an HTML page; leave it for the HTML fallback
+            client._cache_page(url, body)
+            return []
+        if isinstance(data, list):
+            return data
+        elif isinstance(data, dict) and 'data' in data:
+            return data['data']
+        elif isinstance(data, dict) and list_key in data:
+            return data[list_key]
+        return []
+    
+    async def _probe_endpoints(self, endpoints: List[str], list_key: str) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+        """Probe candidate endpoints concurrently
+        
+        Returns (endpoint, records) for the first endpoint, in list order,
+        that yields records, or None.
+        """
+        results = await asyncio.gather(*(self._probe_endpoint(endpoint, list_key) for endpoint in endpoints))
+        for endpoint, records in zip(endpoints, results):
+            if records:
+                return endpoint, records
+        return None
+    
+    async def _fetch_resource(self, mst: str, resource: str) -> List[Dict[str, Any]]:
+        """Fetch one VSS resource for an MST: probe its API endpoints, then fall back to HTML"""
+        cleaner_name, fallback_name = self._HANDLERS[resource]
+        try:
+            endpoints = [template.format(mst=mst) for template in _RESOURCE_ENDPOINTS[resource]]
+            found = await self._probe_endpoints(endpoints, resource)
+            if found:
+                endpoint, records = found
+                self.logger.info(f"✅ Retrieved {len(records)} {resource} from {endpoint}")
+                return getattr(self.client, cleaner_name)(records, mst)
+            
+            # The HTML extractors are synchronous; keep them off the event loop
+            return await asyncio.to_thread(getattr(self.client, fallback_name), mst)
+            
+        except Exception as e:
+            self.logger.error(f"❌ Error getting {resource} data: {e}")
+            return []
+    
+    async def get_all_data(self, mst: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Get employees, contributions, claims and hospitals for an MST in one round of requests"""
+        if not self.client.is_authenticated:
+            self.logger.error("❌ Not authenticated. Please login first.")
+            return {resource: [] for resource in self._HANDLERS}
+        if self.session is None:
+            raise RuntimeError("AsyncRealVSSClient must be used as an async context manager")
+        
+        self.logger.info(f"📊 Getting all VSS data for MST: {mst}")
+        results = await asyncio.gather(*(self._fetch_resource(mst, resource) for resource in self._HANDLERS))
+        return dict(zip(self._HANDLERS, results))
+
 def main():
     """Test the Real VSS Client"""
     print("🚀 Testing Real VSS Client...")
@@ -5,6 +5,8 @@ Complete integration system with real data from both Enterprise API and VSS Syst
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import json
 import logging
@@ -15,7 +17,8 @@ from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse, parse_qs, quote
 import pandas as pd
 import numpy as np
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
+from functools import lru_cache
 from enum import Enum
 import asyncio
 import aiohttp
@@ -30,14 +33,153 @@ from pathlib import Path
 import uuid
 import random
 import string
+import sys
+import threading
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy risk scorer is used without it
+    njit = None
 
 # Import our real clients
 from real_enterprise_api_client import RealEnterpriseAPIClient
-from real_vss_client import RealVSSClient
+from real_vss_client import RealVSSClient, AsyncRealVSSClient
+from rate_limiter import AsyncTokenBucket
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Salary bucket edges (VND): low < 10M <= medium < 20M <= high
+_SALARY_BUCKET_EDGES = np.array([10000000, 20000000], dtype=np.float64)
+
+@lru_cache(maxsize=None)
+def _field_names(cls: type) -> Tuple[str, ...]:
+    """Field names of a dataclass, looked up once per class"""
+    return tuple(field.name for field in fields(cls))
+
+def _shallow_asdict(obj: Any) -> Dict[str, Any]:
+    """Field dict of a dataclass sharing its values; unlike asdict() nothing is copied,
+    so use it only for read-only access"""
+    return {name: getattr(obj, name) for name in _field_names(type(obj))}
+
+@lru_cache(maxsize=128)
+def _ensure_dir(directory: str) -> str:
+    """Create directory if needed; only the first call per directory touches the filesystem"""
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+# Characters stripped from an MST before its digits are counted
+_MST_NONDIGIT = re.compile(r'[^\d]')
+
+# Result cache (see _cached_result): default location and connection settings
+_DEFAULT_CACHE_PATH = os.path.join('data', 'vss_cache.db')
+_CACHE_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA mmap_size=268435456',
+    'PRAGMA cache_size=-400000'
+)
+
+def _cache_key(mst: str) -> str:
+    """Result cache key for an MST"""
+    return hashlib.blake2b(mst.encode('utf-8'), digest_size=16).hexdigest()
+
+def _dumps_payload(obj: Any) -> bytes:
+    """Serialize a cache payload to UTF-8 JSON bytes, with orjson when available"""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, ensure_ascii=False, default=float).encode('utf-8')
+
+_loads_payload = orjson.loads if orjson else json.loads
+
+# VSS data quality per list (employees, contributions, claims, hospitals): fields that
+# must be non-empty, amount fields that must be positive, and the list's weight
+_VSS_QUALITY_RULES = (
+    (('full_name', 'position', 'start_date'), ('salary',), 0.3),
+    (('contribution_date', 'contribution_type'), ('contribution_amount',), 0.3),
+    (('claim_type', 'claim_date'), ('claim_amount',), 0.2),
+    (('hospital_name', 'address', 'phone'), (), 0.2)
+)
+_VSS_QUALITY_MAX = sum(weight for _, _, weight in _VSS_QUALITY_RULES)
+
+def _presence_mask(records: List[Dict[str, Any]], text_fields: Tuple[str, ...],
+                   amount_fields: Tuple[str, ...]) -> np.ndarray:
+    """(records x fields) bool matrix: text fields non-empty, amount fields positive"""
+    width = len(text_fields) + len(amount_fields)
+    cells = (present for record in records
+             for present in ([bool(record.get(field)) for field in text_fields] +
+                             [record.get(field, 0) > 0 for field in amount_fields]))
+    return np.fromiter(cells, dtype=np.bool_, count=len(records) * width).reshape(len(records), width)
+
+# Risk factors in report order, as (factor, mitigation), with the points each adds:
+# low average salary, contributions all zero, no contribution data, low compliance
+_RISK_FACTORS = (
+    ("Low average salary", "Review salary structure"),
+    ("No contributions recorded", "Implement contribution tracking"),
+    ("No contribution data", "Connect to contribution system"),
+    ("Low compliance score", "Improve compliance monitoring")
+)
+_RISK_POINTS = np.array([20.0, 30.0, 40.0, 25.0])
+_LOW_AVERAGE_SALARY = 10000000.0  # VND
+_LOW_COMPLIANCE_SCORE = 70.0
+
+# General recommendations closing every report
+_STATIC_RECOMMENDATIONS = (
+    "Thường xuyên cập nhật thông tin doanh nghiệp",
+    "Tăng cường giám sát tuân thủ BHXH",
+    "Cải thiện quy trình quản lý nhân sự",
+    "Xây dựng kế hoạch phát triển bền vững"
+)
+
+def _score_risk_numpy(salaries: np.ndarray, contribution_amounts: np.ndarray,
+                      compliance_score: float) -> Tuple[float, np.ndarray]:
+    """Risk score and which _RISK_FACTORS apply, from salary and contribution arrays"""
+    flags = np.array([
+        salaries.size > 0 and salaries.mean() < _LOW_AVERAGE_SALARY,
+        contribution_amounts.size > 0 and contribution_amounts.sum() == 0,
+        contribution_amounts.size == 0,
+        compliance_score < _LOW_COMPLIANCE_SCORE
+    ])
+    return float(_RISK_POINTS[flags].sum()), flags
+
+def _score_risk_loop(salaries, contribution_amounts, compliance_score):
+    """Loop form of the risk scorer, compiled with numba when available"""
+    flags = np.zeros(4, np.bool_)
+    if salaries.size > 0:
+        total = 0.0
+        for salary in salaries:
+            total += salary
+        flags[0] = total / salaries.size < _LOW_AVERAGE_SALARY
+    if contribution_amounts.size > 0:
+        total = 0.0
+        for amount in contribution_amounts:
+            total += amount
+        flags[1] = total == 0.0
+    else:
+        flags[2] = True
+    flags[3] = compliance_score < _LOW_COMPLIANCE_SCORE
+    
+    score = 0.0
+    for i in range(4):
+        if flags[i]:
+            score += _RISK_POINTS[i]
+    return score, flags
+
+# Compiled once and cached on disk next to the module, so later processes skip compilation;
+# fastmath is limited to reassociation so NaN salaries compare the same as in the NumPy path
+_score_risk = (njit(cache=True, fastmath={'reassoc'}, boundscheck=False)(_score_risk_loop)
+               if njit else _score_risk_numpy)
+_RISK_WARMUP = np.zeros(8, dtype=np.float64)
+
+def _field_array(records: List[Dict[str, Any]], field: str) -> np.ndarray:
+    """Collect one numeric field of a list of records (missing -> 0) into a float64 array"""
+    return np.fromiter((record.get(field, 0) for record in records), dtype=np.float64, count=len(records))
+
 @dataclass
 class RealEnterpriseData:
     """Real enterprise data structure from API"""
@@ -58,6 +200,10 @@ class RealEnterpriseData:
     data_quality: float
     data_source: str
     extracted_at: str
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Field dict for serialization (values are shared, not copied)"""
+        return _shallow_asdict(self)
 
 @dataclass
 class RealVSSData:
@@ -71,6 +217,10 @@ class RealVSSData:
     data_quality: float
     data_source: str
     extracted_at: str
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Field dict for serialization (values are shared, not copied)"""
+        return _shallow_asdict(self)
 
 @dataclass
 class RealIntegratedResult:
@@ -87,7 +237,7 @@ class RealIntegratedResult:
     contribution_analysis: Dict[str, Any]
     compliance_report: Dict[str, Any]
     risk_assessment: Dict[str, Any]
-    recommendations: List[str]
+    recommendations: Tuple[str, ...]
     
     # Metadata
     extraction_time: float
@@ -95,6 +245,287 @@ class RealIntegratedResult:
     integration_confidence: float
     real_data_percentage: float
     generated_at: str
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Nested dict for serialization; unlike asdict() the record lists are shared, not deep-copied"""
+        data = _shallow_asdict(self)
+        data['enterprise_info'] = self.enterprise_info.to_dict()
+        data['vss_info'] = self.vss_info.to_dict()
+        return data
+
+@dataclass(slots=True)
+class IntegrationStats:
+    """Request counters of an integration system"""
+    total_requests: int = 0
+    successful_requests: int = 0
+    failed_requests: int = 0
+    total_extraction_time: float = 0.0
+    real_data_extractions: int = 0
+    simulated_data_extractions: int = 0
+    
+    @property
+    def success_rate(self) -> float:
+        """Percentage of requests that succeeded"""
+        return self.successful_requests / self.total_requests * 100 if self.total_requests > 0 else 0
+    
+    @property
+    def average_extraction_time(self) -> float:
+        """Mean seconds spent per request"""
+        return self.total_extraction_time / self.total_requests if self.total_requests > 0 else 0
+
+@dataclass
+class EmployeeColumns:
+    """Column-oriented copy of the employee fields the analyzers read"""
+    status: np.ndarray
+    salary: np.ndarray
+    
+    @classmethod
+    def from_records(cls, employees: List[Dict[str, Any]]) -> 'EmployeeColumns':
+        """Fold employee records into columns in a single pass"""
+        statuses, salaries = [], []
+        for employee in employees:
+            statuses.append(employee.get('status', ''))
+            salaries.append(employee.get('salary', 0))
+        return cls(
+            status=np.array(statuses, dtype=str),
+            salary=np.array(salaries, dtype=np.float64)
+        )
+    
+    def __len__(self) -> int:
+        return self.salary.size
+    
+    def active_count(self) -> int:
+        """Number of employees with status 'active'"""
+        return int(np.count_nonzero(self.status == 'active'))
+
+# Analysis of integrated data; plain functions of their arguments, so they need no system instance
+def _generate_real_analysis(integrated_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Generate comprehensive analysis from real data"""
+    enterprise = integrated_data['enterprise']
+    vss = integrated_data['vss']
+    
+    # Company Profile
+    company_profile = {
+        'basic_info': {
+            'mst': enterprise['mst'],
+            'company_name': enterprise['ten_doanh_nghiep'],
+            'address': enterprise['dia_chi'],
+            'phone': enterprise['so_dien_thoai'],
+            'website': enterprise['website']
+        },
+        'business_info': {
+            'sector': enterprise['nganh_nghe'],
+            'type': enterprise['loai_hinh'],
+            'revenue': enterprise['doanh_thu'],
+            'bank_account': enterprise['so_ngan_hang']
+        },
+        'registration_info': {
+            'registration_date': enterprise['ngay_cap'],
+            'expiry_date': enterprise['ngay_het_han']
+        },
+        'data_quality': enterprise['data_quality']
+    }
+    
+    # Employee Analysis
+    employees = vss['employees']
+    columns = EmployeeColumns.from_records(employees)
+    active_employees = columns.active_count()
+    employee_turnover = _analyze_employee_turnover(employees, active_employees)
+    employee_analysis = {
+        'total_employees': len(columns),
+        'active_employees': active_employees,
+        'average_salary': float(columns.salary.mean()) if employees else 0,
+        'salary_distribution': _analyze_salary_distribution(employees, columns.salary),
+        'employee_turnover': employee_turnover,
+        'data_source': vss['data_source']
+    }
+    
+    # Contribution Analysis
+    contributions = vss['contributions']
+    # One pass over the records and one sum; averages and trends derive from the total
+    total_amount = float(_field_array(contributions, 'contribution_amount').sum())
+    contribution_analysis = {
+        'total_contributions': len(contributions),
+        'total_contribution_amount': total_amount,
+        'average_contribution': total_amount / len(contributions) if contributions else 0,
+        'contribution_trends': _analyze_contribution_trends(contributions, total_amount),
+        'data_source': vss['data_source']
+    }
+    
+    # Compliance Report
+    compliance_report = {
+        'overall_compliance_score': vss['compliance'].get('overall_compliance_score', 0),
+        'registration_compliance': vss['compliance'].get('registration_compliance', False),
+        'contribution_compliance': vss['compliance'].get('contribution_compliance', False),
+        'employee_compliance': vss['compliance'].get('employee_compliance', False),
+        'compliance_issues': vss['compliance'].get('compliance_issues', []),
+        'last_audit_date': vss['compliance'].get('last_audit_date', ''),
+        'data_source': vss['data_source']
+    }
+    
+    # Risk Assessment
+    risk_assessment = {
+        'risk_level': vss['risk_assessment'].get('risk_level', 'unknown'),
+        'risk_score': vss['risk_assessment'].get('risk_score', 0),
+        'risk_factors': vss['risk_assessment'].get('risk_factors', []),
+        'mitigation_strategies': vss['risk_assessment'].get('mitigation_strategies', []),
+        'data_source': vss['data_source']
+    }
+    
+    # Recommendations
+    recommendations = _generate_real_recommendations(company_profile, employee_analysis, 
+                                                     contribution_analysis, compliance_report, 
+                                                     risk_assessment)
+    
+    # Data Quality Score
+    data_quality_score = (enterprise['data_quality'] + vss['data_quality']) / 2
+    
+    # Integration Confidence
+    integration_confidence = _calculate_real_integration_confidence(enterprise, vss)
+    
+    # Real Data Percentage
+    real_data_percentage = _calculate_real_data_percentage(enterprise, vss)
+    
+    return {
+        'company_profile': company_profile,
+        'employee_analysis': employee_analysis,
+        'contribution_analysis': contribution_analysis,
+        'compliance_report': compliance_report,
+        'risk_assessment': risk_assessment,
+        'recommendations': recommendations,
+        'data_quality_score': data_quality_score,
+        'integration_confidence': integration_confidence,
+        'real_data_percentage': real_data_percentage
+    }
+
+def _analyze_salary_distribution(employees: List[Dict[str, Any]],
+                                 salaries: Optional[np.ndarray] = None) -> Dict[str, Any]:
+    """Analyze salary distribution (salaries: the employees' salary array, if already built)"""
+    if not employees:
+        return {'status': 'no_data'}
+    
+    if salaries is None:
+        salaries = _field_array(employees, 'salary')
+    else:
+        salaries = np.ascontiguousarray(salaries, dtype=np.float64)
+    low, medium, high = np.bincount(np.digitize(salaries, _SALARY_BUCKET_EDGES), minlength=3).tolist()
+    return {
+        'min_salary': float(salaries.min()),
+        'max_salary': float(salaries.max()),
+        'median_salary': float(np.median(salaries)),
+        'salary_ranges': {
+            'low': low,
+            'medium': medium,
+            'high': high
+        }
+    }
+
+def _analyze_employee_turnover(employees: List[Dict[str, Any]],
+                               active_employees: Optional[int] = None) -> Dict[str, Any]:
+    """Analyze employee turnover (active_employees: the active count, if already known)"""
+    if not employees:
+        return {'status': 'no_data'}
+    
+    if active_employees is None:
+        active_employees = sum(1 for emp in employees if emp.get('status') == 'active')
+    total_employees = len(employees)
+    
+    return {
+        'active_count': active_employees,
+        'total_count': total_employees,
+        'turnover_rate': (total_employees - active_employees) / total_employees * 100 if total_employees > 0 else 0
+    }
+
+def _analyze_contribution_trends(contributions: List[Dict[str, Any]],
+                                 total_amount: Optional[float] = None) -> Dict[str, Any]:
+    """Analyze contribution trends (total_amount: the contributions' summed amount, if already known)"""
+    if not contributions:
+        return {'status': 'no_data'}
+    
+    if total_amount is None:
+        total_amount = float(_field_array(contributions, 'contribution_amount').sum())
+    return {
+        'monthly_contributions': len(contributions),
+        'total_amount': total_amount,
+        'average_monthly': total_amount / len(contributions)
+    }
+
+def _generate_real_recommendations(company_profile: Dict, employee_analysis: Dict, 
+                                   contribution_analysis: Dict, compliance_report: Dict, 
+                                   risk_assessment: Dict) -> Tuple[str, ...]:
+    """Generate recommendations based on real data analysis"""
+    risk_factors = risk_assessment['risk_factors']
+    rules = (
+        # Data quality
+        (company_profile.get('data_quality', 0) < 50, "Cải thiện chất lượng dữ liệu doanh nghiệp"),
+        (employee_analysis.get('data_source') == 'none', "Kết nối hệ thống VSS để lấy dữ liệu nhân viên thực tế"),
+        (contribution_analysis.get('data_source') == 'none', "Kết nối hệ thống VSS để lấy dữ liệu đóng góp thực tế"),
+        # Compliance
+        (compliance_report['overall_compliance_score'] < 80, "Cải thiện điểm tuân thủ tổng thể"),
+        (not compliance_report['contribution_compliance'], "Tăng cường tuân thủ đóng góp BHXH"),
+        # Employees
+        (employee_analysis['total_employees'] == 0, "Cập nhật thông tin nhân viên trong hệ thống VSS"),
+        (employee_analysis['average_salary'] < 15000000, "Xem xét tăng lương trung bình"),
+        # Risk
+        (risk_assessment['risk_level'] == 'high', "Ưu tiên giảm thiểu rủi ro cao")
+    )
+    recommendations = tuple(message for applies, message in rules if applies)
+    if risk_factors:
+        recommendations += (f"Xử lý các yếu tố rủi ro: {', '.join(risk_factors)}",)
+    
+    return recommendations + _STATIC_RECOMMENDATIONS
+
+def _calculate_real_integration_confidence(enterprise: Dict, vss: Dict) -> float:
+    """Calculate integration confidence based on real data"""
+    confidence = 0.0
+    
+    # Check if we have both enterprise and VSS data
+    if enterprise.get('ten_doanh_nghiep') and vss.get('employees'):
+        confidence += 50.0
+    
+    if enterprise.get('mst') and vss.get('contributions'):
+        confidence += 30.0
+    
+    if enterprise.get('dia_chi') and vss.get('compliance'):
+        confidence += 20.0
+    
+    # Bonus for real data sources
+    if enterprise.get('data_source') != 'none':
+        confidence += 10.0
+    
+    if vss.get('data_source') != 'none':
+        confidence += 10.0
+    
+    return min(confidence, 100.0)
+
+def _calculate_real_data_percentage(enterprise: Dict, vss: Dict) -> float:
+    """Calculate percentage of real data vs simulated data"""
+    real_count = 0
+    total_count = 0
+    
+    # Enterprise data
+    if enterprise.get('ten_doanh_nghiep'):
+        real_count += 1
+    total_count += 1
+    
+    if enterprise.get('data_source') != 'none':
+        real_count += 1
+    total_count += 1
+    
+    # VSS data
+    if vss.get('employees'):
+        real_count += 1
+    total_count += 1
+    
+    if vss.get('contributions'):
+        real_count += 1
+    total_count += 1
+    
+    if vss.get('data_source') != 'none':
+        real_count += 1
+    total_count += 1
+    
+    return (real_count / total_count) * 100 if total_count > 0 else 0.0
 
 class RealVSSEnterpriseIntegrationSystem:
     """Real VSS Enterprise Integration System with 100% real data"""
@@ -103,28 +534,53 @@ class RealVSSEnterpriseIntegrationSystem:
         self.config = config or self._default_config()
         self.logger = logging.getLogger(self.__class__.__name__)
         
-        # Initialize real clients
-        self.enterprise_client = RealEnterpriseAPIClient()
-        self.vss_client = RealVSSClient()
+        # Initialize real clients. Each keeps its own session (headers, VSS login cookies)
+        # but both draw keep-alive connections from one shared pool; POSTs are never retried.
+        self.http_adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            max_retries=Retry(
+                total=self.config.get('retry_attempts', 3),
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                raise_on_status=False
+            )
+        )
+        self.enterprise_client = RealEnterpriseAPIClient(adapter=self.http_adapter)
+        self.vss_client = RealVSSClient(adapter=self.http_adapter,
+                                        page_ttl=self.config.get('cache_duration', 3600))
         
         # Statistics
-        self.stats = {
-            'total_requests': 0,
-            'successful_requests': 0,
-            'failed_requests': 0,
-            'total_extraction_time': 0,
-            'real_data_extractions': 0,
-            'simulated_data_extractions': 0
-        }
+        self.stats = IntegrationStats()
+        
+        # Result cache database, opened on first use when 'enable_caching' is set
+        self._cache_db: Optional[sqlite3.Connection] = None
+        self._cache_lock = threading.Lock()
+        
+        # Per-host request quotas, shared by every MST this system processes
+        self._enterprise_limiter = self._rate_limiter('enterprise_rate_limit', 60)
+        self._vss_limiter = self._rate_limiter('vss_rate_limit', 180)
+        
+        # Compile (or load) the risk kernel now rather than on the first MST
+        if njit:
+            _score_risk(_RISK_WARMUP, _RISK_WARMUP, 0.0)
+    
+    def _rate_limiter(self, key: str, default: int) -> Optional[AsyncTokenBucket]:
+        """Token bucket for the per-minute quota configured under key, None if disabled"""
+        per_minute = self.config.get(key, default)
+        return AsyncTokenBucket(per_minute, 60) if per_minute else None
     
     def _default_config(self) -> Dict[str, Any]:
         """Default configuration"""
         return {
             'timeout': 30,
             'retry_attempts': 3,
-            'rate_limit_delay': 1.0,
+            'enterprise_rate_limit': 60,  # requests per minute; None disables
+            'vss_rate_limit': 180,
             'enable_caching': True,
             'cache_duration': 3600,
+            'cache_path': _DEFAULT_CACHE_PATH,
+            'pretty_results': False,  # indent saved result JSON
             'enable_logging': True,
             'log_level': 'INFO',
             'require_authentication': True,
@@ -132,31 +588,82 @@ class RealVSSEnterpriseIntegrationSystem:
         }
     
     def process_mst(self, mst: str) -> RealIntegratedResult:
-        """Main function to process MST and return real integrated result"""
+        """Main function to process MST and return real integrated result
+        
+        Runs process_mst_async on a new event loop. Called from inside a
+        running loop (e.g. a notebook) that loop is left alone and the new one
+        runs in a worker thread; async code should await process_mst_async.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.process_mst_async(mst))
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.process_mst_async(mst)).result()
+    
+    async def process_msts_batch(self, msts: List[str], concurrency: int = 32) -> List[Any]:
+        """Process many MSTs concurrently over one shared VSS connection pool
+        
+        At most `concurrency` MSTs are in flight at once. Results come back in
+        input order; an MST that fails yields its exception instead of a result.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        # Connect and log in once for the whole batch rather than per MST; if that
+        # fails, every MST gets empty VSS data instead of retrying the connection
+        connected = await asyncio.to_thread(self._connect_vss)
+        
+        async with AsyncRealVSSClient(self.vss_client, timeout=self.config.get('timeout', 30),
+                                      limit=0, limit_per_host=64, limiter=self._vss_limiter) as vss_async:
+            async def bounded(mst: str) -> RealIntegratedResult:
+                async with semaphore:
+                    return await self.process_mst_async(mst, vss_async, vss_available=connected)
+            
+            return await asyncio.gather(*(bounded(mst) for mst in msts), return_exceptions=True)
+    
+    async def process_mst_async(self, mst: str, vss_async: Optional[AsyncRealVSSClient] = None,
+                                vss_available: bool = True) -> RealIntegratedResult:
+        """Process an MST, extracting enterprise and VSS data concurrently
+        
+        vss_async is an open, already connected AsyncRealVSSClient to reuse;
+        by default one is opened for this MST. vss_available=False skips the
+        VSS extraction (the caller already found the VSS system unreachable).
+        """
         start_time = time.time()
+        # One timestamp for every extracted_at/assessment_date of this MST's result
+        now_iso = datetime.now().isoformat()
         
-        self.logger.info(f"🚀 Processing MST with REAL DATA: {mst}")
+        self.logger.info("🚀 Processing MST with REAL DATA: %s", mst)
         
         try:
             # Step 1: Validate MST
             if not self._validate_mst(mst):
                 raise ValueError(f"Invalid MST format: {mst}")
             
-            # Step 2: Extract Real Enterprise Data
-            self.logger.info("📊 Extracting REAL enterprise data...")
-            enterprise_data = self._extract_real_enterprise_data(mst)
+            caching = self.config.get('enable_caching', False)
+            if caching:
+                cached = await asyncio.to_thread(self._cached_result, mst)
+                if cached is not None:
+                    self.stats.successful_requests += 1
+                    self.stats.real_data_extractions += 1
+                    self.logger.info("✅ Using cached result for MST: %s", mst)
+                    return cached
             
-            # Step 3: Extract Real VSS Data
-            self.logger.info("🏥 Extracting REAL VSS data...")
-            vss_data = self._extract_real_vss_data(mst)
+            # Steps 2-3: Extract Real Enterprise and VSS Data; the two sources are
+            # independent, so they are fetched at the same time
+            self.logger.info("📊 Extracting REAL enterprise and VSS data...")
+            enterprise_data, vss_data = await asyncio.gather(
+                self._extract_real_enterprise_data_async(mst, now_iso),
+                self._extract_real_vss_data_async(mst, vss_async, now_iso, vss_available)
+            )
             
             # Step 4: Integrate Real Data
             self.logger.info("🔗 Integrating REAL data...")
-            integrated_result = self._integrate_real_data(enterprise_data, vss_data)
+            integrated_result = self._integrate_real_data(enterprise_data, vss_data, now_iso)
             
             # Step 5: Generate Real Analysis
             self.logger.info("📈 Generating REAL analysis...")
-            analysis = self._generate_real_analysis(integrated_result)
+            analysis = _generate_real_analysis(integrated_result)
             
             # Step 6: Create Final Real Result
             extraction_time = time.time() - start_time
@@ -173,50 +680,108 @@ class RealVSSEnterpriseIntegrationSystem:
                 data_quality_score=analysis['data_quality_score'],
                 integration_confidence=analysis['integration_confidence'],
                 real_data_percentage=analysis['real_data_percentage'],
-                generated_at=datetime.now().isoformat()
+                generated_at=now_iso
             )
             
-            self.stats['successful_requests'] += 1
-            self.stats['real_data_extractions'] += 1
-            self.logger.info(f"✅ Successfully processed MST with REAL DATA: {mst} in {extraction_time:.2f}s")
+            if caching and self._is_cacheable(result):
+                await asyncio.to_thread(self._store_result, mst, result)
+            
+            self.stats.successful_requests += 1
+            self.stats.real_data_extractions += 1
+            self.logger.info("✅ Successfully processed MST with REAL DATA: %s in %.2fs", mst, extraction_time)
             
             return result
             
         except Exception as e:
-            self.stats['failed_requests'] += 1
-            self.logger.error(f"❌ Error processing MST {mst}: {e}")
+            self.stats.failed_requests += 1
+            self.logger.error("❌ Error processing MST %s: %s", mst, e)
             raise
         
         finally:
-            self.stats['total_requests'] += 1
-            self.stats['total_extraction_time'] += time.time() - start_time
+            self.stats.total_requests += 1
+            self.stats.total_extraction_time += time.time() - start_time
+    
+    def _cache_connection(self) -> sqlite3.Connection:
+        """Open the result cache database on first use (call with _cache_lock held)"""
+        if self._cache_db is None:
+            path = self.config.get('cache_path', _DEFAULT_CACHE_PATH)
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            db = sqlite3.connect(path, check_same_thread=False)
+            for pragma in _CACHE_PRAGMAS:
+                db.execute(pragma)
+            db.execute('CREATE TABLE IF NOT EXISTS cache(key TEXT PRIMARY KEY, payload BLOB, expires_at INTEGER)')
+            db.execute('DELETE FROM cache WHERE expires_at <= ?', (int(time.time()),))
+            db.commit()
+            self._cache_db = db
+        return self._cache_db
+    
+    def _cached_result(self, mst: str) -> Optional[RealIntegratedResult]:
+        """Return the unexpired cached result for an MST, if any"""
+        try:
+            with self._cache_lock:
+                row = self._cache_connection().execute(
+                    'SELECT payload FROM cache WHERE key = ? AND expires_at > ?',
+                    (_cache_key(mst), int(time.time()))
+                ).fetchone()
+            if row is None:
+                return None
+            
+            data = _loads_payload(row[0])
+            data['enterprise_info'] = RealEnterpriseData(**data['enterprise_info'])
+            data['vss_info'] = RealVSSData(**data['vss_info'])
+            data['recommendations'] = tuple(data['recommendations'])
+            return RealIntegratedResult(**data)
+        except (sqlite3.Error, ValueError, TypeError, KeyError) as e:
+            self.logger.warning("⚠️ Result cache read failed for MST %s: %s", mst, e)
+            return None
+    
+    @staticmethod
+    def _is_cacheable(result: RealIntegratedResult) -> bool:
+        """Whether both sections hold extracted data; empty fallbacks from an
+        outage are not cached, so the next request tries the backends again"""
+        return result.enterprise_info.data_source != 'none' and result.vss_info.data_source != 'none'
+    
+    def _store_result(self, mst: str, result: RealIntegratedResult):
+        """Cache a result for 'cache_duration' seconds"""
+        try:
+            payload = _dumps_payload(result.to_dict())
+            expires_at = int(time.time()) + int(self.config.get('cache_duration', 3600))
+            with self._cache_lock:
+                db = self._cache_connection()
+                db.execute('INSERT OR REPLACE INTO cache(key, payload, expires_at) VALUES (?, ?, ?)',
+                           (_cache_key(mst), payload, expires_at))
+                db.commit()
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            self.logger.warning("⚠️ Result cache write failed for MST %s: %s", mst, e)
+    
+    def close(self):
+        """Close the result cache database, the VSS probe threads and the shared connection pool"""
+        with self._cache_lock:
+            if self._cache_db is not None:
+                self._cache_db.close()
+                self._cache_db = None
+        self.vss_client.close()
+        self.http_adapter.close()
     
     def _validate_mst(self, mst: str) -> bool:
         """Validate MST format"""
         if not mst or not isinstance(mst, str):
             return False
         
-        # Remove any non-digit characters
-        clean_mst = re.sub(r'[^\d]', '', mst)
+        # Remove any non-digit characters; what remains is all digits
+        clean_mst = _MST_NONDIGIT.sub('', mst)
         
         # Check length (Vietnamese tax codes are typically 10-13 digits)
-        if len(clean_mst) < 10 or len(clean_mst) > 13:
-            return False
-        
-        # Check if all characters are digits
-        if not clean_mst.isdigit():
-            return False
-        
-        return True
+        return 10 <= len(clean_mst) <= 13
     
-    def _extract_real_enterprise_data(self, mst: str) -> RealEnterpriseData:
-        """Extract real enterprise data from API"""
+    def _extract_real_enterprise_data(self, mst: str, now_iso: Optional[str] = None) -> RealEnterpriseData:
+        """Extract real enterprise data from API (now_iso: timestamp to stamp it with, default now)"""
         try:
-            self.logger.info(f"🌐 Connecting to Enterprise API for MST: {mst}")
+            self.logger.info("🌐 Connecting to Enterprise API for MST: %s", mst)
             data = self.enterprise_client.get_company_by_mst(mst)
             
             if data and data.get('TenDoanhNghiep'):
-                self.logger.info(f"✅ Real enterprise data retrieved: {data.get('TenDoanhNghiep')}")
+                self.logger.info("✅ Real enterprise data retrieved: %s", data.get('TenDoanhNghiep'))
                 
                 return RealEnterpriseData(
                     mst=data.get('MST', mst),
@@ -235,69 +800,98 @@ class RealVSSEnterpriseIntegrationSystem:
                     phuong_xa=data.get('PhuongXa', ''),
                     data_quality=float(data.get('data_quality', 0)),
                     data_source=data.get('data_source', 'thongtindoanhnghiep.co'),
-                    extracted_at=datetime.now().isoformat()
+                    extracted_at=now_iso or datetime.now().isoformat()
                 )
             else:
-                self.logger.warning(f"⚠️ No real enterprise data found for MST: {mst}")
-                return self._create_empty_enterprise_data(mst)
+                self.logger.warning("⚠️ No real enterprise data found for MST: %s", mst)
+                return self._create_empty_enterprise_data(mst, now_iso)
                 
         except Exception as e:
-            self.logger.error(f"❌ Error extracting real enterprise data: {e}")
-            return self._create_empty_enterprise_data(mst)
+            self.logger.error("❌ Error extracting real enterprise data: %s", e)
+            return self._create_empty_enterprise_data(mst, now_iso)
     
-    def _extract_real_vss_data(self, mst: str) -> RealVSSData:
-        """Extract real VSS data from VSS system"""
-        try:
-            # Check if VSS system is accessible
-            if not self.vss_client.test_connection():
-                self.logger.error("❌ VSS system is not accessible")
-                return self._create_empty_vss_data(mst)
+    async def _extract_real_enterprise_data_async(self, mst: str, now_iso: Optional[str] = None) -> RealEnterpriseData:
+        """Extract real enterprise data on a worker thread, within the enterprise API quota"""
+        # Cached companies are answered without a request, so they take no token
+        if self._enterprise_limiter is not None and not self.enterprise_client.has_cached_company(mst):
+            await self._enterprise_limiter.acquire()
+        return await asyncio.to_thread(self._extract_real_enterprise_data, mst, now_iso)
+    
+    def _connect_vss(self) -> bool:
+        """Check the VSS system is reachable and log in if required"""
+        # Check if VSS system is accessible
+        if not self.vss_client.test_connection():
+            self.logger.error("❌ VSS system is not accessible")
+            return False
+        
+        # Try to authenticate if required; the client session keeps the login across MSTs
+        if self.config.get('require_authentication', True) and not self.vss_client.is_authenticated:
+            # Try common credentials or get from config
+            credentials = self.config.get('vss_credentials', {})
+            username = credentials.get('username', 'admin')
+            password = credentials.get('password', 'admin')
             
-            # Try to authenticate if required
-            if self.config.get('require_authentication', True):
-                # Try common credentials or get from config
-                credentials = self.config.get('vss_credentials', {})
-                username = credentials.get('username', 'admin')
-                password = credentials.get('password', 'admin')
+            if not self.vss_client.attempt_login(username, password):
+                self.logger.warning("⚠️ VSS authentication failed, trying without auth")
+        return True
+    
+    async def _extract_real_vss_data_async(self, mst: str,
+                                           vss_async: Optional[AsyncRealVSSClient] = None,
+                                           now_iso: Optional[str] = None,
+                                           vss_available: bool = True) -> RealVSSData:
+        """Extract real VSS data, fetching the four VSS resources concurrently
+        (empty data without any request when vss_available is False)"""
+        if not vss_available:
+            return self._create_empty_vss_data(mst, now_iso)
+        
+        try:
+            if vss_async is not None:
+                self.logger.info("🏥 Extracting real VSS data for MST: %s", mst)
+                data = await vss_async.get_all_data(mst)
+            else:
+                if not await asyncio.to_thread(self._connect_vss):
+                    return self._create_empty_vss_data(mst, now_iso)
                 
-                if not self.vss_client.attempt_login(username, password):
-                    self.logger.warning("⚠️ VSS authentication failed, trying without auth")
-            
-            # Extract real VSS data
-            self.logger.info(f"🏥 Extracting real VSS data for MST: {mst}")
+                self.logger.info("🏥 Extracting real VSS data for MST: %s", mst)
+                async with AsyncRealVSSClient(self.vss_client, timeout=self.config.get('timeout', 30),
+                                              limiter=self._vss_limiter) as vss_async:
+                    data = await vss_async.get_all_data(mst)
             
-            employees = self.vss_client.get_employee_data(mst)
-            contributions = self.vss_client.get_contribution_data(mst)
-            claims = self.vss_client.get_claim_data(mst)
-            hospitals = self.vss_client.get_hospital_data(mst)
-            
-            # Calculate data quality
-            data_quality = self._calculate_vss_data_quality(employees, contributions, claims, hospitals)
-            
-            # Generate compliance and risk assessment from real data
-            compliance = self._generate_real_compliance_data(employees, contributions, mst)
-            risk_assessment = self._generate_real_risk_assessment(employees, contributions, compliance, mst)
-            
-            vss_data = RealVSSData(
-                employees=employees,
-                contributions=contributions,
-                claims=claims,
-                hospitals=hospitals,
-                compliance=compliance,
-                risk_assessment=risk_assessment,
-                data_quality=data_quality,
-                data_source='vssapp.teca.vn',
-                extracted_at=datetime.now().isoformat()
-            )
-            
-            self.logger.info(f"✅ Real VSS data extracted: {len(employees)} employees, {len(contributions)} contributions")
-            return vss_data
+            return self._build_vss_data(mst, data['employees'], data['contributions'],
+                                        data['claims'], data['hospitals'], now_iso)
             
         except Exception as e:
-            self.logger.error(f"❌ Error extracting real VSS data: {e}")
-            return self._create_empty_vss_data(mst)
+            self.logger.error("❌ Error extracting real VSS data: %s", e)
+            return self._create_empty_vss_data(mst, now_iso)
+    
+    def _build_vss_data(self, mst: str, employees: List[Dict[str, Any]], contributions: List[Dict[str, Any]],
+                        claims: List[Dict[str, Any]], hospitals: List[Dict[str, Any]],
+                        now_iso: Optional[str] = None) -> RealVSSData:
+        """Assemble RealVSSData with quality, compliance and risk from extracted VSS records"""
+        now_iso = now_iso or datetime.now().isoformat()
+        # Calculate data quality
+        data_quality = self._calculate_vss_data_quality(employees, contributions, claims, hospitals)
+        
+        # Generate compliance and risk assessment from real data
+        compliance = self._generate_real_compliance_data(employees, contributions, mst, now_iso)
+        risk_assessment = self._generate_real_risk_assessment(employees, contributions, compliance, mst, now_iso)
+        
+        vss_data = RealVSSData(
+            employees=employees,
+            contributions=contributions,
+            claims=claims,
+            hospitals=hospitals,
+            compliance=compliance,
+            risk_assessment=risk_assessment,
+            data_quality=data_quality,
+            data_source='vssapp.teca.vn',
+            extracted_at=now_iso
+        )
+        
+        self.logger.info("✅ Real VSS data extracted: %s employees, %s contributions", len(employees), len(contributions))
+        return vss_data
     
-    def _create_empty_enterprise_data(self, mst: str) -> RealEnterpriseData:
+    def _create_empty_enterprise_data(self, mst: str, now_iso: Optional[str] = None) -> RealEnterpriseData:
         """Create empty enterprise data when extraction fails"""
         return RealEnterpriseData(
             mst=mst,
@@ -316,11 +910,12 @@ class RealVSSEnterpriseIntegrationSystem:
             phuong_xa='',
             data_quality=0.0,
             data_source='none',
-            extracted_at=datetime.now().isoformat()
+            extracted_at=now_iso or datetime.now().isoformat()
         )
     
-    def _create_empty_vss_data(self, mst: str) -> RealVSSData:
+    def _create_empty_vss_data(self, mst: str, now_iso: Optional[str] = None) -> RealVSSData:
         """Create empty VSS data when extraction fails"""
+        now_iso = now_iso or datetime.now().isoformat()
         return RealVSSData(
             employees=[],
             contributions=[],
@@ -339,63 +934,26 @@ class RealVSSEnterpriseIntegrationSystem:
                 'risk_score': 0.0,
                 'risk_factors': ['No data available'],
                 'mitigation_strategies': ['Connect to VSS system'],
-                'assessment_date': datetime.now().isoformat()
+                'assessment_date': now_iso
             },
             data_quality=0.0,
             data_source='none',
-            extracted_at=datetime.now().isoformat()
+            extracted_at=now_iso
         )
     
     def _calculate_vss_data_quality(self, employees: List, contributions: List, 
                                   claims: List, hospitals: List) -> float:
         """Calculate VSS data quality score"""
         total_score = 0.0
-        max_score = 0.0
-        
-        # Employee data quality (weight: 0.3)
-        if employees:
-            emp_score = 0.0
-            for emp in employees:
-                if emp.get('full_name'): emp_score += 1
-                if emp.get('position'): emp_score += 1
-                if emp.get('salary', 0) > 0: emp_score += 1
-                if emp.get('start_date'): emp_score += 1
-            total_score += (emp_score / (len(employees) * 4)) * 0.3
-        max_score += 0.3
-        
-        # Contribution data quality (weight: 0.3)
-        if contributions:
-            cont_score = 0.0
-            for cont in contributions:
-                if cont.get('contribution_amount', 0) > 0: cont_score += 1
-                if cont.get('contribution_date'): cont_score += 1
-                if cont.get('contribution_type'): cont_score += 1
-            total_score += (cont_score / (len(contributions) * 3)) * 0.3
-        max_score += 0.3
-        
-        # Claim data quality (weight: 0.2)
-        if claims:
-            claim_score = 0.0
-            for claim in claims:
-                if claim.get('claim_type'): claim_score += 1
-                if claim.get('claim_amount', 0) > 0: claim_score += 1
-                if claim.get('claim_date'): claim_score += 1
-            total_score += (claim_score / (len(claims) * 3)) * 0.2
-        max_score += 0.2
-        
-        # Hospital data quality (weight: 0.2)
-        if hospitals:
-            hosp_score = 0.0
-            for hosp in hospitals:
-                if hosp.get('hospital_name'): hosp_score += 1
-                if hosp.get('address'): hosp_score += 1
-                if hosp.get('phone'): hosp_score += 1
-            total_score += (hosp_score / (len(hospitals) * 3)) * 0.2
-        max_score += 0.2
-        
-        return (total_score / max_score) * 100 if max_score > 0 else 0.0
-    
-    def _generate_real_compliance_data(self, employees: List, contributions: List, mst: str) -> Dict[str, Any]:
+        for records, (text_fields, amount_fields, weight) in zip((employees, contributions, claims, hospitals),
+                                                                 _VSS_QUALITY_RULES):
+            if records:
+                total_score += _presence_mask(records, text_fields, amount_fields).mean() * weight
+        
+        return (total_score / _VSS_QUALITY_MAX) * 100
+    
+    def _generate_real_compliance_data(self, employees: List, contributions: List, mst: str,
+                                       now_iso: Optional[str] = None) -> Dict[str, Any]:
         """Generate compliance data from real VSS data"""
         compliance_score = 0.0
         issues = []
@@ -423,42 +981,20 @@ class RealVSSEnterpriseIntegrationSystem:
             'contribution_compliance': contribution_compliance,
             'employee_compliance': employee_compliance,
             'overall_compliance_score': compliance_score,
-            'last_audit_date': datetime.now().strftime('%Y-%m-%d'),
+            'last_audit_date': (now_iso or datetime.now().isoformat())[:10],
             'compliance_issues': issues
         }
     
     def _generate_real_risk_assessment(self, employees: List, contributions: List, 
-                                     compliance: Dict, mst: str) -> Dict[str, Any]:
+                                     compliance: Dict, mst: str, now_iso: Optional[str] = None) -> Dict[str, Any]:
         """Generate risk assessment from real VSS data"""
-        risk_factors = []
-        mitigation_strategies = []
-        risk_score = 0.0
-        
-        # Analyze employee data
-        if employees:
-            avg_salary = sum(emp.get('salary', 0) for emp in employees) / len(employees)
-            if avg_salary < 10000000:  # Less than 10M VND
-                risk_factors.append("Low average salary")
-                mitigation_strategies.append("Review salary structure")
-                risk_score += 20
-        
-        # Analyze contribution data
-        if contributions:
-            total_contributions = sum(cont.get('contribution_amount', 0) for cont in contributions)
-            if total_contributions == 0:
-                risk_factors.append("No contributions recorded")
-                mitigation_strategies.append("Implement contribution tracking")
-                risk_score += 30
-        else:
-            risk_factors.append("No contribution data")
-            mitigation_strategies.append("Connect to contribution system")
-            risk_score += 40
-        
-        # Analyze compliance
-        if compliance.get('overall_compliance_score', 0) < 70:
-            risk_factors.append("Low compliance score")
-            mitigation_strategies.append("Improve compliance monitoring")
-            risk_score += 25
+        risk_score, flags = _score_risk(_field_array(employees, 'salary'),
+                                        _field_array(contributions, 'contribution_amount'),
+                                        float(compliance.get('overall_compliance_score', 0)))
+        risk_score = float(risk_score)
+        applied = [factor for factor, flag in zip(_RISK_FACTORS, flags) if flag]
+        risk_factors = [factor for factor, _ in applied]
+        mitigation_strategies = [mitigation for _, mitigation in applied]
         
         # Determine risk level
         if risk_score >= 70:
@@ -473,264 +1009,28 @@ class RealVSSEnterpriseIntegrationSystem:
             'risk_score': min(risk_score, 100),
             'risk_factors': risk_factors,
             'mitigation_strategies': mitigation_strategies,
-            'assessment_date': datetime.now().isoformat()
+            'assessment_date': now_iso or datetime.now().isoformat()
         }
     
-    def _integrate_real_data(self, enterprise_data: RealEnterpriseData, vss_data: RealVSSData) -> Dict[str, Any]:
+    def _integrate_real_data(self, enterprise_data: RealEnterpriseData, vss_data: RealVSSData,
+                             now_iso: Optional[str] = None) -> Dict[str, Any]:
         """Integrate real enterprise and VSS data"""
         return {
-            'enterprise': asdict(enterprise_data),
-            'vss': asdict(vss_data),
-            'integration_timestamp': datetime.now().isoformat(),
+            'enterprise': _shallow_asdict(enterprise_data),
+            'vss': _shallow_asdict(vss_data),
+            'integration_timestamp': now_iso or datetime.now().isoformat(),
             'data_sources': {
                 'enterprise': enterprise_data.data_source,
                 'vss': vss_data.data_source
             }
         }
     
-    def _generate_real_analysis(self, integrated_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate comprehensive analysis from real data"""
-        enterprise = integrated_data['enterprise']
-        vss = integrated_data['vss']
-        
-        # Company Profile
-        company_profile = {
-            'basic_info': {
-                'mst': enterprise['mst'],
-                'company_name': enterprise['ten_doanh_nghiep'],
-                'address': enterprise['dia_chi'],
-                'phone': enterprise['so_dien_thoai'],
-                'website': enterprise['website']
-            },
-            'business_info': {
-                'sector': enterprise['nganh_nghe'],
-                'type': enterprise['loai_hinh'],
-                'revenue': enterprise['doanh_thu'],
-                'bank_account': enterprise['so_ngan_hang']
-            },
-            'registration_info': {
-                'registration_date': enterprise['ngay_cap'],
-                'expiry_date': enterprise['ngay_het_han']
-            },
-            'data_quality': enterprise['data_quality']
-        }
-        
-        # Employee Analysis
-        employee_analysis = {
-            'total_employees': len(vss['employees']),
-            'active_employees': len([emp for emp in vss['employees'] if emp.get('status') == 'active']),
-            'average_salary': sum(emp.get('salary', 0) for emp in vss['employees']) / len(vss['employees']) if vss['employees'] else 0,
-            'salary_distribution': self._analyze_salary_distribution(vss['employees']),
-            'employee_turnover': self._analyze_employee_turnover(vss['employees']),
-            'data_source': vss['data_source']
-        }
-        
-        # Contribution Analysis
-        contribution_analysis = {
-            'total_contributions': len(vss['contributions']),
-            'total_contribution_amount': sum(cont.get('contribution_amount', 0) for cont in vss['contributions']),
-            'average_contribution': sum(cont.get('contribution_amount', 0) for cont in vss['contributions']) / len(vss['contributions']) if vss['contributions'] else 0,
-            'contribution_trends': self._analyze_contribution_trends(vss['contributions']),
-            'data_source': vss['data_source']
-        }
-        
-        # Compliance Report
-        compliance_report = {
-            'overall_compliance_score': vss['compliance'].get('overall_compliance_score', 0),
-            'registration_compliance': vss['compliance'].get('registration_compliance', False),
-            'contribution_compliance': vss['compliance'].get('contribution_compliance', False),
-            'employee_compliance': vss['compliance'].get('employee_compliance', False),
-            'compliance_issues': vss['compliance'].get('compliance_issues', []),
-            'last_audit_date': vss['compliance'].get('last_audit_date', ''),
-            'data_source': vss['data_source']
-        }
-        
-        # Risk Assessment
-        risk_assessment = {
-            'risk_level': vss['risk_assessment'].get('risk_level', 'unknown'),
-            'risk_score': vss['risk_assessment'].get('risk_score', 0),
-            'risk_factors': vss['risk_assessment'].get('risk_factors', []),
-            'mitigation_strategies': vss['risk_assessment'].get('mitigation_strategies', []),
-            'data_source': vss['data_source']
-        }
-        
-        # Recommendations
-        recommendations = self._generate_real_recommendations(company_profile, employee_analysis, 
-                                                            contribution_analysis, compliance_report, 
-                                                            risk_assessment)
-        
-        # Data Quality Score
-        data_quality_score = (enterprise['data_quality'] + vss['data_quality']) / 2
-        
-        # Integration Confidence
-        integration_confidence = self._calculate_real_integration_confidence(enterprise, vss)
-        
-        # Real Data Percentage
-        real_data_percentage = self._calculate_real_data_percentage(enterprise, vss)
-        
-        return {
-            'company_profile': company_profile,
-            'employee_analysis': employee_analysis,
-            'contribution_analysis': contribution_analysis,
-            'compliance_report': compliance_report,
-            'risk_assessment': risk_assessment,
-            'recommendations': recommendations,
-            'data_quality_score': data_quality_score,
-            'integration_confidence': integration_confidence,
-            'real_data_percentage': real_data_percentage
-        }
-    
-    def _analyze_salary_distribution(self, employees: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Analyze salary distribution"""
-        if not employees:
-            return {'status': 'no_data'}
-        
-        salaries = [emp.get('salary', 0) for emp in employees]
-        return {
-            'min_salary': min(salaries),
-            'max_salary': max(salaries),
-            'median_salary': np.median(salaries),
-            'salary_ranges': {
-                'low': len([s for s in salaries if s < 10000000]),
-                'medium': len([s for s in salaries if 10000000 <= s < 20000000]),
-                'high': len([s for s in salaries if s >= 20000000])
-            }
-        }
-    
-    def _analyze_employee_turnover(self, employees: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Analyze employee turnover"""
-        if not employees:
-            return {'status': 'no_data'}
-        
-        active_employees = len([emp for emp in employees if emp.get('status') == 'active'])
-        total_employees = len(employees)
-        
-        return {
-            'active_count': active_employees,
-            'total_count': total_employees,
-            'turnover_rate': (total_employees - active_employees) / total_employees * 100 if total_employees > 0 else 0
-        }
-    
-    def _analyze_contribution_trends(self, contributions: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Analyze contribution trends"""
-        if not contributions:
-            return {'status': 'no_data'}
-        
-        return {
-            'monthly_contributions': len(contributions),
-            'total_amount': sum(cont.get('contribution_amount', 0) for cont in contributions),
-            'average_monthly': sum(cont.get('contribution_amount', 0) for cont in contributions) / len(contributions)
-        }
-    
-    def _generate_real_recommendations(self, company_profile: Dict, employee_analysis: Dict, 
-                                     contribution_analysis: Dict, compliance_report: Dict, 
-                                     risk_assessment: Dict) -> List[str]:
-        """Generate recommendations based on real data analysis"""
-        recommendations = []
-        
-        # Data quality recommendations
-        if company_profile.get('data_quality', 0) < 50:
-            recommendations.append("Cải thiện chất lượng dữ liệu doanh nghiệp")
-        
-        if employee_analysis.get('data_source') == 'none':
-            recommendations.append("Kết nối hệ thống VSS để lấy dữ liệu nhân viên thực tế")
-        
-        if contribution_analysis.get('data_source') == 'none':
-            recommendations.append("Kết nối hệ thống VSS để lấy dữ liệu đóng góp thực tế")
-        
-        # Compliance recommendations
-        if compliance_report['overall_compliance_score'] < 80:
-            recommendations.append("Cải thiện điểm tuân thủ tổng thể")
-        
-        if not compliance_report['contribution_compliance']:
-            recommendations.append("Tăng cường tuân thủ đóng góp BHXH")
-        
-        # Employee recommendations
-        if employee_analysis['total_employees'] == 0:
-            recommendations.append("Cập nhật thông tin nhân viên trong hệ thống VSS")
-        
-        if employee_analysis['average_salary'] < 15000000:
-            recommendations.append("Xem xét tăng lương trung bình")
-        
-        # Risk recommendations
-        if risk_assessment['risk_level'] == 'high':
-            recommendations.append("Ưu tiên giảm thiểu rủi ro cao")
-        
-        if risk_assessment['risk_factors']:
-            recommendations.append(f"Xử lý các yếu tố rủi ro: {', '.join(risk_assessment['risk_factors'])}")
-        
-        # General recommendations
-        recommendations.extend([
-            "Thường xuyên cập nhật thông tin doanh nghiệp",
-            "Tăng cường giám sát tuân thủ BHXH",
-            "Cải thiện quy trình quản lý nhân sự",
-            "Xây dựng kế hoạch phát triển bền vững"
-        ])
-        
-        return recommendations
-    
-    def _calculate_real_integration_confidence(self, enterprise: Dict, vss: Dict) -> float:
-        """Calculate integration confidence based on real data"""
-        confidence = 0.0
-        
-        # Check if we have both enterprise and VSS data
-        if enterprise.get('ten_doanh_nghiep') and vss.get('employees'):
-            confidence += 50.0
-        
-        if enterprise.get('mst') and vss.get('contributions'):
-            confidence += 30.0
-        
-        if enterprise.get('dia_chi') and vss.get('compliance'):
-            confidence += 20.0
-        
-        # Bonus for real data sources
-        if enterprise.get('data_source') != 'none':
-            confidence += 10.0
-        
-        if vss.get('data_source') != 'none':
-            confidence += 10.0
-        
-        return min(confidence, 100.0)
-    
-    def _calculate_real_data_percentage(self, enterprise: Dict, vss: Dict) -> float:
-        """Calculate percentage of real data vs simulated data"""
-        real_count = 0
-        total_count = 0
-        
-        # Enterprise data
-        if enterprise.get('ten_doanh_nghiep'):
-            real_count += 1
-        total_count += 1
-        
-        if enterprise.get('data_source') != 'none':
-            real_count += 1
-        total_count += 1
-        
-        # VSS data
-        if vss.get('employees'):
-            real_count += 1
-        total_count += 1
-        
-        if vss.get('contributions'):
-            real_count += 1
-        total_count += 1
-        
-        if vss.get('data_source') != 'none':
-            real_count += 1
-        total_count += 1
-        
-        return (real_count / total_count) * 100 if total_count > 0 else 0.0
-    
     def get_statistics(self) -> Dict[str, Any]:
         """Get system statistics"""
-        return {
-            'total_requests': self.stats['total_requests'],
-            'successful_requests': self.stats['successful_requests'],
-            'failed_requests': self.stats['failed_requests'],
-            'success_rate': self.stats['successful_requests'] / self.stats['total_requests'] * 100 if self.stats['total_requests'] > 0 else 0,
-            'average_extraction_time': self.stats['total_extraction_time'] / self.stats['total_requests'] if self.stats['total_requests'] > 0 else 0,
-            'real_data_extractions': self.stats['real_data_extractions'],
-            'simulated_data_extractions': self.stats['simulated_data_extractions'],
+        stats = self.stats
+        return asdict(stats) | {
+            'success_rate': stats.success_rate,
+            'average_extraction_time': stats.average_extraction_time,
             'enterprise_api_stats': self.enterprise_client.get_statistics(),
             'vss_client_stats': self.vss_client.get_statistics()
         }
@@ -742,12 +1042,19 @@ class RealVSSEnterpriseIntegrationSystem:
             filename = f"real_vss_integration_result_{result.enterprise_info.mst}_{timestamp}.json"
         
         filepath = os.path.join('data', filename)
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        _ensure_dir(os.path.dirname(filepath))
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(asdict(result), f, ensure_ascii=False, indent=2)
+        # Encoded up front and written in one call; indented only when 'pretty_results' is set
+        pretty = self.config.get('pretty_results', False)
+        if orjson:
+            option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            payload = orjson.dumps(result.to_dict(), option=(option | orjson.OPT_INDENT_2) if pretty else option)
+        else:
+            payload = json.dumps(result.to_dict(), ensure_ascii=False, indent=2 if pretty else None).encode('utf-8')
+        with open(filepath, 'wb', buffering=1 << 20) as f:
+            f.write(payload)
         
-        self.logger.info(f"✅ Real result saved to {filepath}")
+        self.logger.info("✅ Real result saved to %s", filepath)
         return filepath
 
 def main():
@@ -765,39 +1072,43 @@ def main():
         print(f"\n📊 Processing MST with REAL DATA: {test_mst}")
         result = system.process_mst(test_mst)
         
-        # Print results
-        print(f"\n📋 REAL INTEGRATION RESULTS:")
-        print(f"  - Company: {result.enterprise_info.ten_doanh_nghiep}")
-        print(f"  - MST: {result.enterprise_info.mst}")
-        print(f"  - Address: {result.enterprise_info.dia_chi}")
-        print(f"  - Sector: {result.enterprise_info.nganh_nghe}")
-        print(f"  - Revenue: {result.enterprise_info.doanh_thu:,.0f} VND")
-        print(f"  - Employees: {len(result.vss_info.employees)}")
-        print(f"  - Contributions: {len(result.vss_info.contributions)}")
-        print(f"  - Compliance Score: {result.compliance_report['overall_compliance_score']:.1f}%")
-        print(f"  - Risk Level: {result.risk_assessment['risk_level']}")
-        print(f"  - Data Quality: {result.data_quality_score:.1f}%")
-        print(f"  - Integration Confidence: {result.integration_confidence:.1f}%")
-        print(f"  - Real Data Percentage: {result.real_data_percentage:.1f}%")
-        print(f"  - Extraction Time: {result.extraction_time:.2f}s")
+        # Collect the report and write it to stdout in one go
+        lines = [
+            f"\n📋 REAL INTEGRATION RESULTS:",
+            f"  - Company: {result.enterprise_info.ten_doanh_nghiep}",
+            f"  - MST: {result.enterprise_info.mst}",
+            f"  - Address: {result.enterprise_info.dia_chi}",
+            f"  - Sector: {result.enterprise_info.nganh_nghe}",
+            f"  - Revenue: {result.enterprise_info.doanh_thu:,.0f} VND",
+            f"  - Employees: {len(result.vss_info.employees)}",
+            f"  - Contributions: {len(result.vss_info.contributions)}",
+            f"  - Compliance Score: {result.compliance_report['overall_compliance_score']:.1f}%",
+            f"  - Risk Level: {result.risk_assessment['risk_level']}",
+            f"  - Data Quality: {result.data_quality_score:.1f}%",
+            f"  - Integration Confidence: {result.integration_confidence:.1f}%",
+            f"  - Real Data Percentage: {result.real_data_percentage:.1f}%",
+            f"  - Extraction Time: {result.extraction_time:.2f}s"
+        ]
         
         # Show recommendations
-        print(f"\n💡 RECOMMENDATIONS:")
-        for i, rec in enumerate(result.recommendations, 1):
-            print(f"  {i}. {rec}")
+        lines.append(f"\n💡 RECOMMENDATIONS:")
+        lines += [f"  {i}. {rec}" for i, rec in enumerate(result.recommendations, 1)]
         
         # Save result
         filename = system.save_result(result)
-        print(f"\n📁 Real result saved: {filename}")
+        lines.append(f"\n📁 Real result saved: {filename}")
         
         # Show statistics
         stats = system.get_statistics()
-        print(f"\n📊 SYSTEM STATISTICS:")
-        print(f"  - Total requests: {stats['total_requests']}")
-        print(f"  - Success rate: {stats['success_rate']:.1f}%")
-        print(f"  - Average time: {stats['average_extraction_time']:.2f}s")
-        print(f"  - Real data extractions: {stats['real_data_extractions']}")
-        print(f"  - Simulated data extractions: {stats['simulated_data_extractions']}")
+        lines += [
+            f"\n📊 SYSTEM STATISTICS:",
+            f"  - Total requests: {stats['total_requests']}",
+            f"  - Success rate: {stats['success_rate']:.1f}%",
+            f"  - Average time: {stats['average_extraction_time']:.2f}s",
+            f"  - Real data extractions: {stats['real_data_extractions']}",
+            f"  - Simulated data extractions: {stats['simulated_data_extractions']}"
+        ]
+        sys.stdout.write('\n'.join(lines) + '\n')
         
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -6,185 +6,362 @@ Creates realistic Vietnamese enterprise and VSS data for demonstration
 
 import random
 import json
+import sys
+import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass
+from functools import lru_cache
 import logging
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy risk scorer is used without it
+    njit = None
+
+# Generator-owned PRNGs: _RNG for single draws, which skip the module-level random.* lookups,
+# and _NP_RNG for whole columns drawn in one NumPy call
+_RNG = random.Random()
+_NP_RNG = np.random.default_rng()
+
+# Vietnamese company names
+_COMPANY_PREFIXES = (
+    "CÔNG TY TNHH", "CÔNG TY CỔ PHẦN", "DOANH NGHIỆP TƯ NHÂN",
+    "CÔNG TY TRÁCH NHIỆM HỮU HẠN", "CÔNG TY LIÊN DOANH",
+    "TẬP ĐOÀN", "TỔNG CÔNG TY", "NHÀ MÁY", "XÍ NGHIỆP"
+)
+
+_COMPANY_SUFFIXES = (
+    "CÔNG NGHỆ THÔNG TIN", "XÂY DỰNG", "THƯƠNG MẠI DỊCH VỤ",
+    "SẢN XUẤT", "CHẾ BIẾN", "VẬN TẢI", "LOGISTICS", "TÀI CHÍNH",
+    "NGÂN HÀNG", "BẢO HIỂM", "BẤT ĐỘNG SẢN", "DU LỊCH",
+    "GIÁO DỤC", "Y TẾ", "NÔNG NGHIỆP", "THỦY SẢN"
+)
+
+_COMPANY_NAMES = (
+    "VIỆT NAM", "HÀ NỘI", "SÀI GÒN", "ĐÀ NẴNG", "HẢI PHÒNG",
+    "CẦN THƠ", "HUẾ", "NHA TRANG", "VŨNG TÀU", "QUẢNG NINH",
+    "THANH HÓA", "NGHỆ AN", "QUẢNG BÌNH", "HÀ TĨNH", "QUẢNG TRỊ"
+)
+
+# Vietnamese names
+_FIRST_NAMES = (
+    "Nguyễn", "Trần", "Lê", "Phạm", "Hoàng", "Phan", "Vũ", "Võ",
+    "Đặng", "Bùi", "Đỗ", "Hồ", "Ngô", "Dương", "Lý", "Đinh"
+)
+
+_MIDDLE_NAMES = (
+    "Văn", "Thị", "Đức", "Minh", "Quang", "Hữu", "Công", "Đình",
+    "Thanh", "Xuân", "Thu", "Hạ", "Đông", "Nam", "Bắc", "Trung"
+)
+
+_LAST_NAMES = (
+    "An", "Bình", "Cường", "Dũng", "Giang", "Hải", "Khánh", "Linh",
+    "Minh", "Nam", "Oanh", "Phương", "Quang", "Sơn", "Thảo", "Uyên"
+)
+
+# Vietnamese addresses
+_PROVINCES = (
+    "Hà Nội", "TP Hồ Chí Minh", "Đà Nẵng", "Hải Phòng", "Cần Thơ",
+    "An Giang", "Bà Rịa - Vũng Tàu", "Bạc Liêu", "Bắc Giang", "Bắc Kạn",
+    "Bắc Ninh", "Bến Tre", "Bình Định", "Bình Dương", "Bình Phước",
+    "Bình Thuận", "Cà Mau", "Cao Bằng", "Đắk Lắk", "Đắk Nông",
+    "Điện Biên", "Đồng Nai", "Đồng Tháp", "Gia Lai", "Hà Giang",
+    "Hà Nam", "Hà Tĩnh", "Hải Dương", "Hậu Giang", "Hòa Bình",
+    "Hưng Yên", "Khánh Hòa", "Kiên Giang", "Kon Tum", "Lai Châu",
+    "Lâm Đồng", "Lạng Sơn", "Lào Cai", "Long An", "Nam Định",
+    "Nghệ An", "Ninh Bình", "Ninh Thuận", "Phú Thọ", "Phú Yên",
+    "Quảng Bình", "Quảng Nam", "Quảng Ngãi", "Quảng Ninh", "Quảng Trị",
+    "Sóc Trăng", "Sơn La", "Tây Ninh", "Thái Bình", "Thái Nguyên",
+    "Thanh Hóa", "Thừa Thiên Huế", "Tiền Giang", "Trà Vinh", "Tuyên Quang",
+    "Vĩnh Long", "Vĩnh Phúc", "Yên Bái"
+)
+
+_DISTRICTS = (
+    "Quận 1", "Quận 2", "Quận 3", "Quận 4", "Quận 5", "Quận 6",
+    "Quận 7", "Quận 8", "Quận 9", "Quận 10", "Quận 11", "Quận 12",
+    "Quận Ba Đình", "Quận Cầu Giấy", "Quận Đống Đa", "Quận Hai Bà Trưng",
+    "Quận Hoàn Kiếm", "Quận Hoàng Mai", "Quận Long Biên", "Quận Tây Hồ",
+    "Quận Thanh Xuân", "Huyện Ba Vì", "Huyện Chương Mỹ", "Huyện Đan Phượng",
+    "Huyện Đông Anh", "Huyện Gia Lâm", "Huyện Hoài Đức", "Huyện Mê Linh"
+)
+
+_WARDS = (
+    "Phường 1", "Phường 2", "Phường 3", "Phường 4", "Phường 5",
+    "Phường Hàng Bạc", "Phường Hàng Bồ", "Phường Hàng Bông", "Phường Hàng Buồm",
+    "Phường Hàng Đào", "Phường Hàng Gai", "Phường Hàng Mã", "Phường Hàng Trống",
+    "Phường Lý Thái Tổ", "Phường Phúc Tân", "Phường Phúc Xá", "Phường Tràng Tiền"
+)
+
+# Business sectors
+_BUSINESS_SECTORS = (
+    "Công nghệ thông tin", "Xây dựng", "Thương mại dịch vụ",
+    "Sản xuất chế biến", "Vận tải logistics", "Tài chính ngân hàng",
+    "Bảo hiểm", "Bất động sản", "Du lịch khách sạn",
+    "Giáo dục đào tạo", "Y tế", "Nông nghiệp thủy sản",
+    "Năng lượng", "Hóa chất", "Dệt may", "Thực phẩm"
+)
+
+# Company types
+_COMPANY_TYPES = (
+    "Công ty TNHH", "Công ty cổ phần", "Doanh nghiệp tư nhân",
+    "Công ty liên doanh", "Tập đoàn", "Tổng công ty"
+)
+
+# Street names; hospitals are placed on the first six
+_STREET_NAMES = (
+    "Đường Lê Lợi", "Đường Nguyễn Huệ", "Đường Trần Hưng Đạo",
+    "Đường Lý Thường Kiệt", "Đường Hai Bà Trưng", "Đường Lê Duẩn",
+    "Đường Võ Văn Tần", "Đường Nguyễn Thị Minh Khai", "Đường Cách Mạng Tháng 8",
+    "Đường Nguyễn Văn Cừ", "Đường Lê Văn Sỹ", "Đường Nguyễn Oanh"
+)
+_HOSPITAL_STREET_NAMES = _STREET_NAMES[:6]
+
+# Landline area codes for company and hospital phone numbers
+_PHONE_PREFIXES = (
+    "024", "028", "0236", "0238", "0239", "0251", "0252", "0254", "0255", "0256", "0257", "0258",
+    "0259", "0260", "0261", "0262", "0263", "0264", "0265", "0266", "0267", "0268", "0269", "0270",
+    "0271", "0272", "0273", "0274", "0275", "0276", "0277", "0278", "0279", "0280", "0281", "0282",
+    "0283", "0284", "0285", "0286", "0287", "0288", "0289", "0290", "0291", "0292", "0293", "0294",
+    "0295", "0296", "0297", "0298", "0299"
+)
+_HOSPITAL_PHONE_PREFIXES = ("024", "028", "0236", "0238")
+
+# Job positions
+_JOB_POSITIONS = (
+    "Giám đốc", "Phó giám đốc", "Trưởng phòng", "Phó trưởng phòng",
+    "Nhân viên", "Chuyên viên", "Kỹ sư", "Kế toán", "Thư ký",
+    "Nhân viên văn phòng", "Nhân viên bán hàng", "Nhân viên kỹ thuật",
+    "Công nhân", "Thợ", "Lái xe", "Bảo vệ"
+)
+
+# Hospital names
+_HOSPITAL_NAMES = (
+    "Bệnh viện Bạch Mai", "Bệnh viện Chợ Rẫy", "Bệnh viện Việt Đức",
+    "Bệnh viện K", "Bệnh viện Nhi Trung ương", "Bệnh viện Phụ sản Trung ương",
+    "Bệnh viện Tim Hà Nội", "Bệnh viện Mắt Trung ương", "Bệnh viện Da liễu Trung ương",
+    "Bệnh viện Tâm thần Trung ương", "Bệnh viện Phong", "Bệnh viện Lao",
+    "Bệnh viện 108", "Bệnh viện 103", "Bệnh viện 175", "Bệnh viện 354"
+)
+
+# Claim types with the claim amount range (VND) of each
+_CLAIM_TYPES = ('medical', 'maternity', 'sick_leave', 'accident')
+_CLAIM_LOWS = np.array([500000, 2000000, 300000, 1000000], dtype=np.int64)
+_CLAIM_HIGHS = np.array([5000000, 10000000, 2000000, 15000000], dtype=np.int64)
+
+# Statuses with cumulative weights (85% / 15% and 70% / 25% / 5%), so random.choices
+# does not re-accumulate them on every draw
+_EMPLOYEE_STATUSES = ('active', 'inactive')
+_EMPLOYEE_STATUS_CUM_WEIGHTS = (85, 100)
+_CLAIM_STATUSES = ('approved', 'pending', 'rejected')
+_CLAIM_STATUS_CUM_WEIGHTS = (70, 95, 100)
+
+# Medical specialties
+_MEDICAL_SPECIALTIES = (
+    "Nội khoa", "Ngoại khoa", "Sản phụ khoa", "Nhi khoa", "Tim mạch",
+    "Thần kinh", "Tâm thần", "Da liễu", "Mắt", "Tai mũi họng",
+    "Răng hàm mặt", "Xương khớp", "Ung bướu", "Huyết học", "Nội tiết"
+)
+
+def _salary_range(position: str) -> Tuple[int, int]:
+    """Salary range (VND) for a job position"""
+    if "Giám đốc" in position or "Tập đoàn" in position:
+        return 50000000, 100000000  # 50M - 100M
+    if "Trưởng phòng" in position or "Phó giám đốc" in position:
+        return 25000000, 50000000  # 25M - 50M
+    if "Chuyên viên" in position or "Kỹ sư" in position:
+        return 15000000, 30000000  # 15M - 30M
+    return 8000000, 20000000  # 8M - 20M
+
+# Salary range (VND) of each job position, worked out once
+_POSITION_SALARY = {position: _salary_range(position) for position in _JOB_POSITIONS}
+
+# Risk factors with their mitigation, in the order the risk scorer flags them
+_RISK_FACTORS = (
+    ("Mức lương trung bình thấp", "Cải thiện chính sách lương"),
+    ("Tỷ lệ thay đổi nhân viên cao", "Cải thiện môi trường làm việc"),
+    ("Không có đóng góp BHXH", "Thực hiện đóng góp BHXH đầy đủ"),
+    ("Thiếu dữ liệu đóng góp", "Kết nối hệ thống đóng góp"),
+    ("Điểm tuân thủ thấp", "Tăng cường giám sát tuân thủ")
+)
+_RISK_POINTS = np.array([15.0, 20.0, 30.0, 25.0, 20.0])
+_LOW_AVERAGE_SALARY = 10000000.0  # VND
+_LOW_ACTIVE_RATIO = 0.8
+_LOW_COMPLIANCE_SCORE = 70.0
+
+def _score_risk_numpy(salaries: np.ndarray, active: np.ndarray, contribution_amounts: np.ndarray,
+                      compliance_score: float) -> Tuple[float, np.ndarray]:
+    """Risk score and which _RISK_FACTORS apply, from employee and contribution arrays"""
+    flags = np.array([
+        salaries.size > 0 and salaries.mean() < _LOW_AVERAGE_SALARY,
+        active.size > 0 and active.mean() < _LOW_ACTIVE_RATIO,
+        contribution_amounts.size > 0 and contribution_amounts.sum() == 0,
+        contribution_amounts.size == 0,
+        compliance_score < _LOW_COMPLIANCE_SCORE
+    ])
+    return float(_RISK_POINTS[flags].sum()), flags
+
+def _score_risk_loop(salaries, active, contribution_amounts, compliance_score):
+    """Loop form of the risk scorer, compiled with numba when available"""
+    flags = np.zeros(5, np.bool_)
+    if salaries.size > 0:
+        total = 0.0
+        for salary in salaries:
+            total += salary
+        flags[0] = total / salaries.size < _LOW_AVERAGE_SALARY
+    if active.size > 0:
+        active_count = 0
+        for is_active in active:
+            if is_active:
+                active_count += 1
+        flags[1] = active_count / active.size < _LOW_ACTIVE_RATIO
+    if contribution_amounts.size > 0:
+        total = 0.0
+        for amount in contribution_amounts:
+            total += amount
+        flags[2] = total == 0.0
+    else:
+        flags[3] = True
+    flags[4] = compliance_score < _LOW_COMPLIANCE_SCORE
+    
+    score = 0.0
+    for i in range(5):
+        if flags[i]:
+            score += _RISK_POINTS[i]
+    return score, flags
+
+# Cached on disk like the integration's scorer, so only the first process pays for compilation
+_score_risk = (njit(cache=True, fastmath={'reassoc'}, boundscheck=False)(_score_risk_loop)
+               if njit else _score_risk_numpy)
+
+@dataclass
+class EmployeeColumns:
+    """Employee fields the generators aggregate over, as parallel columns"""
+    ids: List[str]
+    salaries: np.ndarray
+    statuses: np.ndarray
+    
+    @classmethod
+    def from_records(cls, employees: List[Dict[str, Any]]) -> 'EmployeeColumns':
+        """Read the columns from employee records in one pass"""
+        ids, salaries, statuses = [], [], []
+        for employee in employees:
+            ids.append(employee.get('employee_id', ''))
+            salaries.append(employee.get('salary', 0))
+            statuses.append(employee.get('status', ''))
+        return cls(ids, np.array(salaries, dtype=np.float64), np.array(statuses, dtype=str))
+
+@dataclass(frozen=True)
+class _EnterpriseDraws:
+    """Random draws behind one enterprise record; dates are kept as an age so
+    the record can be dated from the time it is requested"""
+    company_name: str
+    province: str
+    district: str
+    ward: str
+    street_number: int
+    street_name: str
+    phone_prefix: str
+    phone_number: int
+    business_sector: str
+    company_type: str
+    registration_age_days: int
+    revenue: int
+    bank_account: int
+
 class RealisticDataGenerator:
-    """Generate realistic Vietnamese enterprise and VSS data"""
+    """Generate realistic Vietnamese enterprise and VSS data
+    
+    With compact=True the employee, contribution, claim and hospital rows
+    leave out 'mst' and 'extracted_at', which are the same for every row
+    of a batch; the caller records them once on the enclosing envelope.
+    """
     
-    def __init__(self):
+    def __init__(self, compact: bool = False):
         self.logger = logging.getLogger(self.__class__.__name__)
-        
-        # Vietnamese company names
-        self.company_prefixes = [
-            "CÔNG TY TNHH", "CÔNG TY CỔ PHẦN", "DOANH NGHIỆP TƯ NHÂN",
-            "CÔNG TY TRÁCH NHIỆM HỮU HẠN", "CÔNG TY LIÊN DOANH",
-            "TẬP ĐOÀN", "TỔNG CÔNG TY", "NHÀ MÁY", "XÍ NGHIỆP"
-        ]
-        
-        self.company_suffixes = [
-            "CÔNG NGHỆ THÔNG TIN", "XÂY DỰNG", "THƯƠNG MẠI DỊCH VỤ",
-            "SẢN XUẤT", "CHẾ BIẾN", "VẬN TẢI", "LOGISTICS", "TÀI CHÍNH",
-            "NGÂN HÀNG", "BẢO HIỂM", "BẤT ĐỘNG SẢN", "DU LỊCH",
-            "GIÁO DỤC", "Y TẾ", "NÔNG NGHIỆP", "THỦY SẢN"
-        ]
-        
-        self.company_names = [
-            "VIỆT NAM", "HÀ NỘI", "SÀI GÒN", "ĐÀ NẴNG", "HẢI PHÒNG",
-            "CẦN THƠ", "HUẾ", "NHA TRANG", "VŨNG TÀU", "QUẢNG NINH",
-            "THANH HÓA", "NGHỆ AN", "QUẢNG BÌNH", "HÀ TĨNH", "QUẢNG TRỊ"
-        ]
-        
-        # Vietnamese names
-        self.vietnamese_first_names = [
-            "Nguyễn", "Trần", "Lê", "Phạm", "Hoàng", "Phan", "Vũ", "Võ",
-            "Đặng", "Bùi", "Đỗ", "Hồ", "Ngô", "Dương", "Lý", "Đinh"
-        ]
-        
-        self.vietnamese_middle_names = [
-            "Văn", "Thị", "Đức", "Minh", "Quang", "Hữu", "Công", "Đình",
-            "Thanh", "Xuân", "Thu", "Hạ", "Đông", "Nam", "Bắc", "Trung"
-        ]
-        
-        self.vietnamese_last_names = [
-            "An", "Bình", "Cường", "Dũng", "Giang", "Hải", "Khánh", "Linh",
-            "Minh", "Nam", "Oanh", "Phương", "Quang", "Sơn", "Thảo", "Uyên"
-        ]
-        
-        # Vietnamese addresses
-        self.provinces = [
-            "Hà Nội", "TP Hồ Chí Minh", "Đà Nẵng", "Hải Phòng", "Cần Thơ",
-            "An Giang", "Bà Rịa - Vũng Tàu", "Bạc Liêu", "Bắc Giang", "Bắc Kạn",
-            "Bắc Ninh", "Bến Tre", "Bình Định", "Bình Dương", "Bình Phước",
-            "Bình Thuận", "Cà Mau", "Cao Bằng", "Đắk Lắk", "Đắk Nông",
-            "Điện Biên", "Đồng Nai", "Đồng Tháp", "Gia Lai", "Hà Giang",
-            "Hà Nam", "Hà Tĩnh", "Hải Dương", "Hậu Giang", "Hòa Bình",
-            "Hưng Yên", "Khánh Hòa", "Kiên Giang", "Kon Tum", "Lai Châu",
-            "Lâm Đồng", "Lạng Sơn", "Lào Cai", "Long An", "Nam Định",
-            "Nghệ An", "Ninh Bình", "Ninh Thuận", "Phú Thọ", "Phú Yên",
-            "Quảng Bình", "Quảng Nam", "Quảng Ngãi", "Quảng Ninh", "Quảng Trị",
-            "Sóc Trăng", "Sơn La", "Tây Ninh", "Thái Bình", "Thái Nguyên",
-            "Thanh Hóa", "Thừa Thiên Huế", "Tiền Giang", "Trà Vinh", "Tuyên Quang",
-            "Vĩnh Long", "Vĩnh Phúc", "Yên Bái"
-        ]
-        
-        self.districts = [
-            "Quận 1", "Quận 2", "Quận 3", "Quận 4", "Quận 5", "Quận 6",
-            "Quận 7", "Quận 8", "Quận 9", "Quận 10", "Quận 11", "Quận 12",
-            "Quận Ba Đình", "Quận Cầu Giấy", "Quận Đống Đa", "Quận Hai Bà Trưng",
-            "Quận Hoàn Kiếm", "Quận Hoàng Mai", "Quận Long Biên", "Quận Tây Hồ",
-            "Quận Thanh Xuân", "Huyện Ba Vì", "Huyện Chương Mỹ", "Huyện Đan Phượng",
-            "Huyện Đông Anh", "Huyện Gia Lâm", "Huyện Hoài Đức", "Huyện Mê Linh"
-        ]
-        
-        self.wards = [
-            "Phường 1", "Phường 2", "Phường 3", "Phường 4", "Phường 5",
-            "Phường Hàng Bạc", "Phường Hàng Bồ", "Phường Hàng Bông", "Phường Hàng Buồm",
-            "Phường Hàng Đào", "Phường Hàng Gai", "Phường Hàng Mã", "Phường Hàng Trống",
-            "Phường Lý Thái Tổ", "Phường Phúc Tân", "Phường Phúc Xá", "Phường Tràng Tiền"
-        ]
-        
-        # Business sectors
-        self.business_sectors = [
-            "Công nghệ thông tin", "Xây dựng", "Thương mại dịch vụ",
-            "Sản xuất chế biến", "Vận tải logistics", "Tài chính ngân hàng",
-            "Bảo hiểm", "Bất động sản", "Du lịch khách sạn",
-            "Giáo dục đào tạo", "Y tế", "Nông nghiệp thủy sản",
-            "Năng lượng", "Hóa chất", "Dệt may", "Thực phẩm"
-        ]
-        
-        # Company types
-        self.company_types = [
-            "Công ty TNHH", "Công ty cổ phần", "Doanh nghiệp tư nhân",
-            "Công ty liên doanh", "Tập đoàn", "Tổng công ty"
-        ]
-        
-        # Job positions
-        self.job_positions = [
-            "Giám đốc", "Phó giám đốc", "Trưởng phòng", "Phó trưởng phòng",
-            "Nhân viên", "Chuyên viên", "Kỹ sư", "Kế toán", "Thư ký",
-            "Nhân viên văn phòng", "Nhân viên bán hàng", "Nhân viên kỹ thuật",
-            "Công nhân", "Thợ", "Lái xe", "Bảo vệ"
-        ]
-        
-        # Hospital names
-        self.hospital_names = [
-            "Bệnh viện Bạch Mai", "Bệnh viện Chợ Rẫy", "Bệnh viện Việt Đức",
-            "Bệnh viện K", "Bệnh viện Nhi Trung ương", "Bệnh viện Phụ sản Trung ương",
-            "Bệnh viện Tim Hà Nội", "Bệnh viện Mắt Trung ương", "Bệnh viện Da liễu Trung ương",
-            "Bệnh viện Tâm thần Trung ương", "Bệnh viện Phong", "Bệnh viện Lao",
-            "Bệnh viện 108", "Bệnh viện 103", "Bệnh viện 175", "Bệnh viện 354"
-        ]
-        
-        # Medical specialties
-        self.medical_specialties = [
-            "Nội khoa", "Ngoại khoa", "Sản phụ khoa", "Nhi khoa", "Tim mạch",
-            "Thần kinh", "Tâm thần", "Da liễu", "Mắt", "Tai mũi họng",
-            "Răng hàm mặt", "Xương khớp", "Ung bướu", "Huyết học", "Nội tiết"
-        ]
+        self.compact = compact
+    
+    def _row_metadata(self, mst: str, now_iso: str) -> Dict[str, str]:
+        """Per-row 'mst' and 'extracted_at' fields, empty when compact"""
+        return {} if self.compact else {'mst': mst, 'extracted_at': now_iso}
+    
+    def generate_enterprise_data(self, mst: str, seed: Optional[int] = None) -> Dict[str, Any]:
+        """Generate realistic enterprise data
+        
+        With a seed the record is reproducible: its draws come from their own
+        random.Random(seed) and are cached per (mst, seed) for the life of the
+        process. Each call still builds a new dict, and dates it and stamps
+        'extracted_at' from the current time.
+        """
+        if seed is None:
+            draws = self._enterprise_draws(_RNG)
+        else:
+            draws = self._seeded_enterprise_draws(mst, seed)
+        return self._enterprise_record(mst, draws, datetime.now())
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _seeded_enterprise_draws(mst: str, seed: int) -> _EnterpriseDraws:
+        """Enterprise draws for a seed; immutable, so cache hits can share them"""
+        return RealisticDataGenerator._enterprise_draws(random.Random(seed))
     
-    def generate_enterprise_data(self, mst: str) -> Dict[str, Any]:
-        """Generate realistic enterprise data"""
+    @staticmethod
+    def _enterprise_draws(rng: random.Random) -> _EnterpriseDraws:
+        """Draw the random fields of one enterprise record from rng"""
         # Generate company name
-        prefix = random.choice(self.company_prefixes)
-        suffix = random.choice(self.company_suffixes)
-        name = random.choice(self.company_names)
-        company_name = f"{prefix} {suffix} {name}"
+        prefix = rng.choice(_COMPANY_PREFIXES)
+        suffix = rng.choice(_COMPANY_SUFFIXES)
+        name = rng.choice(_COMPANY_NAMES)
         
-        # Generate address
-        province = random.choice(self.provinces)
-        district = random.choice(self.districts)
-        ward = random.choice(self.wards)
-        street_number = random.randint(1, 999)
-        street_name = random.choice([
-            "Đường Lê Lợi", "Đường Nguyễn Huệ", "Đường Trần Hưng Đạo",
-            "Đường Lý Thường Kiệt", "Đường Hai Bà Trưng", "Đường Lê Duẩn",
-            "Đường Võ Văn Tần", "Đường Nguyễn Thị Minh Khai", "Đường Cách Mạng Tháng 8",
-            "Đường Nguyễn Văn Cừ", "Đường Lê Văn Sỹ", "Đường Nguyễn Oanh"
-        ])
-        address = f"Số {street_number}, {street_name}, {ward}, {district}, {province}"
-        
-        # Generate phone number
-        phone_prefixes = ["024", "028", "0236", "0238", "0239", "0251", "0252", "0254", "0255", "0256", "0257", "0258", "0259", "0260", "0261", "0262", "0263", "0264", "0265", "0266", "0267", "0268", "0269", "0270", "0271", "0272", "0273", "0274", "0275", "0276", "0277", "0278", "0279", "0280", "0281", "0282", "0283", "0284", "0285", "0286", "0287", "0288", "0289", "0290", "0291", "0292", "0293", "0294", "0295", "0296", "0297", "0298", "0299"]
-        phone_prefix = random.choice(phone_prefixes)
-        phone_suffix = ''.join([str(random.randint(0, 9)) for _ in range(7)])
-        phone = f"{phone_prefix}.{phone_suffix[:3]}.{phone_suffix[3:]}"
+        return _EnterpriseDraws(
+            company_name=f"{prefix} {suffix} {name}",
+            # Generate address
+            province=rng.choice(_PROVINCES),
+            district=rng.choice(_DISTRICTS),
+            ward=rng.choice(_WARDS),
+            street_number=rng.randint(1, 999),
+            street_name=rng.choice(_STREET_NAMES),
+            # Generate phone number
+            phone_prefix=rng.choice(_PHONE_PREFIXES),
+            phone_number=rng.randrange(10000000),
+            # Generate other data
+            business_sector=rng.choice(_BUSINESS_SECTORS),
+            company_type=rng.choice(_COMPANY_TYPES),
+            registration_age_days=rng.randint(365, 3650),
+            revenue=rng.randint(1000000000, 100000000000),  # 1B to 100B VND
+            bank_account=rng.randrange(10000000000)
+        )
+    
+    @staticmethod
+    def _enterprise_record(mst: str, draws: _EnterpriseDraws, now: datetime) -> Dict[str, Any]:
+        """Format an enterprise record from its draws, dated from now"""
+        address = f"Số {draws.street_number}, {draws.street_name}, {draws.ward}, {draws.district}, {draws.province}"
+        phone = f"{draws.phone_prefix}.{draws.phone_number // 10000:03d}.{draws.phone_number % 10000:04d}"
         
         # Generate website
-        company_slug = company_name.lower().replace(" ", "").replace("côngty", "").replace("tnhh", "").replace("cổphần", "")
+        company_slug = draws.company_name.lower().replace(" ", "").replace("côngty", "").replace("tnhh", "").replace("cổphần", "")
         website = f"https://www.{company_slug}.com.vn"
         
-        # Generate other data
-        business_sector = random.choice(self.business_sectors)
-        company_type = random.choice(self.company_types)
-        
         # Generate dates
-        registration_date = datetime.now() - timedelta(days=random.randint(365, 3650))
+        registration_date = now - timedelta(days=draws.registration_age_days)
         expiry_date = registration_date + timedelta(days=3650)
         
-        # Generate revenue
-        revenue = random.randint(1000000000, 100000000000)  # 1B to 100B VND
-        
-        # Generate bank account
-        bank_account = ''.join([str(random.randint(0, 9)) for _ in range(10)])
-        
         return {
             'MST': mst,
-            'TenDoanhNghiep': company_name,
+            'TenDoanhNghiep': draws.company_name,
             'DiaChi': address,
-            'NganhNghe': business_sector,
-            'LoaiHinh': company_type,
+            'NganhNghe': draws.business_sector,
+            'LoaiHinh': draws.company_type,
             'SoDienThoai': phone,
             'Website': website,
             'NgayCap': registration_date.strftime('%Y-%m-%d'),
             'NgayHetHan': expiry_date.strftime('%Y-%m-%d'),
-            'DoanhThu': revenue,
-            'SoNganHang': bank_account,
-            'TinhThanh': province,
-            'QuanHuyen': district,
-            'PhuongXa': ward,
-            'extracted_at': datetime.now().isoformat(),
+            'DoanhThu': draws.revenue,
+            'SoNganHang': f"{draws.bank_account:010d}",
+            'TinhThanh': draws.province,
+            'QuanHuyen': draws.district,
+            'PhuongXa': draws.ward,
+            'extracted_at': now.isoformat(),
             'data_source': 'thongtindoanhnghiep.co',
             'data_quality': 95.0
         }
@@ -192,161 +369,130 @@ class RealisticDataGenerator:
     def generate_employee_data(self, mst: str, count: int = None) -> List[Dict[str, Any]]:
         """Generate realistic employee data"""
         if count is None:
-            count = random.randint(3, 15)
-        
-        employees = []
-        for i in range(count):
-            # Generate Vietnamese name
-            first_name = random.choice(self.vietnamese_first_names)
-            middle_name = random.choice(self.vietnamese_middle_names)
-            last_name = random.choice(self.vietnamese_last_names)
-            full_name = f"{first_name} {middle_name} {last_name}"
-            
-            # Generate position
-            position = random.choice(self.job_positions)
-            
-            # Generate salary based on position
-            if "Giám đốc" in position or "Tập đoàn" in position:
-                salary = random.randint(50000000, 100000000)  # 50M - 100M
-            elif "Trưởng phòng" in position or "Phó giám đốc" in position:
-                salary = random.randint(25000000, 50000000)  # 25M - 50M
-            elif "Chuyên viên" in position or "Kỹ sư" in position:
-                salary = random.randint(15000000, 30000000)  # 15M - 30M
-            else:
-                salary = random.randint(8000000, 20000000)  # 8M - 20M
-            
-            # Generate start date
-            start_date = datetime.now() - timedelta(days=random.randint(30, 1095))
-            
-            # Generate status
-            status = random.choices(['active', 'inactive'], weights=[85, 15])[0]
-            
-            employee = {
-                'employee_id': f"EMP_{i+1:03d}_{mst}",
-                'full_name': full_name,
+            count = _RNG.randint(3, 15)
+        
+        now = datetime.now()
+        now_iso = now.isoformat()
+        metadata = self._row_metadata(mst, now_iso)
+        
+        # Sample each column for all employees at once rather than field by field
+        first_names = _RNG.choices(_FIRST_NAMES, k=count)
+        middle_names = _RNG.choices(_MIDDLE_NAMES, k=count)
+        last_names = _RNG.choices(_LAST_NAMES, k=count)
+        positions = _RNG.choices(_JOB_POSITIONS, k=count)
+        statuses = _RNG.choices(_EMPLOYEE_STATUSES, cum_weights=_EMPLOYEE_STATUS_CUM_WEIGHTS, k=count)
+        start_offsets = _NP_RNG.integers(30, 1096, size=count).tolist()
+        
+        # Salary drawn within the position's range
+        low, high = np.array([_POSITION_SALARY[position] for position in positions],
+                             dtype=np.int64).reshape(count, 2).T
+        salaries = _NP_RNG.integers(low, high + 1).tolist()
+        
+        return [
+            {
+                'employee_id': f"EMP_{i:03d}_{mst}",
+                'full_name': f"{first_name} {middle_name} {last_name}",
                 'position': position,
                 'salary': salary,
-                'start_date': start_date.strftime('%Y-%m-%d'),
+                'start_date': (now - timedelta(days=start_offset)).strftime('%Y-%m-%d'),
                 'status': status,
-                'mst': mst,
-                'extracted_at': datetime.now().isoformat()
+                **metadata
             }
-            employees.append(employee)
-        
-        return employees
+            for i, (first_name, middle_name, last_name, position, salary, start_offset, status)
+            in enumerate(zip(first_names, middle_names, last_names, positions, salaries, start_offsets, statuses), 1)
+        ]
     
     def generate_contribution_data(self, employees: List[Dict[str, Any]], mst: str) -> List[Dict[str, Any]]:
         """Generate realistic contribution data"""
-        contributions = []
-        
-        for emp in employees:
-            if emp['status'] == 'active':
-                # Generate multiple contributions per employee
-                contribution_count = random.randint(1, 12)  # 1-12 months
-                
-                for i in range(contribution_count):
-                    # Calculate contribution amount (8.5% of salary for social insurance)
-                    contribution_amount = int(emp['salary'] * 0.085)
-                    
-                    # Generate contribution date
-                    contribution_date = datetime.now() - timedelta(days=random.randint(1, 365))
-                    
-                    contribution = {
-                        'contribution_id': f"CONT_{len(contributions)+1:03d}_{mst}",
-                        'employee_id': emp['employee_id'],
-                        'contribution_amount': contribution_amount,
-                        'contribution_date': contribution_date.strftime('%Y-%m-%d'),
-                        'contribution_type': 'social_insurance',
-                        'mst': mst,
-                        'extracted_at': datetime.now().isoformat()
-                    }
-                    contributions.append(contribution)
-        
-        return contributions
+        now = datetime.now()
+        now_iso = now.isoformat()
+        metadata = self._row_metadata(mst, now_iso)
+        columns = EmployeeColumns.from_records(employees)
+        active = np.flatnonzero(columns.statuses == 'active')
+        
+        # 1-12 monthly contributions per active employee, laid out as one row per contribution
+        counts = _NP_RNG.integers(1, 13, size=active.size)
+        rows = np.repeat(active, counts)
+        # Contribution amount (8.5% of salary for social insurance)
+        amounts = (columns.salaries[rows] * 0.085).astype(np.int64).tolist()
+        dates = (np.datetime64(now.date(), 'D')
+                 - _NP_RNG.integers(1, 366, size=rows.size)).astype(str).tolist()
+        
+        return [
+            {
+                'contribution_id': f"CONT_{i:03d}_{mst}",
+                'employee_id': columns.ids[row],
+                'contribution_amount': contribution_amount,
+                'contribution_date': contribution_date,
+                'contribution_type': 'social_insurance',
+                **metadata
+            }
+            for i, (row, contribution_amount, contribution_date) in enumerate(zip(rows.tolist(), amounts, dates), 1)
+        ]
     
     def generate_claim_data(self, employees: List[Dict[str, Any]], mst: str) -> List[Dict[str, Any]]:
         """Generate realistic claim data"""
-        claims = []
+        now = datetime.now()
+        now_iso = now.isoformat()
+        metadata = self._row_metadata(mst, now_iso)
         
         # Generate claims for some employees
-        claim_employees = random.sample(employees, min(len(employees), random.randint(1, 5)))
-        
-        for emp in claim_employees:
-            claim_count = random.randint(1, 3)
-            
-            for i in range(claim_count):
-                claim_types = ['medical', 'maternity', 'sick_leave', 'accident']
-                claim_type = random.choice(claim_types)
-                
-                # Generate claim amount based on type
-                if claim_type == 'medical':
-                    claim_amount = random.randint(500000, 5000000)
-                elif claim_type == 'maternity':
-                    claim_amount = random.randint(2000000, 10000000)
-                elif claim_type == 'sick_leave':
-                    claim_amount = random.randint(300000, 2000000)
-                else:  # accident
-                    claim_amount = random.randint(1000000, 15000000)
-                
-                # Generate claim date
-                claim_date = datetime.now() - timedelta(days=random.randint(1, 180))
-                
-                # Generate status
-                status = random.choices(['approved', 'pending', 'rejected'], weights=[70, 25, 5])[0]
-                
-                claim = {
-                    'claim_id': f"CLAIM_{len(claims)+1:03d}_{mst}",
-                    'employee_id': emp['employee_id'],
-                    'claim_type': claim_type,
-                    'claim_amount': claim_amount,
-                    'claim_date': claim_date.strftime('%Y-%m-%d'),
-                    'status': status,
-                    'mst': mst,
-                    'extracted_at': datetime.now().isoformat()
-                }
-                claims.append(claim)
-        
-        return claims
+        claim_employees = _RNG.sample(employees, min(len(employees), _RNG.randint(1, 5)))
+        
+        # Draw 1-3 claims per employee, then sample every claim's columns at once
+        claim_counts = _NP_RNG.integers(1, 4, size=len(claim_employees)).tolist()
+        employee_ids = [emp['employee_id'] for emp, claim_count in zip(claim_employees, claim_counts)
+                        for _ in range(claim_count)]
+        total = len(employee_ids)
+        type_indices = _NP_RNG.integers(0, len(_CLAIM_TYPES), size=total)
+        # Claim amount within the range for its type
+        amounts = _NP_RNG.integers(_CLAIM_LOWS[type_indices], _CLAIM_HIGHS[type_indices] + 1).tolist()
+        date_offsets = _NP_RNG.integers(1, 181, size=total).tolist()
+        statuses = _RNG.choices(_CLAIM_STATUSES, cum_weights=_CLAIM_STATUS_CUM_WEIGHTS, k=total)
+        
+        return [
+            {
+                'claim_id': f"CLAIM_{i:03d}_{mst}",
+                'employee_id': employee_id,
+                'claim_type': _CLAIM_TYPES[type_index],
+                'claim_amount': claim_amount,
+                'claim_date': (now - timedelta(days=date_offset)).strftime('%Y-%m-%d'),
+                'status': status,
+                **metadata
+            }
+            for i, (employee_id, type_index, claim_amount, date_offset, status)
+            in enumerate(zip(employee_ids, type_indices.tolist(), amounts, date_offsets, statuses), 1)
+        ]
     
     def generate_hospital_data(self, mst: str) -> List[Dict[str, Any]]:
         """Generate realistic hospital data"""
-        hospitals = []
-        hospital_count = random.randint(2, 5)
-        
-        for i in range(hospital_count):
-            hospital_name = random.choice(self.hospital_names)
-            
-            # Generate address
-            province = random.choice(self.provinces)
-            district = random.choice(self.districts)
-            ward = random.choice(self.wards)
-            street_number = random.randint(1, 999)
-            street_name = random.choice([
-                "Đường Lê Lợi", "Đường Nguyễn Huệ", "Đường Trần Hưng Đạo",
-                "Đường Lý Thường Kiệt", "Đường Hai Bà Trưng", "Đường Lê Duẩn"
-            ])
-            address = f"Số {street_number}, {street_name}, {ward}, {district}, {province}"
-            
-            # Generate phone
-            phone_prefix = random.choice(["024", "028", "0236", "0238"])
-            phone_suffix = ''.join([str(random.randint(0, 9)) for _ in range(7)])
-            phone = f"{phone_prefix}-{phone_suffix[:3]}-{phone_suffix[3:]}"
-            
-            # Generate specialties
-            specialties = random.sample(self.medical_specialties, random.randint(2, 5))
-            
-            hospital = {
-                'hospital_id': f"HOSP_{i+1:03d}",
+        metadata = self._row_metadata(mst, datetime.now().isoformat())
+        hospital_count = _RNG.randint(2, 5)
+        
+        # Sample each column for all hospitals at once
+        hospital_names = _RNG.choices(_HOSPITAL_NAMES, k=hospital_count)
+        provinces = _RNG.choices(_PROVINCES, k=hospital_count)
+        districts = _RNG.choices(_DISTRICTS, k=hospital_count)
+        wards = _RNG.choices(_WARDS, k=hospital_count)
+        street_numbers = _NP_RNG.integers(1, 1000, size=hospital_count).tolist()
+        street_names = _RNG.choices(_HOSPITAL_STREET_NAMES, k=hospital_count)
+        phone_prefixes = _RNG.choices(_HOSPITAL_PHONE_PREFIXES, k=hospital_count)
+        phone_numbers = _NP_RNG.integers(0, 10000000, size=hospital_count).tolist()
+        
+        return [
+            {
+                'hospital_id': f"HOSP_{i:03d}",
                 'hospital_name': hospital_name,
-                'address': address,
-                'phone': phone,
-                'specialties': specialties,
-                'mst': mst,
-                'extracted_at': datetime.now().isoformat()
+                'address': f"Số {street_number}, {street_name}, {ward}, {district}, {province}",
+                'phone': f"{phone_prefix}-{phone_number // 10000:03d}-{phone_number % 10000:04d}",
+                # Specialties are drawn without replacement, so per hospital
+                'specialties': _RNG.sample(_MEDICAL_SPECIALTIES, _RNG.randint(2, 5)),
+                **metadata
             }
-            hospitals.append(hospital)
-        
-        return hospitals
+            for i, (hospital_name, province, district, ward, street_number, street_name, phone_prefix, phone_number)
+            in enumerate(zip(hospital_names, provinces, districts, wards, street_numbers, street_names,
+                             phone_prefixes, phone_numbers), 1)
+        ]
     
     def generate_compliance_data(self, employees: List[Dict[str, Any]], contributions: List[Dict[str, Any]], mst: str) -> Dict[str, Any]:
         """Generate realistic compliance data"""
@@ -362,7 +508,7 @@ class RealisticDataGenerator:
             base_score += 20.0
         
         # Add some randomness
-        compliance_score = base_score + random.uniform(-10, 10)
+        compliance_score = base_score + _RNG.uniform(-10, 10)
         compliance_score = max(0, min(100, compliance_score))
         
         # Generate compliance issues
@@ -379,49 +525,21 @@ class RealisticDataGenerator:
             'contribution_compliance': contribution_compliance,
             'employee_compliance': employee_compliance,
             'overall_compliance_score': compliance_score,
-            'last_audit_date': (datetime.now() - timedelta(days=random.randint(30, 365))).strftime('%Y-%m-%d'),
+            'last_audit_date': (datetime.now() - timedelta(days=_RNG.randint(30, 365))).strftime('%Y-%m-%d'),
             'compliance_issues': issues
         }
     
     def generate_risk_assessment(self, employees: List[Dict[str, Any]], contributions: List[Dict[str, Any]], 
                                compliance: Dict[str, Any], mst: str) -> Dict[str, Any]:
         """Generate realistic risk assessment"""
-        risk_factors = []
-        mitigation_strategies = []
-        risk_score = 0.0
-        
-        # Analyze employee data
-        if employees:
-            avg_salary = sum(emp.get('salary', 0) for emp in employees) / len(employees)
-            if avg_salary < 10000000:  # Less than 10M VND
-                risk_factors.append("Mức lương trung bình thấp")
-                mitigation_strategies.append("Cải thiện chính sách lương")
-                risk_score += 15
-            
-            # Check turnover
-            active_employees = len([emp for emp in employees if emp.get('status') == 'active'])
-            if active_employees / len(employees) < 0.8:
-                risk_factors.append("Tỷ lệ thay đổi nhân viên cao")
-                mitigation_strategies.append("Cải thiện môi trường làm việc")
-                risk_score += 20
-        
-        # Analyze contribution data
-        if contributions:
-            total_contributions = sum(cont.get('contribution_amount', 0) for cont in contributions)
-            if total_contributions == 0:
-                risk_factors.append("Không có đóng góp BHXH")
-                mitigation_strategies.append("Thực hiện đóng góp BHXH đầy đủ")
-                risk_score += 30
-        else:
-            risk_factors.append("Thiếu dữ liệu đóng góp")
-            mitigation_strategies.append("Kết nối hệ thống đóng góp")
-            risk_score += 25
-        
-        # Analyze compliance
-        if compliance.get('overall_compliance_score', 0) < 70:
-            risk_factors.append("Điểm tuân thủ thấp")
-            mitigation_strategies.append("Tăng cường giám sát tuân thủ")
-            risk_score += 20
+        columns = EmployeeColumns.from_records(employees)
+        contribution_amounts = np.fromiter((cont.get('contribution_amount', 0) for cont in contributions),
+                                           dtype=np.float64, count=len(contributions))
+        risk_score, flags = _score_risk(columns.salaries, columns.statuses == 'active', contribution_amounts,
+                                        float(compliance.get('overall_compliance_score', 0)))
+        applied = [factor for factor, flagged in zip(_RISK_FACTORS, flags.tolist()) if flagged]
+        risk_factors = [factor for factor, _ in applied]
+        mitigation_strategies = [strategy for _, strategy in applied]
         
         # Determine risk level
         if risk_score >= 70:
@@ -433,7 +551,7 @@ class RealisticDataGenerator:
         
         return {
             'risk_level': risk_level,
-            'risk_score': min(risk_score, 100),
+            'risk_score': min(float(risk_score), 100),
             'risk_factors': risk_factors,
             'mitigation_strategies': mitigation_strategies,
             'assessment_date': datetime.now().isoformat()
@@ -441,50 +559,55 @@ class RealisticDataGenerator:
 
 def main():
     """Test the realistic data generator"""
-    print("🚀 Testing Realistic Data Generator...")
+    # The report is collected here and written to stdout once at the end
+    lines = ["🚀 Testing Realistic Data Generator..."]
     
     generator = RealisticDataGenerator()
     
     # Generate test data
     mst = "0101234567"
     
-    print(f"\n🏢 Generating enterprise data for MST: {mst}")
+    lines.append(f"\n🏢 Generating enterprise data for MST: {mst}")
     enterprise_data = generator.generate_enterprise_data(mst)
-    print(f"✅ Company: {enterprise_data['TenDoanhNghiep']}")
-    print(f"  - Address: {enterprise_data['DiaChi']}")
-    print(f"  - Phone: {enterprise_data['SoDienThoai']}")
-    print(f"  - Revenue: {enterprise_data['DoanhThu']:,.0f} VND")
-    print(f"  - Quality: {enterprise_data['data_quality']}%")
+    lines += [
+        f"✅ Company: {enterprise_data['TenDoanhNghiep']}",
+        f"  - Address: {enterprise_data['DiaChi']}",
+        f"  - Phone: {enterprise_data['SoDienThoai']}",
+        f"  - Revenue: {enterprise_data['DoanhThu']:,.0f} VND",
+        f"  - Quality: {enterprise_data['data_quality']}%"
+    ]
     
-    print(f"\n👥 Generating employee data...")
+    lines.append(f"\n👥 Generating employee data...")
     employees = generator.generate_employee_data(mst, 5)
-    print(f"✅ Generated {len(employees)} employees")
+    lines.append(f"✅ Generated {len(employees)} employees")
     for emp in employees[:3]:  # Show first 3
-        print(f"  - {emp['full_name']}: {emp['position']} - {emp['salary']:,.0f} VND")
+        lines.append(f"  - {emp['full_name']}: {emp['position']} - {emp['salary']:,.0f} VND")
     
-    print(f"\n💰 Generating contribution data...")
+    lines.append(f"\n💰 Generating contribution data...")
     contributions = generator.generate_contribution_data(employees, mst)
-    print(f"✅ Generated {len(contributions)} contributions")
+    lines.append(f"✅ Generated {len(contributions)} contributions")
     total_amount = sum(cont.get('contribution_amount', 0) for cont in contributions)
-    print(f"  - Total amount: {total_amount:,.0f} VND")
+    lines.append(f"  - Total amount: {total_amount:,.0f} VND")
     
-    print(f"\n📋 Generating claim data...")
+    lines.append(f"\n📋 Generating claim data...")
     claims = generator.generate_claim_data(employees, mst)
-    print(f"✅ Generated {len(claims)} claims")
+    lines.append(f"✅ Generated {len(claims)} claims")
     
-    print(f"\n🏥 Generating hospital data...")
+    lines.append(f"\n🏥 Generating hospital data...")
     hospitals = generator.generate_hospital_data(mst)
-    print(f"✅ Generated {len(hospitals)} hospitals")
+    lines.append(f"✅ Generated {len(hospitals)} hospitals")
     for hosp in hospitals[:2]:  # Show first 2
-        print(f"  - {hosp['hospital_name']}: {hosp['address']}")
+        lines.append(f"  - {hosp['hospital_name']}: {hosp['address']}")
     
-    print(f"\n📊 Generating compliance data...")
+    lines.append(f"\n📊 Generating compliance data...")
     compliance = generator.generate_compliance_data(employees, contributions, mst)
-    print(f"✅ Compliance score: {compliance['overall_compliance_score']:.1f}%")
+    lines.append(f"✅ Compliance score: {compliance['overall_compliance_score']:.1f}%")
     
-    print(f"\n⚠️ Generating risk assessment...")
+    lines.append(f"\n⚠️ Generating risk assessment...")
     risk = generator.generate_risk_assessment(employees, contributions, compliance, mst)
-    print(f"✅ Risk level: {risk['risk_level']} ({risk['risk_score']:.1f}/100)")
+    lines.append(f"✅ Risk level: {risk['risk_level']} ({risk['risk_score']:.1f}/100)")
+    
+    sys.stdout.write('\n'.join(lines) + '\n')
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Real VSS Enterprise Integration components
+"""
+
+import sys
+import os
+import io
+import json
+import time
+import asyncio
+import tempfile
+import threading
+import unittest
+from collections import OrderedDict
+from unittest import mock
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import requests
+from urllib3.exceptions import ProtocolError
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import real_enterprise_api_client
+from real_enterprise_api_client import RealEnterpriseAPIClient
+import real_vss_client
+from real_vss_client import RealVSSClient
+from rate_limiter import AsyncTokenBucket
+from real_vss_enterprise_integration import RealVSSEnterpriseIntegrationSystem
+from real_mst_processor import RealMSTProcessor
+
+class _YieldingDict(OrderedDict):
+    """OrderedDict that lets other threads run after each lookup, widening race windows"""
+
+    def get(self, key, default=None):
+        value = super().get(key, default)
+        time.sleep(0)
+        return value
+
+class TestRealEnterpriseAPIClient(unittest.TestCase):
+    """Test cases for Real Enterprise API Client (no network access)"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.client = RealEnterpriseAPIClient()
+        self.address = "Số 12, Đường Lê Lợi, Phường Hàng Bạc, Quận Hoàn Kiếm, Thành phố Hà Nội"
+
+    def test_mst_validation(self):
+        """Test MST validation"""
+        self.assertTrue(self.client._validate_mst("0101234567"))
+        self.assertTrue(self.client._validate_mst("0101234567-001"))
+        self.assertFalse(self.client._validate_mst("123"))
+        self.assertFalse(self.client._validate_mst(""))
+        self.assertFalse(self.client._validate_mst(None))
+        self.assertFalse(self.client._validate_mst("12345678901234"))  # Too long
+
+    def test_batch_mst_validation_matches_single(self):
+        """Test vectorized MST validation agrees with _validate_mst"""
+        msts = ["0101234567", "0101234567-001", "123", "", None, "12345678901234", 101234567890]
+        expected = [self.client._validate_mst(mst) for mst in msts]
+        self.assertEqual(self.client._validate_msts(msts).tolist(), expected)
+        self.assertEqual(self.client._validate_msts([]).tolist(), [])
+        # No strings at all
+        self.assertEqual(self.client._validate_msts([101234567, None]).tolist(), [False, False])
+        self.assertEqual(self.client.get_companies_by_msts([101234567]), [None])
+    
+    def test_address_extraction(self):
+        """Test district and ward extraction from address"""
+        self.assertEqual(self.client._extract_ward_from_address(self.address), "Phường Hàng Bạc")
+        self.assertEqual(self.client._extract_district_from_address("Số 1, Quận 7, TP Hồ Chí Minh"), "Quận 7")
+        self.assertEqual(self.client._extract_district_from_address("Thôn 3, Xã An Bình, Huyện Gia Lâm"), "Huyện Gia Lâm")
+        self.assertEqual(self.client._extract_ward_from_address(""), "")
+        self.assertEqual(self.client._extract_district_from_address("Không rõ"), "")
+
+    def test_province_extraction(self):
+        """Test province extraction prefers the trailing province"""
+        self.assertEqual(self.client._extract_province_from_address(self.address), "Hà Nội")
+        self.assertEqual(self.client._extract_province_from_address("Số 3, Đường Hà Nội, Thuận An, Bình Dương"), "Bình Dương")
+        self.assertEqual(self.client._extract_province_from_address("Số 9, Vũng Tàu, Bà Rịa - Vũng Tàu"), "Bà Rịa - Vũng Tàu")
+        self.assertEqual(self.client._extract_province_from_address(""), "")
+
+    def test_company_record_is_plain_dict(self):
+        """Test cleaned company records are ordinary dicts with the address parts filled in"""
+        record = self.client._clean_company_data({'TenDoanhNghiep': 'A', 'DiaChi': self.address}, '0101234567')
+        self.assertIs(type(record), dict)
+        self.assertEqual(record['TinhThanh'], "Hà Nội")
+        self.assertEqual(record['QuanHuyen'], "Thành phố Hà Nội")
+        self.assertEqual(record['PhuongXa'], "Phường Hàng Bạc")
+        self.assertEqual(json.loads(json.dumps(record, ensure_ascii=False)), record)
+    
+    def test_clean_company_batch_matches_single_record(self):
+        """Test batch cleaning produces the same fields as per-record cleaning"""
+        record = {
+            'MST': '0101234567',
+            'TenDoanhNghiep': 'CÔNG TY TNHH THỬ NGHIỆM',
+            'DiaChi': self.address,
+            'LoaiHinh': 'Công ty TNHH',
+            'DoanhThu': '1500000000'
+        }
+        single = self.client._clean_company_data(record, record['MST'])
+        batch = self.client.clean_company_batch([record, {'MST': '0209876543'}])
+        
+        self.assertEqual(len(batch), 2)
+        row = batch.iloc[0].to_dict()
+        for field, value in single.items():
+            if field == 'data_quality':
+                self.assertAlmostEqual(row[field], value)
+            elif field != 'extracted_at':
+                self.assertEqual(row[field], value, field)
+        self.assertEqual(batch.iloc[1]['data_quality'], 0.0)
+
+    def test_now_iso_keeps_microseconds(self):
+        """Test extraction timestamps keep sub-second precision within one cached second"""
+        before = datetime.now()
+        stamps = [real_enterprise_api_client._now_iso() for _ in range(1000)]
+        after = datetime.now()
+        
+        parsed = [datetime.fromisoformat(stamp) for stamp in stamps]
+        self.assertTrue(all(len(stamp.rpartition('.')[2]) == 6 for stamp in stamps))
+        self.assertEqual(parsed, sorted(parsed))
+        self.assertGreater(len(set(stamps)), 1)
+        self.assertTrue(before - timedelta(microseconds=1) <= parsed[0] and parsed[-1] <= after)
+
+    def test_company_cache_shared_across_threads(self):
+        """Test concurrent lookups keep the LRU company cache consistent while it evicts"""
+        self.client._make_request = lambda url: {'MST': url.rpartition('/')[2]}
+        self.client._clean_company_data = lambda data, mst: {'MST': mst}
+        self.client._company_cache = _YieldingDict()
+        msts = [f"01012345{i:02d}" for i in range(16)]
+        errors = []
+
+        def lookup():
+            try:
+                for i in range(300):
+                    mst = msts[i % len(msts)]
+                    self.assertEqual(self.client._fetch_company(mst), {'MST': mst})
+            except Exception as e:
+                errors.append(e)
+
+        with mock.patch.object(real_enterprise_api_client, '_COMPANY_CACHE_SIZE', 4):
+            threads = [threading.Thread(target=lookup) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(self.client._company_cache), 4)
+
+class _OfflineVSSClient(RealVSSClient):
+    """RealVSSClient answering every request with a fixed page"""
+
+    page = b''
+
+    def _make_request(self, url, **kwargs):
+        return SimpleNamespace(status_code=200, content=self.page)
+
+class _BrokenBody:
+    """JSON response whose connection drops while the body is read"""
+
+    status_code = 200
+    headers = {'Content-Type': 'application/json'}
+
+    class raw:
+        decode_content = False
+
+        @staticmethod
+        def read(*args):
+            raise ProtocolError("Connection broken: IncompleteRead")
+
+    @property
+    def content(self):
+        raise requests.exceptions.ChunkedEncodingError("Connection broken: IncompleteRead")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return None
+
+class _BrokenBodyVSSClient(RealVSSClient):
+    """RealVSSClient whose every request fails while reading the body"""
+
+    def _make_request(self, url, **kwargs):
+        return _BrokenBody()
+
+class TestRealVSSClient(unittest.TestCase):
+    """Test cases for Real VSS Client (no network access)"""
+
+    LOGIN_PAGE = (b'<html><head><title>VSS</title></head><body>'
+                  b'<input type="text" name="search" value="">'
+                  b'<form action="/auth/login" method="post">'
+                  b'<input type="hidden" name="_token" value="abc">'
+                  b'<input type="text" name="username">'
+                  b'<input type="submit" name="go" value="Login">'
+                  b'</form></body></html>')
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.client = _OfflineVSSClient()
+        self.client.page = self.LOGIN_PAGE
+
+    def test_login_page_parsing(self):
+        """Test login form details are read from the form only"""
+        page = self.client.get_login_page()
+        self.assertEqual(page['csrf_token'], "abc")
+        self.assertEqual(page['form_action'], "/auth/login")
+        self.assertEqual(page['form_method'], "POST")
+        self.assertEqual(page['form_fields'], {'_token': "abc", 'username': ""})
+        self.assertEqual(page['page_title'], "VSS")
+
+    def test_page_cache_expires(self):
+        """Test a cached page is reused within page_ttl and fetched again after it"""
+        requests_made = []
+        client = _OfflineVSSClient(page_ttl=60)
+        client.page = self.LOGIN_PAGE
+        fetch = client._make_request
+        client._make_request = lambda url, **kwargs: requests_made.append(url) or fetch(url, **kwargs)
+        url = client.base_url + '/employees'
+        
+        start = time.monotonic()
+        with mock.patch.object(real_vss_client.time, 'monotonic', return_value=start):
+            self.assertIsNotNone(client._get_document(url))
+        with mock.patch.object(real_vss_client.time, 'monotonic', return_value=start + 59):
+            client._get_document(url)
+        self.assertEqual(len(requests_made), 1)
+        with mock.patch.object(real_vss_client.time, 'monotonic', return_value=start + 61):
+            self.assertIsNotNone(client._get_document(url))
+        self.assertEqual(len(requests_made), 2)
+
+    def test_probe_body_read_error_falls_back_to_html(self):
+        """Test a body that fails mid-read counts as no data and the HTML fallback still runs"""
+        client = _BrokenBodyVSSClient()
+        client.is_authenticated = True
+        self.assertEqual(client._probe_endpoint('/api/employees', 'employees'), [])
+        
+        fallback = [{'employee_id': 'EMP_001'}]
+        records = client._fetch_resource('0101234567', 'employees', lambda records, mst: records,
+                                         lambda mst: fallback)
+        self.assertIs(records, fallback)
+
+    def test_connection_get_fallback_only_when_head_unsupported(self):
+        """Test test_connection retries with GET only after a 405/501 answer to HEAD"""
+        def connect(head_outcome):
+            calls = []
+
+            def request(method, url, **kwargs):
+                calls.append(method)
+                outcome = head_outcome if method == 'HEAD' else 200
+                if isinstance(outcome, Exception):
+                    raise outcome
+                return SimpleNamespace(status_code=outcome, reason='', close=lambda: None)
+
+            client = RealVSSClient()
+            client.session = SimpleNamespace(request=request)
+            return client.test_connection(), calls
+
+        self.assertEqual(connect(200), (True, ['HEAD']))
+        self.assertEqual(connect(405), (True, ['HEAD', 'GET']))
+        self.assertEqual(connect(501), (True, ['HEAD', 'GET']))
+        self.assertEqual(connect(503), (False, ['HEAD']))
+        self.assertEqual(connect(requests.exceptions.Timeout()), (False, ['HEAD']))
+        self.assertEqual(connect(requests.exceptions.ConnectionError()), (False, ['HEAD']))
+
+    @unittest.skipUnless(real_vss_client.ijson, "ijson not installed")
+    def test_stream_records_matches_full_parse(self):
+        """Test streamed list extraction follows the full-parse shape rules"""
+        def stream(payload):
+            return real_vss_client._stream_records(io.BytesIO(json.dumps(payload).encode()), 'employees')
+
+        self.assertEqual(stream([{'a': 1}, [2]]), [{'a': 1}, [2]])
+        self.assertEqual(stream({'data': [{'a': 1}]}), [{'a': 1}])
+        self.assertEqual(stream({'meta': 1}), [])
+        # A member named "item" is not a list element
+        self.assertEqual(stream({'item': 5, 'employees': [{'a': 1}]}), [{'a': 1}])
+        self.assertEqual(stream({'item': {'a': 1}, 'employees': [2]}), [2])
+        self.assertEqual(stream({'data': {'item': [1]}}), [])
+
+class TestAsyncTokenBucket(unittest.TestCase):
+    """Test cases for the token bucket rate limiter"""
+
+    def test_burst_then_steady_rate(self):
+        """Test a full bucket lets a burst through, then paces at the refill rate"""
+        bucket = AsyncTokenBucket(2, 0.1)
+
+        async def acquire_all(count):
+            start = time.monotonic()
+            for _ in range(count):
+                async with bucket:
+                    pass
+            return time.monotonic() - start
+
+        self.assertLess(asyncio.run(acquire_all(2)), 0.04)
+        self.assertGreaterEqual(asyncio.run(acquire_all(2)), 0.08)
+
+    def test_shared_across_threads(self):
+        """Test event loops in several threads share one quota"""
+        bucket = AsyncTokenBucket(5, 0.1)
+
+        async def acquire_some():
+            for _ in range(5):
+                await bucket.acquire()
+
+        threads = [threading.Thread(target=asyncio.run, args=(acquire_some(),)) for _ in range(4)]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # 5 tokens up front, the other 15 refill at 50 per second
+        self.assertGreaterEqual(time.monotonic() - start, 0.28)
+
+    def test_invalid_quota(self):
+        """Test non-positive quotas are rejected"""
+        with self.assertRaises(ValueError):
+            AsyncTokenBucket(0, 60)
+
+class TestResultCache(unittest.TestCase):
+    """Test cases for the integration system's result cache (no network access)"""
+
+    MST = "0101234567"
+
+    def setUp(self):
+        """Set up a system caching into a temporary database"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.system = RealVSSEnterpriseIntegrationSystem()
+        self.system.config.update(enable_caching=True, cache_path=os.path.join(self.tmp.name, 'cache.db'))
+
+    def tearDown(self):
+        self.system.close()
+        self.tmp.cleanup()
+
+    def _process(self, enterprise_source, vss_source):
+        """Run process_mst_async with extraction stubbed to empty sections from the given sources"""
+        async def enterprise(mst, now_iso=None):
+            data = self.system._create_empty_enterprise_data(mst, now_iso)
+            data.data_source = enterprise_source
+            return data
+
+        async def vss(mst, vss_async=None, now_iso=None, vss_available=True):
+            data = self.system._create_empty_vss_data(mst, now_iso)
+            data.data_source = vss_source
+            return data
+
+        self.system._extract_real_enterprise_data_async = enterprise
+        self.system._extract_real_vss_data_async = vss
+        return asyncio.run(self.system.process_mst_async(self.MST))
+
+    def test_empty_fallback_result_not_cached(self):
+        """Test a result built from empty fallbacks is not served from the cache"""
+        self._process('none', 'none')
+        self.assertIsNone(self.system._cached_result(self.MST))
+        self._process('thongtindoanhnghiep.co', 'none')
+        self.assertIsNone(self.system._cached_result(self.MST))
+
+    def test_cached_company_takes_no_token(self):
+        """Test enterprise lookups answered from the client cache do not use the API quota"""
+        limiter = self.system._enterprise_limiter
+        self.system._extract_real_enterprise_data = lambda mst, now_iso=None: None
+        self.system.enterprise_client._company_cache[self.MST] = {'TenDoanhNghiep': 'A'}
+        tokens = limiter._tokens
+        asyncio.run(self.system._extract_real_enterprise_data_async(self.MST))
+        self.assertEqual(limiter._tokens, tokens)
+        
+        self.system.enterprise_client.clear_cache()
+        asyncio.run(self.system._extract_real_enterprise_data_async(self.MST))
+        self.assertLess(limiter._tokens, tokens)
+
+    def test_extracted_result_cached(self):
+        """Test a result with both sections extracted is cached"""
+        result = self._process('thongtindoanhnghiep.co', 'vssapp.teca.vn')
+        cached = self.system._cached_result(self.MST)
+        self.assertIsNotNone(cached)
+        self.assertEqual(cached.to_dict(), result.to_dict())
+
+    def test_failed_batch_connection_not_retried_per_mst(self):
+        """Test a batch whose VSS connection fails tries it once and gives every MST empty VSS data"""
+        async def enterprise(mst, now_iso=None):
+            return self.system._create_empty_enterprise_data(mst, now_iso)
+
+        connects = []
+        self.system._connect_vss = lambda: connects.append(True) and False
+        self.system._extract_real_enterprise_data_async = enterprise
+        results = asyncio.run(self.system.process_msts_batch([self.MST, "0209876543", "0301234567"]))
+        
+        self.assertEqual(len(connects), 1)
+        self.assertEqual([result.vss_info.data_source for result in results], ['none'] * 3)
+
+    def test_close_stops_vss_probe_threads(self):
+        """Test closing the system shuts down the VSS client's probe pool"""
+        executor = self.system.vss_client._probe_executor
+        executor.submit(time.sleep, 0).result()
+        self.system.close()
+        with self.assertRaises(RuntimeError):
+            executor.submit(time.sleep, 0)
+        self.assertFalse(any(thread.is_alive() for thread in executor._threads))
+
+    def test_process_mst_inside_running_loop(self):
+        """Test the synchronous process_mst also works when called from a running event loop"""
+        self._process('thongtindoanhnghiep.co', 'vssapp.teca.vn')
+
+        async def caller():
+            return self.system.process_mst(self.MST)
+
+        result = asyncio.run(caller())
+        self.assertEqual(result.enterprise_info.mst, self.MST)
+
+class TestRealMSTProcessor(unittest.TestCase):
+    """Test cases for the MST processor's background report writing (no network access)"""
+
+    MST = "0101234567"
+
+    def setUp(self):
+        """Set up a processor caching into a temporary database, whose background jobs are recorded instead of run"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.processor = RealMSTProcessor()
+        self.processor.config.update(save_results=False, generate_report=True)
+        self.processor.integration_system.config.update(cache_path=os.path.join(self.tmp.name, 'cache.db'))
+        self.processor._io_executor.shutdown()
+        self.jobs = []
+        self.processor._io_executor = SimpleNamespace(submit=lambda fn, *args: self.jobs.append((fn, args)),
+                                                      shutdown=lambda wait=True: None)
+        system = self.processor.integration_system
+
+        async def empty_enterprise(mst, now_iso=None):
+            return system._create_empty_enterprise_data(mst, now_iso)
+
+        async def empty_vss(mst, vss_async=None, now_iso=None, vss_available=True):
+            return system._create_empty_vss_data(mst, now_iso)
+
+        system._extract_real_enterprise_data_async = empty_enterprise
+        system._extract_real_vss_data_async = empty_vss
+
+    def tearDown(self):
+        self.processor.close()
+        self.tmp.cleanup()
+
+    def test_report_uses_stats_at_submission(self):
+        """Test a report written later shows the counters of its own request"""
+        self.processor.process_mst(self.MST)
+        (job, args), = self.jobs
+        self.assertEqual(job, self.processor._generate_report)
+        result, mst, now, stats = args
+        self.assertEqual(stats.total_requests, 1)
+        
+        # Further requests before the report is written must not change it
+        self.processor.process_mst(self.MST)
+        self.assertEqual(self.processor.integration_system.stats.total_requests, 2)
+        report = self.processor._create_real_data_markdown_report(result, now, stats)
+        self.assertIn("**Tổng số yêu cầu:** 1\n", report)
+
+    def test_batch_shares_one_vss_connection(self):
+        """Test process_msts connects once, shares one VSS client and reports failures per MST"""
+        system = self.processor.integration_system
+        connects, clients = [], []
+        system._connect_vss = lambda: connects.append(True) or True
+
+        async def empty_vss(mst, vss_async=None, now_iso=None, vss_available=True):
+            clients.append(vss_async)
+            return system._create_empty_vss_data(mst, now_iso)
+
+        system._extract_real_vss_data_async = empty_vss
+        outputs = self.processor.process_msts([self.MST, "12AB", "0209876543"])
+        
+        self.assertEqual(len(connects), 1)
+        self.assertEqual(len(clients), 2)
+        self.assertIsNotNone(clients[0])
+        self.assertIs(clients[0], clients[1])
+        self.assertEqual([output['success'] for output in outputs], [True, False, True])
+        self.assertEqual([output['mst'] for output in outputs], [self.MST, "12AB", "0209876543"])
+        self.assertEqual(outputs[1]['data_type'], 'error')
+        self.assertEqual([args[1] for _, args in self.jobs], [self.MST, "0209876543"])
+
+if __name__ == "__main__":
+    unittest.main()
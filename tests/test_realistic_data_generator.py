@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Realistic Data Generator
+"""
+
+import sys
+import os
+import unittest
+from collections import Counter
+from datetime import date, datetime, timedelta
+from unittest import mock
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+
+import realistic_data_generator as rdg
+from realistic_data_generator import RealisticDataGenerator
+
+class TestEnterpriseData(unittest.TestCase):
+    """Test cases for generated enterprise records"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.generator = RealisticDataGenerator()
+        self.mst = "0101234567"
+    
+    def test_enterprise_fields_and_formats(self):
+        """Test enterprise records draw from the value pools in the documented formats"""
+        for _ in range(200):
+            record = self.generator.generate_enterprise_data(self.mst)
+            self.assertEqual(record['MST'], self.mst)
+            self.assertIn(record['TinhThanh'], rdg._PROVINCES)
+            self.assertIn(record['QuanHuyen'], rdg._DISTRICTS)
+            self.assertIn(record['PhuongXa'], rdg._WARDS)
+            self.assertIn(record['NganhNghe'], rdg._BUSINESS_SECTORS)
+            self.assertIn(record['LoaiHinh'], rdg._COMPANY_TYPES)
+            self.assertTrue(record['DiaChi'].endswith(
+                f", {record['PhuongXa']}, {record['QuanHuyen']}, {record['TinhThanh']}"))
+            self.assertRegex(record['DiaChi'], r'^Số \d{1,3}, ')
+            
+            prefix, _, rest = record['SoDienThoai'].partition('.')
+            self.assertIn(prefix, rdg._PHONE_PREFIXES)
+            self.assertRegex(rest, r'^\d{3}\.\d{4}$')
+            self.assertRegex(record['SoNganHang'], r'^\d{10}$')
+            self.assertTrue(record['Website'].startswith('https://www.'))
+            self.assertTrue(1000000000 <= record['DoanhThu'] <= 100000000000)
+            
+            registered = date.fromisoformat(record['NgayCap'])
+            self.assertTrue(365 <= (date.today() - registered).days <= 3650)
+            self.assertEqual((date.fromisoformat(record['NgayHetHan']) - registered).days, 3650)
+    
+    def test_seeded_enterprise_reproducible(self):
+        """Test a seed reproduces the record while dates and extracted_at follow the clock"""
+        stamped = ('NgayCap', 'NgayHetHan', 'extracted_at')
+        first = self.generator.generate_enterprise_data(self.mst, seed=42)
+        again = RealisticDataGenerator().generate_enterprise_data(self.mst, seed=42)
+        self.assertEqual({k: v for k, v in again.items() if k != 'extracted_at'},
+                         {k: v for k, v in first.items() if k != 'extracted_at'})
+        
+        later = datetime.now() + timedelta(days=30)
+        
+        class _Later(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return later
+        
+        with mock.patch.object(rdg, 'datetime', _Later):
+            moved = self.generator.generate_enterprise_data(self.mst, seed=42)
+        
+        self.assertEqual(moved['extracted_at'], later.isoformat())
+        self.assertEqual(date.fromisoformat(moved['NgayCap']) - date.fromisoformat(first['NgayCap']),
+                         later.date() - date.fromisoformat(first['extracted_at'][:10]))
+        self.assertEqual({k: v for k, v in moved.items() if k not in stamped},
+                         {k: v for k, v in first.items() if k not in stamped})
+    
+    def test_seeded_enterprise_returns_copies(self):
+        """Test changes to a seeded record do not reach later calls"""
+        first = self.generator.generate_enterprise_data(self.mst, seed=7)
+        expected = dict(first)
+        first['TenDoanhNghiep'] = 'changed'
+        first['DoanhThu'] = 0
+        
+        second = self.generator.generate_enterprise_data(self.mst, seed=7)
+        second.pop('extracted_at')
+        expected.pop('extracted_at')
+        self.assertEqual(second, expected)
+
+class TestVSSData(unittest.TestCase):
+    """Test cases for generated employee, contribution, claim and risk data"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.generator = RealisticDataGenerator()
+        self.mst = "0101234567"
+    
+    def test_salary_within_position_range(self):
+        """Test each employee's salary falls in the range for their position"""
+        employees = self.generator.generate_employee_data(self.mst, count=500)
+        self.assertEqual(len(employees), 500)
+        for employee in employees:
+            low, high = rdg._salary_range(employee['position'])
+            self.assertTrue(low <= employee['salary'] <= high, employee)
+            self.assertIn(employee['status'], rdg._EMPLOYEE_STATUSES)
+    
+    def test_contributions_per_active_employee(self):
+        """Test active employees get 1-12 contributions of 8.5% of salary, inactive ones none"""
+        employees = self.generator.generate_employee_data(self.mst, count=200)
+        contributions = self.generator.generate_contribution_data(employees, self.mst)
+        by_id = {employee['employee_id']: employee for employee in employees}
+        counts = Counter(contribution['employee_id'] for contribution in contributions)
+        
+        for employee in employees:
+            if employee['status'] == 'active':
+                self.assertTrue(1 <= counts[employee['employee_id']] <= 12, employee)
+            else:
+                self.assertNotIn(employee['employee_id'], counts)
+        for contribution in contributions:
+            salary = by_id[contribution['employee_id']]['salary']
+            self.assertEqual(contribution['contribution_amount'], int(salary * 0.085))
+    
+    def test_claim_amount_within_type_range(self):
+        """Test claim amounts fall in the range for their claim type"""
+        employees = self.generator.generate_employee_data(self.mst, count=20)
+        ranges = dict(zip(rdg._CLAIM_TYPES, zip(rdg._CLAIM_LOWS.tolist(), rdg._CLAIM_HIGHS.tolist())))
+        employee_ids = {employee['employee_id'] for employee in employees}
+        for _ in range(50):
+            for claim in self.generator.generate_claim_data(employees, self.mst):
+                low, high = ranges[claim['claim_type']]
+                self.assertTrue(low <= claim['claim_amount'] <= high, claim)
+                self.assertIn(claim['employee_id'], employee_ids)
+                self.assertIn(claim['status'], rdg._CLAIM_STATUSES)
+    
+    def test_empty_employee_lists(self):
+        """Test count=0 and empty employee lists give empty data rather than errors"""
+        self.assertEqual(self.generator.generate_employee_data(self.mst, count=0), [])
+        self.assertEqual(self.generator.generate_contribution_data([], self.mst), [])
+        self.assertEqual(self.generator.generate_claim_data([], self.mst), [])
+        
+        compliance = self.generator.generate_compliance_data([], [], self.mst)
+        risk = self.generator.generate_risk_assessment([], [], compliance, self.mst)
+        self.assertIn("Thiếu dữ liệu đóng góp", risk['risk_factors'])
+        self.assertNotIn("Mức lương trung bình thấp", risk['risk_factors'])
+    
+    def test_risk_loop_matches_numpy(self):
+        """Test the loop risk scorer, run uncompiled, agrees with the NumPy scorer"""
+        rng = np.random.default_rng(0)
+        cases = [(np.array([]), np.array([], dtype=bool), np.array([]), 50.0),
+                 (np.array([5e6, 9e6]), np.array([True, False]), np.array([0.0, 0.0]), 90.0),
+                 (np.array([2e7]), np.array([True]), np.array([1.7e6]), 70.0)]
+        for _ in range(50):
+            size = int(rng.integers(0, 20))
+            cases.append((rng.integers(8000000, 20000001, size=size).astype(np.float64),
+                          rng.random(size) < 0.85,
+                          rng.integers(0, 2000000, size=int(rng.integers(0, 30))).astype(np.float64),
+                          float(rng.uniform(40, 100))))
+        
+        for salaries, active, amounts, compliance_score in cases:
+            loop_score, loop_flags = rdg._score_risk_loop(salaries, active, amounts, compliance_score)
+            numpy_score, numpy_flags = rdg._score_risk_numpy(salaries, active, amounts, compliance_score)
+            self.assertEqual(loop_score, numpy_score)
+            self.assertEqual(loop_flags.tolist(), numpy_flags.tolist())
+
+if __name__ == "__main__":
+    unittest.main()